@@ -0,0 +1,77 @@
+"""
+bench_comparator.py
+Mesure le calcul du diff avant / après correction sur des types.xml où des </type> ont été oubliés.
+
+Compare difflib (quadratique sur les milliers de lignes répétées comme
+</type>), le diff patience sur lignes converties en entiers, et la
+traduction directe des patches du correcteur. Vérifie que les opcodes
+reconstruisent bien le fichier corrigé.
+
+Usage :
+    python benchmarks/bench_comparator.py --lines 50000 --repeat 3
+"""
+
+import argparse
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_corrector import make_broken_types_xml
+from bench_validator import best_of
+from modules.comparator import _cached_diff, compute_diff
+from modules.corrector import correct_until_valid
+
+
+def rebuild(diff_data):
+    """Fichier après, reconstruit à partir des opcodes (vérification)"""
+    before_lines = diff_data["before_lines"]
+    after_lines = diff_data["after_lines"]
+    lines = []
+    for tag, i1, i2, j1, j2 in diff_data["opcodes"]:
+        if tag == "equal" and before_lines[i1:i2] != after_lines[j1:j2]:
+            raise AssertionError(f"Bloc 'equal' {i1}-{i2} / {j1}-{j2} différent")
+        lines.extend(before_lines[i1:i2] if tag == "equal" else after_lines[j1:j2])
+    return '\n'.join(lines)
+
+
+def uncached(func):
+    """Vide le cache du diff avant chaque mesure"""
+    def run(pair):
+        _cached_diff.cache_clear()
+        return func(pair)
+    return run
+
+
+# ==============================
+# MESURE
+# ==============================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=50000, help="Taille maximale (lignes) du fichier généré")
+    parser.add_argument("--every", type=int, default=10, help="Un </type> supprimé sur N")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>8} {'difflib (ms)':>13} {'patience (ms)':>14} {'patches (ms)':>13}")
+    for size in (args.lines // 4, args.lines // 2, args.lines):
+        before = make_broken_types_xml(size, args.every)
+        result = correct_until_valid(before, "xml")
+        after, patches = result["corrected"], result["patches"]
+
+        for label, diff_data in (("patience", compute_diff(before, after)), ("patches", compute_diff(before, after, patches))):
+            if rebuild(diff_data) != after:
+                print(f"❌ Opcodes {label} invalides sur {size} lignes")
+                return 1
+
+        pair = (before, after)
+        legacy = best_of(lambda pair: SequenceMatcher(None, pair[0].split('\n'), pair[1].split('\n')).get_opcodes(), pair, args.repeat)
+        patience = best_of(uncached(lambda pair: compute_diff(*pair)), pair, args.repeat)
+        from_patches = best_of(uncached(lambda pair: compute_diff(*pair, patches)), pair, args.repeat)
+        print(f"{size:>8} {legacy * 1000:>13.1f} {patience * 1000:>14.1f} {from_patches * 1000:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+bench_corrector.py
+Mesure corrector.fix_unclosed_tags sur deux fichiers :
+    - types     → types.xml où des </type> ont été oubliés : chaque recherche
+                  s'arrête au <type> suivant, l'ancienne version reste rapide
+    - imbriqué  → fichier tronqué avec `--depth` éléments imbriqués jamais
+                  fermés : chaque recherche de l'ancienne version parcourt le
+                  fichier jusqu'au bout (quadratique : profondeur × lignes)
+
+Compare l'ancienne version (recherche vers l'avant + lines.insert pour
+chaque balise) à la version en un seul parcours + un seul join, et vérifie
+que les deux donnent le même fichier. Le temps de la nouvelle version doit
+doubler quand la taille double.
+
+Usage :
+    python benchmarks/bench_corrector.py --lines 50000 --repeat 3
+"""
+
+import argparse
+import re
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_validator import best_of, make_types_xml
+from modules.corrector import find_unclosed_tags, fix_unclosed_tags
+from modules.tokenizer import token_cache
+
+
+# Lignes par <type> dans make_types_xml
+LINES_PER_TYPE = 14
+
+
+# ==============================
+# GÉNÉRATION DU FICHIER DE TEST
+# ==============================
+def make_broken_types_xml(line_count, every=10):
+    """
+    types.xml d'environ `line_count` lignes où un </type> sur `every` a été supprimé.
+    Le dernier </type> est gardé : sans lui, l'ancienne version fermait après
+    </types> (fin de fichier) et les deux résultats ne seraient plus comparables.
+    """
+    lines = make_types_xml(max(line_count // LINES_PER_TYPE, 1)).split('\n')
+    closings = [i for i, line in enumerate(lines) if line.strip() == '</type>']
+    dropped = set(closings[:-1][::every])
+    return '\n'.join(line for i, line in enumerate(lines) if i not in dropped)
+
+
+def make_truncated_nested_xml(line_count, depth=500):
+    """
+    Fichier d'environ `line_count` lignes coupé avant la fin : `depth` <group>
+    imbriqués (indentation croissante), chacun suivi de ses <item/>, aucun fermé.
+    """
+    per_group = max(line_count // depth - 1, 1)
+    lines = ['<groups>']
+    for level in range(depth):
+        indent = ' ' * (level + 1)
+        lines.append(f'{indent}<group name="Group_{level}">')
+        lines.extend(f'{indent} <item name="Item_{level}_{i}" chance="0.5"/>' for i in range(per_group))
+    return '\n'.join(lines)
+
+
+# ==============================
+# ANCIENNE VERSION (référence)
+# ==============================
+def legacy_fix_unclosed_tags(content):
+    """Reproduit l'ancien fix_unclosed_tags : une recherche + un lines.insert par balise"""
+    unclosed = find_unclosed_tags(content)
+    lines = content.split('\n')
+    fixes = []
+    for tag_name, line_num, original_line in reversed(unclosed):
+        insert_line = None
+        indent = len(original_line) - len(original_line.lstrip())
+        for i in range(line_num, len(lines)):
+            current_line = lines[i]
+            current_indent = len(current_line) - len(current_line.lstrip())
+            if current_indent <= indent and re.search(r'<\w+', current_line):
+                insert_line = i
+                break
+        if insert_line is None:
+            insert_line = len(lines)
+        lines.insert(insert_line, ' ' * indent + f'</{tag_name}>')
+        fixes.append(f"Ajout de </{tag_name}> à la ligne {insert_line + 1}")
+    return '\n'.join(lines), fixes
+
+
+# ==============================
+# MESURE
+# ==============================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=50000, help="Taille maximale (lignes) du fichier généré")
+    parser.add_argument("--every", type=int, default=10, help="Un </type> supprimé sur N (types)")
+    parser.add_argument("--depth", type=int, default=500, help="Éléments imbriqués jamais fermés (imbriqué)")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions")
+    args = parser.parse_args()
+
+    inputs = [
+        ("types", lambda size: make_broken_types_xml(size, args.every)),
+        ("imbriqué", lambda size: make_truncated_nested_xml(size, args.depth)),
+    ]
+    for label, make_content in inputs:
+        print(f"\n{label}")
+        print(f"{'lignes':>8} {'oubliés':>8} {'ancien (ms)':>12} {'nouveau (ms)':>13} {'gain':>8}")
+        for size in (args.lines // 4, args.lines // 2, args.lines):
+            content = make_content(size)
+            # Tokens partagés le temps de la mesure (comme pendant une validation) :
+            # on ne mesure que la correction
+            with token_cache():
+                missing = len(find_unclosed_tags(content))
+
+                fixed = fix_unclosed_tags(content)[0]
+                if fixed != legacy_fix_unclosed_tags(content)[0]:
+                    print(f"❌ Résultat différent de l'ancienne version sur {size} lignes ({label})")
+                    return 1
+                try:
+                    ET.fromstring(fixed)
+                except ET.ParseError as e:
+                    print(f"❌ Résultat invalide sur {size} lignes ({label}) : {e}")
+                    return 1
+
+                legacy = best_of(legacy_fix_unclosed_tags, content, args.repeat)
+                single = best_of(fix_unclosed_tags, content, args.repeat)
+            print(f"{size:>8} {missing:>8} {legacy * 1000:>12.1f} {single * 1000:>13.1f} {legacy / single:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+bench_map.py
+Mesure la construction de la figure Plotly de chaque carte (zones vanilla).
+
+Compare l'ancienne version de create_map (copie de chaque zone, un filtre
+du DataFrame par type, texte de survol construit avec iterrows) à
+zone_map.build_map_figure (un groupby, hovertemplate + customdata).
+L'image de fond n'est pas comptée : elle est préparée une fois par processus.
+
+Nécessite pandas et plotly (requirements.txt).
+
+Usage :
+    python benchmarks/bench_map.py --repeat 5
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from bench_validator import best_of
+from modules.territories import load_territories
+from modules.zone_map import MAP_OFFSETS, build_map_figure, get_zone_color
+
+
+# Cartes : (clé territories, nom affiché, taille)
+MAPS = [
+    ("chernarus", "Chernarus", 15360),
+    ("livonia", "Livonia", 12800),
+    ("sakhal", "Sakhal", 15360),
+]
+
+
+# ==============================
+# ANCIENNE VERSION (référence)
+# ==============================
+def legacy_build_map_figure(zones, map_name):
+    """Reproduit les traces de l'ancien create_map (sans image ni mise en page)"""
+    offsets = MAP_OFFSETS.get(map_name, {'x': 0, 'z': 0})
+    zones_copy = []
+    for zone in zones:
+        zone_copy = zone.copy()
+        zone_copy['x_izurvive'] = zone['x'] + offsets['x']
+        zone_copy['z_izurvive'] = zone['z'] + offsets['z']
+        zone_copy['y_plot'] = zone_copy['z_izurvive']
+        zones_copy.append(zone_copy)
+
+    df = pd.DataFrame(zones_copy)
+    fig = go.Figure()
+    for zone_type in df['name'].unique():
+        df_type = df[df['name'] == zone_type]
+        fig.add_trace(go.Scatter(
+            x=df_type['x_izurvive'],
+            y=df_type['y_plot'],
+            mode='markers',
+            name=zone_type,
+            marker=dict(size=8, color=get_zone_color(zone_type), opacity=0.9, line=dict(width=1, color='white')),
+            text=[
+                f"<b>{row['name']}</b><br>" +
+                f"Position XML: ({row['x']:.0f}, {row['z']:.0f})<br>" +
+                f"Position iZurvive: ({row['x_izurvive']:.0f}, {row['z_izurvive']:.0f})<br>" +
+                f"Radius: {row['r']:.0f}m<br>" +
+                f"Spawn: {row['smin']}-{row['smax']}<br>" +
+                f"Dynamic: {row['dmin']}-{row['dmax']}<br>" +
+                f"{'✅ ACTIF' if row['active'] else '❌ INACTIF'}"
+                for _, row in df_type.iterrows()
+            ],
+            hovertemplate='%{text}<extra></extra>',
+            customdata=df_type.index,
+            unselected=dict(marker=dict(opacity=0.6))
+        ))
+    return fig
+
+
+# ==============================
+# MESURE
+# ==============================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de répétitions")
+    args = parser.parse_args()
+
+    print(f"{'carte':>10} {'zones':>6} {'ancien (ms)':>12} {'nouveau (ms)':>13} {'gain':>8}")
+    for map_key, map_name, map_size in MAPS:
+        zones = list(load_territories(map_key))
+
+        legacy = best_of(lambda zones: legacy_build_map_figure(zones, map_name), zones, args.repeat)
+        vectorized = best_of(lambda zones: build_map_figure(zones, map_name, map_size), zones, args.repeat)
+        print(f"{map_name:>10} {len(zones):>6} {legacy * 1000:>12.1f} {vectorized * 1000:>13.1f} {legacy / vectorized:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+bench_validator.py
+Mesure le temps de validation d'un gros types.xml synthétique.
+
+Compare l'ancien pipeline (4 parsings : ET x3 + minidom, schéma relu sur
+disque, règles types.xml codées en dur : reproduits ici) au
+pipeline à parsing unique de validate_xml.
+
+Usage :
+    python benchmarks/bench_validator.py --types 20000 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.schema_registry import SCHEMAS_DIR
+from modules.validator import validate_xml
+
+
+# ==============================
+# GÉNÉRATION DU FICHIER DE TEST
+# ==============================
+def make_types_xml(count):
+    """Génère un types.xml de `count` items, avec quelques erreurs métier"""
+    lines = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>', '<types>']
+    for i in range(count):
+        nominal = 0 if i % 50 == 0 else 10
+        lines.extend([
+            f'    <!-- Item {i} -->',
+            f'    <type name="Item_{i}">',
+            f'        <nominal>{nominal}</nominal>',
+            '        <lifetime>14400</lifetime>',
+            '        <restock>0</restock>',
+            f'        <min>{5 if i % 37 else 20}</min>',
+            '        <quantmin>-1</quantmin>',
+            '        <quantmax>-1</quantmax>',
+            '        <cost>100</cost>',
+            '        <flags count_in_cargo="0" count_in_hoarder="0" count_in_map="1" count_in_player="0" crafted="0" deloot="0"/>',
+            '        <category name="tools"/>',
+            '        <usage name="Industrial"/>',
+            '        <value name="Tier1"/>',
+            '    </type>',
+        ])
+    lines.append('</types>')
+    return '\n'.join(lines)
+
+
+# ==============================
+# ANCIEN PIPELINE (référence)
+# ==============================
+def legacy_detect_dayz_file_type(content):
+    """Ancien detect_dayz_file_type : un parsing complet pour lire la racine"""
+    try:
+        root_tag = ET.fromstring(content).tag
+    except ET.ParseError:
+        return None
+    return {"types": "types", "events": "events", "economy": "economy",
+            "variables": "globals", "messages": "messages"}.get(root_tag)
+
+
+def legacy_validate_semantic_rules(content, file_type):
+    """Ancien validate_semantic_rules (types.xml) : schéma relu sur disque + un parsing"""
+    try:
+        with open(SCHEMAS_DIR / "dayz_1.28" / f"{file_type}.json", 'r', encoding='utf-8') as f:
+            json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if file_type != "types":
+        return []
+    return _legacy_types_semantic(ET.fromstring(content))
+
+
+def _legacy_types_semantic(root):
+    """Anciennes règles types.xml, codées en dur (ligne = rang de l'item)"""
+    warnings = []
+    for idx, type_elem in enumerate(root.findall('type'), start=1):
+        item_name = type_elem.get('name', f'Item #{idx}')
+        nominal = int(type_elem.findtext('nominal', '0'))
+        min_val = int(type_elem.findtext('min', '0'))
+        quantmin = int(type_elem.findtext('quantmin', '-1'))
+        quantmax = int(type_elem.findtext('quantmax', '-1'))
+        lifetime = int(type_elem.findtext('lifetime', '0'))
+
+        if min_val > nominal:
+            warnings.append({"severity": "error", "message": f"Item '{item_name}': min ({min_val}) > nominal ({nominal}).", "line": idx})
+        if quantmin != -1 and quantmax != -1 and quantmin > quantmax:
+            warnings.append({"severity": "error", "message": f"Item '{item_name}': quantmin ({quantmin}) > quantmax ({quantmax}).", "line": idx})
+        if lifetime <= 0:
+            warnings.append({"severity": "error", "message": f"Item '{item_name}': lifetime ({lifetime}) doit être > 0.", "line": idx})
+        if nominal == 0 and min_val > 0:
+            warnings.append({"severity": "warning", "message": f"Item '{item_name}': nominal=0 mais min={min_val}.", "line": idx})
+        if nominal > 0 and not type_elem.findall('usage'):
+            flags = type_elem.find('flags')
+            if (flags.get('crafted', '0') if flags is not None else '0') == '0':
+                warnings.append({"severity": "warning", "message": f"Item '{item_name}': aucun <usage> défini.", "line": idx})
+    return warnings
+
+
+def legacy_validate(content):
+    """Reproduit l'ancien validate_xml : 3 parsings ElementTree + 1 parsing minidom"""
+    from xml.dom import minidom
+    ET.fromstring(content)
+    dayz_type = legacy_detect_dayz_file_type(content)
+    legacy_validate_semantic_rules(content, dayz_type)
+    pretty = minidom.parseString(content).toprettyxml(indent="    ")
+    return "\n".join(line for line in pretty.split("\n") if line.strip())
+
+
+# ==============================
+# MESURE
+# ==============================
+def best_of(func, content, repeat):
+    """Meilleur temps (secondes) sur `repeat` exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--types", type=int, default=20000, help="Nombre de <type> générés")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions")
+    args = parser.parse_args()
+
+    content = make_types_xml(args.types)
+    print(f"types.xml synthétique : {args.types} items, {len(content) / 1e6:.1f} Mo")
+
+    legacy = best_of(legacy_validate, content, args.repeat)
+    single = best_of(validate_xml, content, args.repeat)
+
+    print(f"Ancien pipeline (4 parsings) : {legacy * 1000:8.1f} ms")
+    print(f"Parsing unique               : {single * 1000:8.1f} ms")
+    print(f"Gain                         : x{legacy / single:.2f}")
+
+
+if __name__ == "__main__":
+    main()
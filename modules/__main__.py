@@ -0,0 +1,9 @@
+"""
+Permet : python -m modules <fichiers / dossiers>  (voir modules/cli.py)
+"""
+
+import sys
+
+from modules.cli import main
+
+sys.exit(main())
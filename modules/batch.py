@@ -0,0 +1,241 @@
+"""
+batch.py
+Validation d'un dossier de mission complet (db/types.xml, db/events.xml,
+cfgeconomycore, fichiers types de mods...) en parallèle.
+
+Chaque fichier est validé dans un processus du pool ; les résultats sont
+remontés dès qu'ils sont prêts, puis un rapport global est affiché.
+
+Usage :
+    python -m modules.batch chemin/vers/mpmissions/dayzOffline.chernarusplus
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from modules.validator import validate, validate_xml_stream
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Extensions validées → type passé à validate()
+SUPPORTED_EXTENSIONS = {".xml": "xml", ".json": "json"}
+
+# Nombre de fichiers les plus lents affichés dans le rapport
+SLOWEST_FILES_SHOWN = 5
+
+
+# ==============================
+# RECHERCHE DES FICHIERS
+# ==============================
+def find_config_files(directory, recursive=True):
+    """
+    Liste les fichiers XML / JSON d'un dossier (triés, sous-dossiers inclus par défaut).
+
+    Returns:
+        list: [Path, ...]
+    """
+    directory = Path(directory)
+    candidates = directory.rglob("*") if recursive else directory.iterdir()
+    return sorted(
+        path for path in candidates
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+# ==============================
+# VALIDATION D'UN FICHIER (dans un processus du pool)
+# ==============================
+def validate_file(path, schema_version=None):
+    """
+    Valide un fichier sur disque.
+
+    Les XML passent par le mode streaming : pas d'arbre complet ni de
+    texte formaté à renvoyer au processus principal. Les erreurs de
+    syntaxe repassent par validate_xml (matching + correction).
+
+    Returns:
+        dict: {"path": str, "result": dict de validate, "elapsed": secondes}
+    """
+    start = time.perf_counter()
+    file_type = SUPPORTED_EXTENSIONS.get(Path(path).suffix.lower())
+
+    if file_type == "xml":
+        result = validate_xml_stream(path, schema_version)
+    else:
+        with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            result = validate(f.read(), file_type, schema_version)
+        result["formatted"] = None
+
+    return {"path": str(path), "result": result, "elapsed": time.perf_counter() - start}
+
+
+def _failed_entry(path, error):
+    """Entrée de résultat pour un fichier qui n'a pas pu être validé (lecture, crash...)"""
+    return {
+        "path": str(path),
+        "result": {
+            "valid": False,
+            "file_type": SUPPORTED_EXTENSIONS.get(Path(path).suffix.lower()),
+            "dayz_type": None,
+            "error": {"line": 0, "column": 0, "message_brut": str(error), "matched": None},
+            "formatted": None,
+            "corrected": None,
+            "semantic_warnings": None,
+            "all_errors": None,
+            "correction": None
+        },
+        "elapsed": 0.0
+    }
+
+
+# ==============================
+# VALIDATION D'UN DOSSIER
+# ==============================
+def iter_validate_files(paths, max_workers=None, schema_version=None):
+    """
+    Valide des fichiers en parallèle et les renvoie dans l'ordre où ils se terminent.
+
+    Args:
+        paths (list): Fichiers à valider
+        max_workers (int): Taille du pool (défaut : nombre de CPU)
+        schema_version (str): Version DayZ du schéma (par défaut la plus récente)
+
+    Yields:
+        dict: {"path", "result", "elapsed"} (voir validate_file)
+    """
+    paths = list(paths)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(paths) or 1)
+
+    # Un seul processus → pas de pool (démarrage plus rapide)
+    if max_workers == 1:
+        for path in paths:
+            try:
+                yield validate_file(path, schema_version)
+            except Exception as e:
+                yield _failed_entry(path, e)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(validate_file, path, schema_version): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield _failed_entry(futures[future], e)
+
+
+def iter_validate_directory(directory, max_workers=None, schema_version=None, recursive=True):
+    """Comme iter_validate_files, sur tous les XML / JSON d'un dossier"""
+    return iter_validate_files(find_config_files(directory, recursive), max_workers, schema_version)
+
+
+# ==============================
+# RAPPORT
+# ==============================
+def count_issues(result):
+    """Compte (erreurs, avertissements) d'un résultat : syntaxe + règles métier"""
+    errors = 0 if result.get("valid") else len(result.get("all_errors") or [None])
+    warnings = 0
+    for warning in result.get("semantic_warnings") or []:
+        if warning.get("severity") == "error":
+            errors += 1
+        else:
+            warnings += 1
+    return errors, warnings
+
+
+def summarize(entries, wall_time):
+    """
+    Agrège les résultats d'un lot.
+
+    Returns:
+        dict: {"files", "valid", "invalid", "errors", "warnings",
+               "wall_time", "cpu_time", "slowest": [(path, secondes), ...]}
+    """
+    summary = {"files": 0, "valid": 0, "invalid": 0, "errors": 0, "warnings": 0,
+               "wall_time": wall_time, "cpu_time": 0.0}
+
+    for entry in entries:
+        result = entry["result"]
+        errors, warnings = count_issues(result)
+        summary["files"] += 1
+        summary["valid" if result.get("valid") else "invalid"] += 1
+        summary["errors"] += errors
+        summary["warnings"] += warnings
+        summary["cpu_time"] += entry["elapsed"]
+
+    slowest = sorted(entries, key=lambda entry: entry["elapsed"], reverse=True)[:SLOWEST_FILES_SHOWN]
+    summary["slowest"] = [(entry["path"], entry["elapsed"]) for entry in slowest]
+    return summary
+
+
+def format_entry(entry, root=None):
+    """Une ligne de sortie par fichier, affichée dès qu'il est validé"""
+    result = entry["result"]
+    path = os.path.relpath(entry["path"], root) if root else entry["path"]
+    timing = f"{entry['elapsed'] * 1000:.0f} ms"
+
+    if not result.get("valid"):
+        errors = result.get("all_errors") or [result.get("error") or {}]
+        lines = [f"❌ {path} ({timing}) — {len(errors)} erreur(s) de syntaxe"]
+        lines.extend(f"   ligne {error.get('line', 0)} : {error.get('message_brut', '')}" for error in errors)
+        return "\n".join(lines)
+
+    errors, warnings = count_issues(result)
+    dayz_type = result.get("dayz_type") or result.get("file_type")
+    status = "⚠️" if errors or warnings else "✅"
+    return f"{status} {path} [{dayz_type}] ({timing}) — {errors} erreur(s), {warnings} avertissement(s)"
+
+
+def format_report(summary, root=None):
+    """Rapport global (texte) d'un lot"""
+    lines = [
+        "",
+        "=" * 60,
+        f"📊 {summary['files']} fichier(s) : {summary['valid']} valide(s), {summary['invalid']} invalide(s)",
+        f"   {summary['errors']} erreur(s), {summary['warnings']} avertissement(s)",
+        f"⏱️ Temps total : {summary['wall_time']:.2f} s (somme par fichier : {summary['cpu_time']:.2f} s)",
+    ]
+    if summary["slowest"]:
+        lines.append("🐢 Fichiers les plus lents :")
+        for path, elapsed in summary["slowest"]:
+            path = os.path.relpath(path, root) if root else path
+            lines.append(f"   {elapsed * 1000:8.0f} ms  {path}")
+    return "\n".join(lines)
+
+
+# ==============================
+# LIGNE DE COMMANDE
+# ==============================
+def main(argv=None):
+    """Point d'entrée CLI. Code de sortie : 0 si aucun fichier n'a d'erreur, 1 sinon"""
+    parser = argparse.ArgumentParser(description="Valide tous les fichiers XML / JSON d'un dossier de mission DayZ.")
+    parser.add_argument("directory", help="Dossier à valider (ex. mpmissions/dayzOffline.chernarusplus)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    parser.add_argument("--schema-version", default=None, help="Version DayZ des schémas (défaut : la plus récente)")
+    parser.add_argument("--no-recursive", action="store_true", help="Ne pas descendre dans les sous-dossiers")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Dossier introuvable : {args.directory}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    entries = []
+    for entry in iter_validate_directory(args.directory, args.workers, args.schema_version, not args.no_recursive):
+        entries.append(entry)
+        print(format_entry(entry, args.directory), flush=True)
+
+    summary = summarize(entries, time.perf_counter() - start)
+    print(format_report(summary, args.directory))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+cli.py
+Validation en ligne de commande (scripts de déploiement, CI), sans Streamlit.
+
+Usage :
+    python -m modules db/types.xml db/events.xml
+    python -m modules mpmissions/dayzOffline.chernarusplus --format sarif > codex.sarif
+
+Code de sortie :
+    0 → aucun problème bloquant
+    1 → erreur de syntaxe ou erreur métier (ou avertissement avec --strict)
+    2 → argument invalide (fichier / dossier introuvable)
+
+⚠️ N'importe QUE des modules sans dépendance lourde (pas de streamlit,
+plotly, pandas) : le démarrage doit rester bien sous la seconde.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from modules.batch import (
+    count_issues, find_config_files, format_entry,
+    format_report, iter_validate_files, summarize
+)
+from modules.errors_db import get_errors_db
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+TOOL_NAME = "CodeX-Validateur"
+TOOL_URI = "https://github.com/nicolassmt/CodeX-Validateur"
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# Règle SARIF utilisée quand l'erreur de syntaxe n'a pas été reconnue dans errors_db
+UNMATCHED_SYNTAX_RULE = "SYNTAX"
+
+
+# ==============================
+# COLLECTE DES FICHIERS
+# ==============================
+def collect_files(paths, recursive=True):
+    """
+    Transforme les arguments (fichiers et/ou dossiers) en liste de fichiers à valider.
+
+    Raises:
+        FileNotFoundError: si un chemin n'existe pas
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(find_config_files(path, recursive))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(str(path))
+    return files
+
+
+# ==============================
+# SORTIE JSON
+# ==============================
+def to_json_report(entries, summary):
+    """Rapport JSON : un objet par fichier + le résumé global"""
+    files = []
+    for entry in entries:
+        result = entry["result"]
+        errors, warnings = count_issues(result)
+        files.append({
+            "path": entry["path"],
+            "valid": result.get("valid", False),
+            "file_type": result.get("file_type"),
+            "dayz_type": result.get("dayz_type"),
+            "errors": errors,
+            "warnings": warnings,
+            "elapsed": round(entry["elapsed"], 4),
+            "error": result.get("error"),
+            "all_errors": result.get("all_errors") or [],
+            "semantic_warnings": result.get("semantic_warnings") or [],
+        })
+
+    summary = dict(summary)
+    summary["slowest"] = [{"path": path, "elapsed": round(elapsed, 4)} for path, elapsed in summary["slowest"]]
+    return {"files": files, "summary": summary}
+
+
+# ==============================
+# SORTIE SARIF (annotations GitHub / GitLab / VS Code)
+# ==============================
+def _sarif_location(path, line, column=0):
+    """Emplacement SARIF (lignes / colonnes commencent à 1)"""
+    region = {"startLine": max(line, 1)}
+    if column:
+        region["startColumn"] = column + 1
+    return [{
+        "physicalLocation": {
+            "artifactLocation": {"uri": Path(path).as_posix()},
+            "region": region
+        }
+    }]
+
+
+def to_sarif_report(entries):
+    """Rapport SARIF 2.1.0 : erreurs de syntaxe (ids errors_db) + règles métier"""
+    rules = {
+        error["id"]: {
+            "id": error["id"],
+            "shortDescription": {"text": error.get("titre", error["id"])},
+            "fullDescription": {"text": error.get("message_novice", error.get("titre", error["id"]))}
+        }
+        for error in get_errors_db()
+    }
+    results = []
+
+    for entry in entries:
+        result = entry["result"]
+        syntax_errors = [] if result.get("valid") else result.get("all_errors") or [result.get("error")]
+        for error in filter(None, syntax_errors):
+            matched = error.get("matched") or {}
+            rule_id = matched.get("id", UNMATCHED_SYNTAX_RULE)
+            rules.setdefault(rule_id, {"id": rule_id, "shortDescription": {"text": "Erreur de syntaxe"}})
+            results.append({
+                "ruleId": rule_id,
+                "level": "error",
+                "message": {"text": error.get("message_brut", "")},
+                "locations": _sarif_location(entry["path"], error.get("line", 0), error.get("column", 0))
+            })
+
+        for warning in result.get("semantic_warnings") or []:
+            rule_id = f"{result.get('dayz_type')}.{warning.get('rule', 'semantic')}"
+            rules.setdefault(rule_id, {"id": rule_id, "shortDescription": {"text": warning.get("rule", "semantic")}})
+            results.append({
+                "ruleId": rule_id,
+                "level": "error" if warning.get("severity") == "error" else "warning",
+                "message": {"text": warning.get("message", "")},
+                "locations": _sarif_location(entry["path"], warning.get("line", 0))
+            })
+
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": SARIF_VERSION,
+        "runs": [{
+            "tool": {"driver": {"name": TOOL_NAME, "informationUri": TOOL_URI, "rules": list(rules.values())}},
+            "results": results
+        }]
+    }
+
+
+# ==============================
+# POINT D'ENTRÉE
+# ==============================
+def build_parser():
+    """Arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        prog="python -m modules",
+        description="Valide des fichiers de configuration DayZ (XML / JSON) sans interface web."
+    )
+    parser.add_argument("paths", nargs="+", help="Fichiers et/ou dossiers à valider")
+    parser.add_argument("-f", "--format", choices=["text", "json", "sarif"], default="text",
+                        help="Format de sortie (défaut : text)")
+    parser.add_argument("-o", "--output", default=None, help="Fichier de sortie (défaut : sortie standard)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    parser.add_argument("--schema-version", default=None, help="Version DayZ des schémas (défaut : la plus récente)")
+    parser.add_argument("--no-recursive", action="store_true", help="Ne pas descendre dans les sous-dossiers")
+    parser.add_argument("--strict", action="store_true", help="Les avertissements font aussi échouer la commande")
+    return parser
+
+
+def main(argv=None):
+    """Point d'entrée CLI. Retourne le code de sortie (voir en-tête du module)"""
+    args = build_parser().parse_args(argv)
+
+    try:
+        files = collect_files(args.paths, recursive=not args.no_recursive)
+    except FileNotFoundError as e:
+        print(f"❌ Chemin introuvable : {e}", file=sys.stderr)
+        return 2
+
+    root = args.paths[0] if len(args.paths) == 1 and os.path.isdir(args.paths[0]) else None
+    text_mode = args.format == "text"
+    start = time.perf_counter()
+    entries = []
+
+    for entry in iter_validate_files(files, args.workers, args.schema_version):
+        entries.append(entry)
+        if text_mode:
+            print(format_entry(entry, root), flush=True)
+
+    # Ordre stable pour les formats machine (as_completed dépend du pool)
+    entries.sort(key=lambda entry: entry["path"])
+    summary = summarize(entries, time.perf_counter() - start)
+
+    if text_mode:
+        output = format_report(summary, root)
+    elif args.format == "json":
+        output = json.dumps(to_json_report(entries, summary), indent=2, ensure_ascii=False)
+    else:
+        output = json.dumps(to_sarif_report(entries), indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    failed = summary["errors"] or (args.strict and summary["warnings"])
+    return 1 if failed else 0
@@ -5,146 +5,546 @@ Affichage côte à côte pour que l'utilisateur voie exactement ce qui a changé
 """
 
 import re
-from difflib import unified_diff
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from modules.patches import sort_patches
+from modules.tokenizer import UNESCAPED_AMPERSAND_RE
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Nombre de paires (avant, après) gardées en cache
+DIFF_CACHE_SIZE = 4
+
+# Zone sans ligne unique : difflib seulement si lignes_avant × lignes_après reste sous ce seuil
+PATIENCE_FALLBACK_LIMIT = 250_000
+
+# Diff : lignes inchangées autour de chaque changement, et hunks par page
+DIFF_CONTEXT = 1
+DIFF_PAGE_SIZE = 20
+
+# Côte à côte : lignes inchangées gardées autour de chaque modification (le reste est replié)
+SIDE_BY_SIDE_CONTEXT = 3
 
 
 # ==============================
 # FONCTION PRINCIPALE
 # ==============================
-def compare_before_after(before, after):
+def compare_before_after(before, after, patches=None, context=DIFF_CONTEXT):
     """
     Compare deux versions d'un fichier et génère un diff lisible.
     
+    Les totaux sont calculés tout de suite (à partir des opcodes, sans
+    formater une seule ligne) ; les hunks sont générés à la demande : un diff
+    énorme n'est jamais assemblé en un seul texte. Pour afficher page par
+    page, voir get_diff_page.
+    
     Paramètres :
-        before → contenu original (string)
-        after  → contenu corrigé (string)
+        before  → contenu original (string)
+        after   → contenu corrigé (string)
+        patches → patches du correcteur (relatifs à before), optionnel :
+                  voir compute_diff
+        context → lignes inchangées autour de chaque changement
     
     Retourne :
         {
             "has_changes": bool,
-            "changes_count": int,
-            "diff_text": str,           → diff formaté pour affichage
+            "changes_count": int,       → lignes retirées + lignes ajoutées
+            "hunks_count": int,
+            "hunks": générateur de hunks (voir _format_hunk)
             "summary": str              → résumé en une ligne
         }
     """
-    before_lines = before.splitlines()
-    after_lines = after.splitlines()
-    
     # Si identiques
     if before == after:
         return {
             "has_changes": False,
             "changes_count": 0,
-            "diff_text": "",
+            "hunks_count": 0,
+            "hunks": iter(()),
             "summary": "Aucune modification détectée."
         }
     
-    # Génère le diff
-    diff = list(unified_diff(
-        before_lines,
-        after_lines,
-        lineterm='',
-        n=1  # 1 ligne de contexte autour de chaque changement
-    ))
+    # Diff calculé une fois (patches du correcteur ou patience), partagé par les vues
+    diff_data = compute_diff(before, after, patches)
+    opcodes = diff_data["opcodes"]
     
-    # Compte les changements réels (ignore les lignes de métadonnées)
-    changes_count = sum(1 for line in diff if line.startswith('+') or line.startswith('-'))
-    changes_count = changes_count - 2  # On retire les lignes --- et +++
+    changes_count = sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
+    hunks_count = sum(1 for _ in _group_opcodes(opcodes, context))
+    
+    return {
+        "has_changes": True,
+        "changes_count": changes_count,
+        "hunks_count": hunks_count,
+        "hunks": _iter_hunks(diff_data, context),
+        "summary": f"{changes_count} modification(s) appliquée(s)."
+    }
+
+
+def get_diff_page(before, after, page=0, page_size=DIFF_PAGE_SIZE, patches=None, context=DIFF_CONTEXT):
+    """
+    Une page de hunks du diff : seuls les hunks de la page sont formatés.
     
-    # Formate pour affichage
-    diff_text = _format_diff(diff, before_lines, after_lines)
+    Paramètres :
+        page      → numéro de page (commence à 0, ramené dans les bornes)
+        page_size → hunks par page
     
-    # Résumé
-    summary = f"{changes_count} modification(s) appliquée(s)."
+    Retourne :
+        {
+            "hunks": [hunk, ...],       → voir _format_hunk
+            "page": int,
+            "pages_count": int,
+            "hunks_count": int,
+            "changes_count": int,       → comme compare_before_after
+            "summary": str
+        }
+    """
+    diff_data = compute_diff(before, after, patches)
+    opcodes = diff_data["opcodes"]
+    # Hunks regroupés une seule fois (opcodes seulement) : le total et la page en découlent
+    groups = list(_group_opcodes(opcodes, context))
+    hunks_count = len(groups)
+    pages_count = max(-(-hunks_count // page_size), 1)
+    page = min(max(page, 0), pages_count - 1)
+    changes_count = sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
     
+    start = page * page_size
     return {
-        "has_changes": True,
+        "hunks": [
+            _format_hunk(group, diff_data["before_lines"], diff_data["after_lines"])
+            for group in groups[start:start + page_size]
+        ],
+        "page": page,
+        "pages_count": pages_count,
+        "hunks_count": hunks_count,
         "changes_count": changes_count,
-        "diff_text": diff_text,
-        "summary": summary
+        "summary": f"{changes_count} modification(s) appliquée(s)." if changes_count else "Aucune modification détectée."
     }
 
 
 # ==============================
-# FORMATAGE DU DIFF
+# MOTEUR DE DIFF (calculé une fois, partagé par toutes les vues)
 # ==============================
-def _format_diff(diff, before_lines, after_lines):
+def compute_diff(before, after, patches=None):
+    """
+    Diff par lignes entre deux versions, au format opcodes de difflib.
+    
+    - patches du correcteur disponibles → traduits directement en opcodes
+      (aucune comparaison des fichiers)
+    - sinon → diff "patience" sur les lignes converties en entiers
+      (difflib devient quadratique sur un types.xml de 50 000 lignes
+      plein de lignes répétées comme </type>)
+    
+    Le résultat est mis en cache : compare_before_after, compare_side_by_side
+    et get_changes_summary appelés sur les mêmes contenus ne recalculent rien.
+    
+    Retourne (partagé, ne pas modifier) :
+        {
+            "before_lines": [str, ...],      → before.split('\\n')
+            "after_lines": [str, ...],       → after.split('\\n')
+            "opcodes": [(tag, i1, i2, j1, j2), ...]
+        }
     """
-    Formate le diff pour un affichage clair dans Streamlit.
-    Retourne un texte avec marqueurs visuels.
+    return _cached_diff(before, after, tuple(patches) if patches is not None else None)
+
+
+@lru_cache(maxsize=DIFF_CACHE_SIZE)
+def _cached_diff(before, after, patches):
+    before_lines = before.split('\n')
+    after_lines = after.split('\n')
+    
+    if patches is not None:
+        opcodes = patches_to_opcodes(before, patches)
+    else:
+        a, b = _intern_lines(before_lines, after_lines)
+        opcodes = _opcodes_from_pairs(_patience_pairs(a, b), len(a), len(b))
+    
+    return {"before_lines": before_lines, "after_lines": after_lines, "opcodes": opcodes}
+
+
+def _intern_lines(before_lines, after_lines):
+    """Remplace chaque ligne par un entier (lignes identiques → même entier) : comparaisons en O(1)"""
+    ids = {}
+    a = [ids.setdefault(line, len(ids)) for line in before_lines]
+    b = [ids.setdefault(line, len(ids)) for line in after_lines]
+    return a, b
+
+
+def _patience_pairs(a, b):
     """
-    formatted = []
+    Diff patience : les lignes présentes UNE seule fois de chaque côté servent
+    d'ancres (plus longue sous-suite croissante), puis on recommence entre
+    deux ancres. Les zones sans ligne unique passent par difflib si elles
+    sont petites, sinon elles sont considérées entièrement remplacées.
     
-    for line in diff:
-        if line.startswith('---') or line.startswith('+++'):
-            # Ignore les métadonnées
-            continue
+    Returns:
+        list: [(i, j), ...] lignes identiques appariées, triées
+    """
+    pairs = []
+    ranges = [(0, len(a), 0, len(b))]
+    
+    while ranges:
+        alo, ahi, blo, bhi = ranges.pop()
         
-        elif line.startswith('@@'):
-            # Ligne de contexte (numéros de lignes)
-            formatted.append(f"\n{line}\n")
+        # Début et fin communs
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            pairs.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            pairs.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
         
-        elif line.startswith('-'):
-            # Ligne supprimée (code avant)
-            formatted.append(f"❌ AVANT  : {line[1:]}")
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            previous_i, previous_j = alo, blo
+            for i, j in anchors:
+                pairs.append((i, j))
+                ranges.append((previous_i, i, previous_j, j))
+                previous_i, previous_j = i + 1, j + 1
+            ranges.append((previous_i, ahi, previous_j, bhi))
+        elif (ahi - alo) * (bhi - blo) <= PATIENCE_FALLBACK_LIMIT:
+            matcher = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                pairs.extend((alo + i + k, blo + j + k) for k in range(size))
+    
+    pairs.sort()
+    return pairs
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi):
+    """Lignes uniques des deux côtés, gardées dans le même ordre (plus longue sous-suite croissante)"""
+    counts_a = Counter(a[alo:ahi])
+    counts_b = Counter(b[blo:bhi])
+    position_b = {
+        line: j for j, line in enumerate(b[blo:bhi], blo)
+        if counts_b[line] == 1 and counts_a[line] == 1
+    }
+    candidates = [(i, position_b[line]) for i, line in enumerate(a[alo:ahi], alo) if line in position_b]
+    if not candidates:
+        return []
+    
+    # Plus longue sous-suite croissante des positions dans b (tri par paquets + backpointers)
+    tops = []           # dernière position b de chaque pile
+    top_indexes = []    # index (dans candidates) du sommet de chaque pile
+    previous = [None] * len(candidates)
+    for index, (_, j) in enumerate(candidates):
+        pile = bisect_left(tops, j)
+        if pile:
+            previous[index] = top_indexes[pile - 1]
+        if pile == len(tops):
+            tops.append(j)
+            top_indexes.append(index)
+        else:
+            tops[pile] = j
+            top_indexes[pile] = index
+    
+    anchors = []
+    index = top_indexes[-1]
+    while index is not None:
+        anchors.append(candidates[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _opcodes_from_pairs(pairs, before_count, after_count):
+    """Opcodes (format difflib) à partir des lignes appariées"""
+    opcodes = []
+    i = j = 0
+    index = 0
+    while index <= len(pairs):
+        # Bloc de lignes identiques consécutives (ou sentinelle de fin)
+        if index < len(pairs):
+            block_i, block_j = pairs[index]
+            size = 1
+            while index + size < len(pairs) and pairs[index + size] == (block_i + size, block_j + size):
+                size += 1
+        else:
+            block_i, block_j, size = before_count, after_count, 0
         
-        elif line.startswith('+'):
-            # Ligne ajoutée (code après)
-            formatted.append(f"✅ APRÈS  : {line[1:]}")
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(("insert", i, i, j, block_j))
+        if size:
+            opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+        index += size or 1
+    return opcodes
+
+
+# ==============================
+# DIFF À PARTIR DES PATCHES DU CORRECTEUR
+# ==============================
+def patches_to_opcodes(before, patches):
+    """
+    Traduit des patches (positions dans before) en opcodes par ligne,
+    au format de difflib.SequenceMatcher.get_opcodes :
+        [(tag, i1, i2, j1, j2), ...]  tag = "equal", "replace", "delete", "insert"
+    
+    Les lignes sont celles de before.split('\\n') / after.split('\\n').
+    Coût proportionnel au nombre de patches (+ comptage des retours à la
+    ligne en C), au lieu d'une comparaison complète des deux fichiers.
+    """
+    before_count = before.count('\n') + 1
+    changes = []        # [ligne_début, ligne_fin (exclue), lignes ajoutées - lignes retirées]
+    line = 0            # ligne (0-based) de `position`
+    position = 0
+    
+    for patch in sort_patches(patches):
+        line += before.count('\n', position, patch.start)
+        position = patch.start
+        delta = patch.text.count('\n') - before.count('\n', patch.start, patch.end)
+        at_line_start = patch.start == 0 or before[patch.start - 1] == '\n'
+        at_line_end = patch.start == len(before) or before[patch.start] == '\n'
         
+        if patch.start == patch.end and at_line_start and patch.text.endswith('\n'):
+            # Lignes complètes insérées avant la ligne courante
+            change = [line, line, delta]
+        elif patch.start == patch.end and at_line_end and patch.text.startswith('\n'):
+            # Lignes complètes insérées après la ligne courante
+            change = [line + 1, line + 1, delta]
         else:
+            # Lignes touchées par le patch, remplacées
+            change = [line, line + before.count('\n', patch.start, patch.end) + 1, delta]
+        
+        # Fusion avec le changement précédent s'ils partagent une ligne (ou insèrent au même endroit)
+        if changes:
+            previous = changes[-1]
+            shares_line = change[0] < previous[1]
+            same_insertion = change[0] == change[1] == previous[0] == previous[1]
+            if shares_line or same_insertion:
+                previous[1] = max(previous[1], change[1])
+                previous[2] += change[2]
+                continue
+        changes.append(change)
+    
+    opcodes = []
+    i = j = 0
+    for start, end, delta in changes:
+        if start > i:
+            opcodes.append(("equal", i, start, j, j + start - i))
+            j += start - i
+        after_count = end - start + delta
+        tag = "insert" if end == start else "delete" if not after_count else "replace"
+        opcodes.append((tag, start, end, j, j + after_count))
+        i, j = end, j + after_count
+    if i < before_count:
+        opcodes.append(("equal", i, before_count, j, j + before_count - i))
+    return opcodes
+
+
+def _group_opcodes(opcodes, n):
+    """Regroupe les opcodes en hunks avec n lignes de contexte (comme difflib)"""
+    if not opcodes:
+        return
+    
+    # Contexte limité en début et en fin de fichier
+    opcodes = list(opcodes)
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == "equal":
+        opcodes[0] = (tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2)
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == "equal":
+        opcodes[-1] = (tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n))
+    
+    group = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # Longue zone inchangée : on ferme le hunk et on en commence un nouveau
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start, stop):
+    """Plage '@@' au format unified diff (comme difflib)"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+# ==============================
+# FORMATAGE DU DIFF
+# ==============================
+def _iter_hunks(diff_data, context):
+    """Hunks formatés un par un (générateur : rien n'est formaté d'avance)"""
+    before_lines = diff_data["before_lines"]
+    after_lines = diff_data["after_lines"]
+    for group in _group_opcodes(diff_data["opcodes"], context):
+        yield _format_hunk(group, before_lines, after_lines)
+
+
+def _format_hunk(group, before_lines, after_lines):
+    """
+    Formate un hunk pour un affichage clair dans Streamlit.
+    
+    Retourne :
+        {
+            "header": str,          → "@@ -a,b +c,d @@" (format unified diff)
+            "before_start": int,    → première ligne du hunk dans before (commence à 1)
+            "after_start": int,
+            "text": str             → lignes avec marqueurs visuels
+        }
+    """
+    first, last = group[0], group[-1]
+    formatted = []
+    
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
             # Ligne de contexte (inchangée)
-            formatted.append(f"   {line}")
+            formatted.extend(f"    {line}" for line in before_lines[i1:i2])
+            continue
+        # Ligne supprimée (code avant) puis ajoutée (code après)
+        formatted.extend(f"❌ AVANT  : {line}" for line in before_lines[i1:i2])
+        formatted.extend(f"✅ APRÈS  : {line}" for line in after_lines[j1:j2])
     
-    return "\n".join(formatted)
+    return {
+        "header": f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@",
+        "before_start": first[1] + 1,
+        "after_start": first[3] + 1,
+        "text": "\n".join(formatted)
+    }
 
 
 # ==============================
 # COMPARAISON CÔTE À CÔTE (alternative)
 # ==============================
-def compare_side_by_side(before, after):
+def compare_side_by_side(before, after, patches=None, context=SIDE_BY_SIDE_CONTEXT):
     """
-    Génère une comparaison côte à côte ligne par ligne.
-    Plus simple que unified_diff, mieux pour Streamlit avec colonnes.
+    Génère une comparaison côte à côte alignée sur le diff (une ligne insérée
+    ne décale pas toute la suite du fichier).
+    
+    Les zones inchangées sont repliées : seules les lignes modifiées et
+    `context` lignes autour sont renvoyées, la taille du résultat dépend du
+    nombre de modifications et pas de la longueur du fichier. Une zone
+    repliée se déplie à la demande avec expand_collapsed.
     
     Retourne :
         {
-            "before_lines": [(num, content, is_changed), ...],
-            "after_lines": [(num, content, is_changed), ...],
-            "changes_count": int
+            "segments": [
+                {
+                    "type": "lines",
+                    "before_lines": [(num, content, is_changed), ...],   → num = None pour une ligne vide d'alignement
+                    "after_lines": [(num, content, is_changed), ...]
+                },
+                {
+                    "type": "collapsed",
+                    "before_start": int,      → index (0-based) de la première ligne repliée
+                    "after_start": int,
+                    "count": int              → nombre de lignes identiques repliées
+                },
+                ...
+            ],
+            "changes_count": int,
+            "collapsed_count": int            → total des lignes repliées
         }
     """
-    before_lines = before.splitlines()
-    after_lines = after.splitlines()
+    diff_data = compute_diff(before, after, patches)
+    before_lines = diff_data["before_lines"]
+    after_lines = diff_data["after_lines"]
+    opcodes = diff_data["opcodes"]
     
-    max_len = max(len(before_lines), len(after_lines))
-    
-    before_formatted = []
-    after_formatted = []
+    segments = []
     changes_count = 0
+    collapsed_count = 0
+    
+    def rows_segment():
+        """Segment de lignes en cours (créé si le dernier segment est replié)"""
+        if not segments or segments[-1]["type"] != "lines":
+            segments.append({"type": "lines", "before_lines": [], "after_lines": []})
+        return segments[-1]
     
-    for i in range(max_len):
-        before_line = before_lines[i] if i < len(before_lines) else ""
-        after_line = after_lines[i] if i < len(after_lines) else ""
+    for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+        if tag == "equal":
+            # Contexte gardé avant / après les modifications voisines
+            head = context if index > 0 else 0
+            tail = context if index < len(opcodes) - 1 else 0
+            if i2 - i1 <= head + tail:
+                head, tail = i2 - i1, 0
+            
+            if head:
+                _append_equal_rows(rows_segment(), before_lines, i1, i1 + head, j1)
+            hidden = i2 - i1 - head - tail
+            if hidden:
+                segments.append({"type": "collapsed", "before_start": i1 + head, "after_start": j1 + head, "count": hidden})
+                collapsed_count += hidden
+            if tail:
+                _append_equal_rows(rows_segment(), before_lines, i2 - tail, i2, j2 - tail)
+            continue
         
-        is_changed = before_line != after_line
-        if is_changed:
+        # Bloc modifié : lignes face à face, complétées par des lignes vides
+        segment = rows_segment()
+        for k in range(max(i2 - i1, j2 - j1)):
+            i, j = i1 + k, j1 + k
+            segment["before_lines"].append((i + 1, before_lines[i], True) if i < i2 else (None, "", True))
+            segment["after_lines"].append((j + 1, after_lines[j], True) if j < j2 else (None, "", True))
             changes_count += 1
-        
-        before_formatted.append((i + 1, before_line, is_changed))
-        after_formatted.append((i + 1, after_line, is_changed))
     
     return {
-        "before_lines": before_formatted,
-        "after_lines": after_formatted,
-        "changes_count": changes_count
+        "segments": segments,
+        "changes_count": changes_count,
+        "collapsed_count": collapsed_count
     }
 
 
+def expand_collapsed(before, after, segment, patches=None, offset=0, limit=None):
+    """
+    Déplie (tout ou partie d') une zone repliée par compare_side_by_side.
+    
+    Paramètres :
+        segment → segment {"type": "collapsed", ...}
+        offset  → première ligne de la zone à renvoyer
+        limit   → nombre maximal de lignes (None = jusqu'à la fin de la zone)
+    
+    Retourne :
+        {
+            "before_lines": [(num, content, False), ...],
+            "after_lines": [(num, content, False), ...]
+        }
+    """
+    # Diff déjà en cache : les lignes ne sont pas re-découpées
+    before_lines = compute_diff(before, after, patches)["before_lines"]
+    
+    count = segment["count"] - offset
+    if limit is not None:
+        count = min(count, limit)
+    rows = {"before_lines": [], "after_lines": []}
+    if count > 0:
+        start = segment["before_start"] + offset
+        _append_equal_rows(rows, before_lines, start, start + count, segment["after_start"] + offset)
+    return rows
+
+
+def _append_equal_rows(rows, before_lines, i1, i2, j1):
+    """Ajoute des lignes identiques (numérotées des deux côtés) à un segment"""
+    for k, line in enumerate(before_lines[i1:i2]):
+        rows["before_lines"].append((i1 + k + 1, line, False))
+        rows["after_lines"].append((j1 + k + 1, line, False))
+
+
 # ==============================
 # RÉSUMÉ DES CHANGEMENTS
 # ==============================
-def get_changes_summary(before, after):
+def get_changes_summary(before, after, patches=None):
     """
     Analyse les changements et retourne un résumé détaillé.
     
@@ -152,24 +552,16 @@ def get_changes_summary(before, after):
         {
             "lines_added": int,
             "lines_removed": int,
-            "lines_modified": int,
+            "lines_modified": int,           → lignes remplacées face à face
             "specific_changes": [str, ...]   → liste des changements identifiés
         }
     """
-    before_lines = before.splitlines()
-    after_lines = after.splitlines()
-    
-    # Diff basique
-    diff = list(unified_diff(before_lines, after_lines, lineterm=''))
-    
-    lines_added = sum(1 for line in diff if line.startswith('+') and not line.startswith('+++'))
-    lines_removed = sum(1 for line in diff if line.startswith('-') and not line.startswith('---'))
+    # Même diff que compare_before_after (cache)
+    opcodes = compute_diff(before, after, patches)["opcodes"]
     
-    # Lignes modifiées = on compare ligne par ligne
-    lines_modified = 0
-    for i in range(min(len(before_lines), len(after_lines))):
-        if before_lines[i] != after_lines[i]:
-            lines_modified += 1
+    lines_added = sum(j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag in ("insert", "replace"))
+    lines_removed = sum(i2 - i1 for tag, i1, i2, j1, j2 in opcodes if tag in ("delete", "replace"))
+    lines_modified = sum(min(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag == "replace")
     
     # Changements spécifiques identifiés
     specific_changes = _identify_specific_changes(before, after)
@@ -205,8 +597,8 @@ def _identify_specific_changes(before, after):
         changes.append("Conversion guillemets simples → doubles")
     
     # Caractères spéciaux échappés
-    before_unescaped = len(re.findall(r'&(?!(amp|lt|gt|quot|apos);)', before))
-    after_unescaped = len(re.findall(r'&(?!(amp|lt|gt|quot|apos);)', after))
+    before_unescaped = len(UNESCAPED_AMPERSAND_RE.findall(before))
+    after_unescaped = len(UNESCAPED_AMPERSAND_RE.findall(after))
     if before_unescaped > after_unescaped:
         escaped = before_unescaped - after_unescaped
         changes.append(f"Échappement de {escaped} caractère(s) spéciaux (&)")
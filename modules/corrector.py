@@ -4,27 +4,29 @@ Applique les corrections automatiques sur le contenu.
 Uniquement les corrections sûres identifiées dans errors_db.json (correction_automatique: true).
 """
 
-import re
 import json
-from pathlib import Path
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from modules.errors_db import get_auto_correctable_ids
+from modules.errors_matcher import match_error
+from modules.json_repair import json_repair_patches
+from modules.patches import Patch, apply_patches, compose_patches, sort_patches
+from modules.tokenizer import (
+    UNESCAPED_AMPERSAND_RE, match_tags, tokenize_xml, unclosed_comment, unclosed_tags
+)
 
 
 # ==============================
-# CHARGEMENT DE LA BASE
+# CONFIGURATION
 # ==============================
-def load_errors_db():
-    """Charge errors_db.json pour savoir quelles corrections sont auto"""
-    db_path = Path(__file__).parent.parent / "data" / "errors_db.json"
-    with open(db_path, "r", encoding="utf-8") as f:
-        return json.load(f)["errors"]
+# Budget de la correction itérative (correct_until_valid)
+CORRECTION_MAX_ROUNDS = 10
+CORRECTION_TIME_BUDGET = 5.0    # secondes
 
-_ERRORS_DB = None
-
-def get_errors_db():
-    global _ERRORS_DB
-    if _ERRORS_DB is None:
-        _ERRORS_DB = load_errors_db()
-    return _ERRORS_DB
+# Ligne qui ouvre une balise (point d'insertion des fermantes manquantes)
+_OPEN_TAG_RE = re.compile(r'<\w+')
 
 
 # ==============================
@@ -32,43 +34,35 @@ def get_errors_db():
 # ==============================
 def find_unclosed_tags(content):
     """
-    Détecte les balises XML non fermées.
+    Détecte les balises XML non fermées (pile de tokenizer.match_tags).
     
     Retourne:
-        list: [(tag_name, line_number, position), ...]
+        list: [(tag_name, line_number, line_text), ...]
     """
-    # Stack pour tracker les balises ouvertes
-    open_tags = []
-    unclosed = []
-    
-    # Pattern pour balises
-    # Ouvrante: <tag ...> ou <tag>
-    # Fermante: </tag>
-    # Auto-fermante: <tag ... />
-    
+    unclosed, _ = _unclosed_tag_tokens(content)
+    if not unclosed:
+        return []
+
     lines = content.split('\n')
+    return [(token.name, token.line, lines[token.line - 1]) for token in unclosed]
+
+
+def _unclosed_tag_tokens(content):
+    """
+    Balises non fermées + fermantes qui les ont fermées implicitement.
     
-    for line_num, line in enumerate(lines, start=1):
-        # Ignorer commentaires
-        line_clean = re.sub(r'<!--.*?-->', '', line)
-        
-        # Trouver balises auto-fermantes (on les ignore)
-        line_clean = re.sub(r'<[^>]+/>', '', line_clean)
-        
-        # Trouver balises fermantes
-        closing_tags = re.findall(r'</(\w+)>', line_clean)
-        for tag in closing_tags:
-            if open_tags and open_tags[-1][0] == tag:
-                open_tags.pop()
-            # Sinon c'est une balise fermante orpheline (autre erreur)
-        
-        # Trouver balises ouvrantes
-        opening_tags = re.findall(r'<(\w+)(?:\s[^>]*)?>(?![^<]*/>)', line_clean)
-        for tag in opening_tags:
-            open_tags.append((tag, line_num, line))
-    
-    # Ce qui reste dans open_tags = balises non fermées
-    return open_tags
+    Retourne:
+        tuple: ([Token, ...] dans l'ordre du document, {start: Token fermant})
+    """
+    tokens = tokenize_xml(content)
+
+    # Commentaire non fermé : la suite du fichier n'est que du commentaire,
+    # ajouter des fermantes n'aurait aucun sens (correction manuelle XML_004)
+    if unclosed_comment(tokens):
+        return [], {}
+
+    tags = match_tags(tokens)
+    return unclosed_tags(tags), tags.skipped_by
 
 
 # ==============================
@@ -81,45 +75,94 @@ def fix_unclosed_tags(content):
     Retourne:
         tuple: (corrected_content, list_of_fixes)
     """
-    unclosed = find_unclosed_tags(content)
+    patches, fixes = unclosed_tag_patches(content)
+    return apply_patches(content, patches), fixes
+
+
+def unclosed_tag_patches(content):
+    """
+    Patches qui ajoutent les balises fermantes manquantes.
+    
+    Chaque fermante est insérée avant la première ligne suivante qui ouvre une
+    balise au même niveau d'indentation (ou moins), ou avant la ligne de la
+    fermante parente qui l'a fermée implicitement (</a> alors que <b> est
+    ouvert), sinon en fin de fichier.
+    Tous les points d'insertion sont calculés en un seul parcours des lignes :
+    linéaire, même avec des centaines de balises oubliées et une fermeture
+    tout en bas du fichier.
+    
+    Retourne:
+        tuple: ([Patch, ...], list_of_fixes)
+    """
+    unclosed, skipped_by = _unclosed_tag_tokens(content)
     
     if not unclosed:
-        return content, []
+        return [], []
     
     lines = content.split('\n')
-    fixes = []
     
-    # Parcourir les balises non fermées (de la plus récente à la plus ancienne)
-    for tag_name, line_num, original_line in reversed(unclosed):
-        # Trouver où insérer la balise fermante
-        # On cherche la prochaine balise ouvrante du même niveau ou la fin du fichier
-        
-        insert_line = None
+    # Balises non fermées par ligne : [(tag_name, indent, ligne de la fermante parente ou None), ...]
+    unclosed_by_line = {}
+    for token in unclosed:
+        original_line = lines[token.line - 1]
         indent = len(original_line) - len(original_line.lstrip())
-        
-        # Chercher la prochaine balise de même niveau ou niveau supérieur
-        for i in range(line_num, len(lines)):
-            current_line = lines[i]
-            current_indent = len(current_line) - len(current_line.lstrip())
-            
-            # Si on trouve une balise ouvrante au même niveau, on insère avant
-            if current_indent <= indent and re.search(r'<\w+', current_line):
-                insert_line = i
+        closer = skipped_by.get(token.start)
+        # Fermante sur la même ligne : on ne peut pas insérer avant elle, règles habituelles
+        closer_line = closer.line - 1 if closer is not None and closer.line != token.line else None
+        unclosed_by_line.setdefault(token.line - 1, []).append((token.name, indent, closer_line))
+    
+    # Pile des balises en attente d'un point d'insertion, dans l'ordre du document.
+    #   - une ligne qui ouvre une balise à l'indentation d ferme toutes celles d'indentation >= d :
+    #     une balise non fermée est toujours sur une ligne qui ouvre, donc tout ce qui est plus
+    #     indenté qu'elle a été retiré avant qu'elle soit empilée (indentations croissantes)
+    #   - une fermante parente ferme les balises ouvertes après son ouvrante : toujours le
+    #     haut de la pile
+    pending = []
+    insertions = {}     # index de ligne → [fermantes à insérer avant, de la plus interne à la plus externe]
+    
+    starts = list(unclosed_by_line)     # déjà dans l'ordre du document
+    next_start = 0
+    i = starts[0]
+    while i < len(lines):
+        if pending:
+            while pending and pending[-1][2] == i:
+                insertions.setdefault(i, []).append(pending.pop())
+            line = lines[i]
+            if pending and _OPEN_TAG_RE.search(line):
+                indent = len(line) - len(line.lstrip())
+                while pending and pending[-1][1] >= indent:
+                    insertions.setdefault(i, []).append(pending.pop())
+        if next_start < len(starts) and starts[next_start] == i:
+            pending.extend(unclosed_by_line[i])
+            next_start += 1
+        i += 1
+        # Rien en attente : saut direct à la prochaine balise non fermée
+        if not pending:
+            if next_start == len(starts):
                 break
-        
-        # Si pas trouvé, insérer à la fin
-        if insert_line is None:
-            insert_line = len(lines)
-        
-        # Créer la balise fermante avec la bonne indentation
-        closing_tag = ' ' * indent + f'</{tag_name}>'
-        
-        # Insérer la balise fermante
-        lines.insert(insert_line, closing_tag)
-        
-        fixes.append(f"Ajout de </{tag_name}> à la ligne {insert_line + 1}")
+            i = starts[next_start]
+    
+    # Pas trouvé → fin du fichier
+    if pending:
+        insertions[len(lines)] = pending[::-1]
+    
+    # Une insertion par fermante, au début de la ligne (ou après la dernière ligne)
+    patches = []
+    fixes = []
+    offset = 0          # index du début de la ligne `previous` dans le contenu
+    previous = 0
+    for index in sorted(insertions):
+        offset += sum(map(len, lines[previous:index])) + (index - previous)
+        previous = index
+        for tag_name, indent, _ in insertions[index]:
+            closing = ' ' * indent + f'</{tag_name}>'
+            if index < len(lines):
+                patches.append(Patch(offset, offset, closing + '\n'))
+            else:
+                patches.append(Patch(len(content), len(content), '\n' + closing))
+            fixes.append(f"Ajout de </{tag_name}> à la ligne {index + len(patches)}")
     
-    return '\n'.join(lines), fixes
+    return patches, fixes
 
 
 # ==============================
@@ -137,7 +180,8 @@ def auto_correct(content, file_type):
         {
             "corrected": str,                    → contenu corrigé
             "applied_corrections": [str, ...],   → liste des corrections appliquées
-            "has_changes": bool                  → vrai si au moins une correction
+            "has_changes": bool,                 → vrai si au moins une correction
+            "patches": [Patch, ...]              → modifications par position (patches.py)
         }
     """
     if file_type == "json":
@@ -149,7 +193,8 @@ def auto_correct(content, file_type):
     return {
         "corrected": content,
         "applied_corrections": [],
-        "has_changes": False
+        "has_changes": False,
+        "patches": []
     }
 
 
@@ -157,59 +202,189 @@ def auto_correct(content, file_type):
 # CORRECTIONS JSON
 # ==============================
 def _correct_json(content):
-    """Applique les corrections automatiques JSON"""
-    corrected = content
-    applied = []
-    
-    # 1. Virgules finales avant } ou ]
-    if re.search(r',\s*[}\]]', corrected):
-        corrected = re.sub(r',\s*}', '}', corrected)
-        corrected = re.sub(r',\s*]', ']', corrected)
-        applied.append("Suppression des virgules finales")
+    """
+    Applique les corrections automatiques JSON : virgules finales, guillemets
+    simples, clés sans guillemets, fermetures manquantes (json_repair, un seul
+    parcours qui ne touche jamais l'intérieur des chaînes)
+    """
+    return _apply_fixes(content, [json_repair_patches])
+
+
+# ==============================
+# CORRECTIONS XML
+# ==============================
+def _fix_unescaped_ampersands(content):
+    """& → &amp; (sauf entité déjà valide : &amp;, &#233;, &#x20AC;...) (XML_005)"""
+    patches = [Patch(m.start(), m.end(), '&amp;') for m in UNESCAPED_AMPERSAND_RE.finditer(content)]
+    return patches, [f"Échappement de {len(patches)} caractère(s) & → &amp;"] if patches else []
+
+
+def _correct_xml(content):
+    """Applique les corrections automatiques XML"""
+    # 1. Caractères spéciaux non échappés, 2. balises non fermées
+    return _apply_fixes(content, [_fix_unescaped_ampersands, unclosed_tag_patches])
+
+
+def _apply_fixes(content, fixes):
+    """
+    Calcule les patches de chaque correction (content → ([Patch], [descriptions]))
+    et les applique en un seul passage.
     
-    # 2. Guillemets simples → doubles
-    # ATTENTION : on ne fait ça QUE si on détecte des clés avec guillemets simples
-    # Pas si c'est du texte à l'intérieur d'une valeur
-    if re.search(r"'[^']*'\s*:", corrected):  # Pattern 'clé':
-        corrected = corrected.replace("'", '"')
-        applied.append("Conversion guillemets simples → doubles")
+    Les corrections d'un même type de fichier ne touchent jamais les mêmes
+    caractères (& / débuts de ligne en XML) : elles sont toutes calculées
+    sur le contenu d'origine, sans copie intermédiaire.
+    """
+    patches = []
+    applied = []
     
-    has_changes = len(applied) > 0
+    for fix in fixes:
+        fix_patches, descriptions = fix(content)
+        patches.extend(fix_patches)
+        applied.extend(descriptions)
     
+    patches = sort_patches(patches)
     return {
-        "corrected": corrected,
+        "corrected": apply_patches(content, patches),
         "applied_corrections": applied,
-        "has_changes": has_changes
+        "has_changes": len(applied) > 0,
+        "patches": patches
     }
 
 
 # ==============================
-# CORRECTIONS XML
+# CORRECTION ITÉRATIVE (jusqu'à un fichier valide)
 # ==============================
-def _correct_xml(content):
-    """Applique les corrections automatiques XML"""
+# Correction ciblée par erreur reconnue (id errors_db → correction)
+_FIXES_BY_ERROR_ID = {
+    "JSON_001": json_repair_patches,
+    "JSON_002": json_repair_patches,
+    "JSON_003": json_repair_patches,
+    "JSON_004": json_repair_patches,
+    "XML_005": _fix_unescaped_ampersands,
+    "XML_002": unclosed_tag_patches,
+    "XML_006": unclosed_tag_patches,
+}
+
+
+def _parse(content, file_type):
+    """Parse le contenu ; lève JSONDecodeError / ParseError comme le validateur"""
+    if file_type == "json":
+        json.loads(content)
+    else:
+        ET.fromstring(content)
+
+
+def _error_position(e):
+    """(ligne, colonne) d'une erreur du parseur JSON ou XML"""
+    if isinstance(e, json.JSONDecodeError):
+        return (e.lineno, e.colno)
+    return tuple(e.position)
+
+
+def correct_until_valid(content, file_type, matched=None,
+                        max_rounds=CORRECTION_MAX_ROUNDS, time_budget=CORRECTION_TIME_BUDGET):
+    """
+    Corrige le contenu par passes successives jusqu'à ce qu'il soit valide.
+    
+    À chaque passe : on re-parse, on reconnaît la NOUVELLE erreur signalée,
+    et on n'applique que la correction qui la cible. Arrêt quand le fichier
+    est valide, quand plus rien ne change (convergence), quand une passe
+    n'avance plus (même erreur au même endroit, ou mêmes patches que la
+    passe précédente), quand l'erreur n'est pas corrigeable, ou quand le
+    budget (passes / secondes) est épuisé.
+    
+    Si le fichier n'est pas devenu valide, le résultat retourné est celui
+    de la passe dont l'erreur est la plus loin dans le fichier (le parseur
+    est allé le plus loin), pas forcément celui de la dernière passe.
+    
+    Paramètres :
+        content     → contenu brut du fichier
+        file_type   → "json" ou "xml"
+        matched     → entrée errors_db de la première erreur (évite de la reconnaître à nouveau)
+        max_rounds  → nombre maximal de passes de correction
+        time_budget → temps maximal (secondes)
+    
+    Retourne :
+        {
+            "corrected": str,                    → contenu de la passe retenue
+            "applied_corrections": [str, ...],   → corrections appliquées, dans l'ordre
+            "has_changes": bool,
+            "valid": bool,                       → le contenu corrigé se parse sans erreur
+            "rounds": int,                       → nombre de passes de correction retenues
+            "stop_reason": str,                  → "valid", "not_fixable", "no_change",
+                                                   "no_progress", "max_rounds" ou "time_budget"
+            "patches": [Patch, ...]              → passes retenues, relatives à `content`
+        }
+    """
+    deadline = time.perf_counter() + time_budget
     corrected = content
     applied = []
+    patches = []
+    rounds = 0
+    previous = None     # (id de l'erreur, position, patches) de la passe précédente
+    best = None         # état où le parseur est allé le plus loin : (position, corrected, nb corrections, patches, rounds)
     
-    # 1. Caractères spéciaux non échappés
-    # & → &amp; (sauf si déjà échappé)
-    unescaped_count = len(re.findall(r'&(?!(amp|lt|gt|quot|apos);)', corrected))
-    if unescaped_count > 0:
-        corrected = re.sub(r'&(?!(amp|lt|gt|quot|apos);)', '&amp;', corrected)
-        applied.append(f"Échappement de {unescaped_count} caractère(s) & → &amp;")
-    
-    # ✨ 2. NOUVEAU : Balises non fermées
-    corrected_with_tags, tag_fixes = fix_unclosed_tags(corrected)
-    if tag_fixes:
-        corrected = corrected_with_tags
-        applied.extend(tag_fixes)
+    while True:
+        try:
+            _parse(corrected, file_type)
+            stop_reason = "valid"
+            break
+        except (json.JSONDecodeError, ET.ParseError) as e:
+            position = _error_position(e)
+            # La première erreur est déjà reconnue par le validateur
+            if matched is None or rounds > 0:
+                matched = match_error(corrected, e, file_type)
+        error_id = (matched or {}).get("id")
+        
+        # La passe précédente n'a pas fait avancer le parseur
+        if previous is not None and previous[:2] == (error_id, position):
+            stop_reason = "no_progress"
+            break
+        if best is None or position > best[0]:
+            best = (position, corrected, len(applied), patches, rounds)
+        
+        if rounds >= max_rounds:
+            stop_reason = "max_rounds"
+            break
+        if time.perf_counter() > deadline:
+            stop_reason = "time_budget"
+            break
+        
+        fix = _FIXES_BY_ERROR_ID.get(error_id)
+        if fix is None or not can_auto_correct(matched):
+            stop_reason = "not_fixable"
+            break
+        
+        round_patches, descriptions = fix(corrected)
+        if not round_patches:
+            stop_reason = "no_change"
+            break
+        
+        round_patches = sort_patches(round_patches)
+        if previous is not None and round_patches == previous[2]:
+            stop_reason = "no_progress"
+            break
+        previous = (error_id, position, round_patches)
+        
+        # Patches cumulés, toujours exprimés par rapport au contenu d'origine
+        patches = compose_patches(patches, round_patches, corrected)
+        corrected = apply_patches(corrected, round_patches)
+        applied.extend(descriptions)
+        rounds += 1
     
-    has_changes = len(applied) > 0
+    # Pas de fichier valide : on garde la passe où le parseur est allé le plus loin
+    if stop_reason != "valid":
+        _, corrected, applied_count, patches, rounds = best
+        applied = applied[:applied_count]
     
     return {
         "corrected": corrected,
         "applied_corrections": applied,
-        "has_changes": has_changes
+        "has_changes": rounds > 0,
+        "valid": stop_reason == "valid",
+        "rounds": rounds,
+        "stop_reason": stop_reason,
+        "patches": patches
     }
 
 
@@ -229,11 +404,8 @@ def can_auto_correct(error_matched):
     if not error_matched:
         return False
     
-    # ✨ NOUVEAU : Les balises non fermées sont maintenant auto-corrigeables
-    if error_matched.get("id") in ["XML_002", "XML_006"]:
-        return True
-    
-    return error_matched.get("correction_automatique", False)
+    # Ensemble précalculé (errors_db.json + balises non fermées, voir errors_db.py)
+    return error_matched.get("id") in get_auto_correctable_ids()
 
 
 # ==============================
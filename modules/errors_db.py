@@ -0,0 +1,73 @@
+"""
+errors_db.py
+Catalogue des erreurs connues (data/errors_db.json), chargé UNE fois par processus.
+
+errors_matcher, corrector et la CLI partagent la même instance :
+    - index par id en lecture seule (MappingProxyType) → recherche O(1)
+    - données dérivées précalculées (ids corrigeables automatiquement)
+
+⚠️ Les entrées sont partagées : ne jamais les modifier, faire .copy() avant
+(comme errors_matcher.match_xml_error quand il ajoute le nom de balise).
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+ERRORS_DB_PATH = Path(__file__).parent.parent / "data" / "errors_db.json"
+
+# Corrigées par corrector.fix_unclosed_tags même si errors_db.json indique false
+FORCED_AUTO_CORRECT_IDS = frozenset({"XML_002", "XML_006"})
+
+
+# ==============================
+# CHARGEMENT
+# ==============================
+def load_errors_db():
+    """Lit errors_db.json depuis le dossier data/ (sans cache)"""
+    with open(ERRORS_DB_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["errors"]
+
+
+@lru_cache(maxsize=1)
+def _catalogue():
+    """
+    Construit le catalogue partagé (appelé une seule fois par processus).
+
+    Returns:
+        dict: {"entries": tuple, "by_id": MappingProxyType, "auto_correctable": frozenset}
+    """
+    entries = tuple(load_errors_db())
+    by_id = MappingProxyType({entry["id"]: entry for entry in entries})
+    auto_correctable = frozenset(
+        entry["id"] for entry in entries if entry.get("correction_automatique")
+    ) | FORCED_AUTO_CORRECT_IDS
+    return {"entries": entries, "by_id": by_id, "auto_correctable": auto_correctable}
+
+
+# ==============================
+# ACCÈS
+# ==============================
+def get_errors_db():
+    """Toutes les entrées, dans l'ordre du fichier (tuple partagé)"""
+    return _catalogue()["entries"]
+
+
+def get_errors_by_id():
+    """Index {id: entrée} en lecture seule"""
+    return _catalogue()["by_id"]
+
+
+def get_error_by_id(error_id):
+    """Retourne l'entrée de errors_db correspondant à l'id (ou None), en O(1)"""
+    return _catalogue()["by_id"].get(error_id)
+
+
+def get_auto_correctable_ids():
+    """Ids des erreurs corrigeables automatiquement (frozenset)"""
+    return _catalogue()["auto_correctable"]
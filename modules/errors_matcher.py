@@ -5,28 +5,14 @@ Retourne le bon message, les exemples, et le niveau (novice/modder)
 ✨ AMÉLIORÉ : Extrait le nom exact des balises problématiques
 """
 
-import json
 import re
-from pathlib import Path
-
-# ==============================
-# CHARGEMENT DE LA BASE
-# ==============================
-def load_errors_db():
-    """Charge errors_db.json depuis le dossier data/"""
-    db_path = Path(__file__).parent.parent / "data" / "errors_db.json"
-    with open(db_path, "r", encoding="utf-8") as f:
-        return json.load(f)["errors"]
-
-# Cache en mémoire pour ne pas relire le fichier à chaque fois
-_ERRORS_DB = None
-
-def get_errors_db():
-    global _ERRORS_DB
-    if _ERRORS_DB is None:
-        _ERRORS_DB = load_errors_db()
-    return _ERRORS_DB
 
+from modules.errors_db import get_error_by_id
+from modules.tokenizer import (
+    SELF_CLOSING_TAGS, malformed_attributes, match_tags, tokenize_xml,
+    tokens_on_line, tokens_until_line, unclosed_comment, unclosed_tags,
+    unescaped_ampersand_in_attributes
+)
 
 # ==============================
 # ✨ NOUVEAU : EXTRACTION NOM BALISE
@@ -49,20 +35,14 @@ def extract_tag_name_from_error(error_msg, content, line_num):
     if tag_match:
         return tag_match.group(1)
     
-    # Si pas dans le message, chercher dans la ligne problématique
-    lines = content.split('\n')
-    if 0 < line_num <= len(lines):
-        problem_line = lines[line_num - 1]
-        
-        # Chercher balise fermante
-        closing_tag = re.search(r'</(\w+)>', problem_line)
-        if closing_tag:
-            return closing_tag.group(1)
-        
-        # Chercher balise ouvrante
-        opening_tag = re.search(r'<(\w+)', problem_line)
-        if opening_tag:
-            return opening_tag.group(1)
+    # Si pas dans le message, chercher dans les tokens de la ligne problématique
+    line_tokens = tokens_on_line(tokenize_xml(content), line_num)
+
+    # Chercher balise fermante, puis balise ouvrante
+    for kinds in (("close",), ("open", "self_close")):
+        for token in line_tokens:
+            if token.kind in kinds and token.name:
+                return token.name
     
     return None
 
@@ -78,30 +58,11 @@ def find_unclosed_tag_name(content, error_line):
     Returns:
         str: Nom de la balise non fermée ou None
     """
-    lines = content.split('\n')
-    open_tags = []
-    
-    # Parser jusqu'à la ligne d'erreur
-    for i, line in enumerate(lines[:error_line], start=1):
-        # Ignorer commentaires
-        line_clean = re.sub(r'<!--.*?-->', '', line)
-        
-        # Ignorer balises auto-fermantes
-        line_clean = re.sub(r'<[^>]+/>', '', line_clean)
-        
-        # Trouver balises fermantes
-        closing_tags = re.findall(r'</(\w+)>', line_clean)
-        for tag in closing_tags:
-            if open_tags and open_tags[-1] == tag:
-                open_tags.pop()
-        
-        # Trouver balises ouvrantes
-        opening_tags = re.findall(r'<(\w+)(?:\s[^>]*)?>(?![^<]*/>)', line_clean)
-        for tag in opening_tags:
-            open_tags.append(tag)
+    # Pile de balises sur les tokens jusqu'à la ligne d'erreur
+    unclosed = unclosed_tags(match_tags(tokens_until_line(tokenize_xml(content), error_line)))
     
     # La dernière balise ouverte = balise non fermée
-    return open_tags[-1] if open_tags else None
+    return unclosed[-1].name if unclosed else None
 
 
 # ==============================
@@ -112,24 +73,23 @@ def match_json_error(content, error):
     Prend le contenu du fichier + l'erreur JSONDecodeError
     Retourne l'entrée correspondante de errors_db ou None
     """
-    db = get_errors_db()
     msg = str(error).lower()
 
     # Virgule finale avant } ou ]
     if re.search(r',\s*[}\]]', content):
-        return _get_by_id("JSON_001")
+        return get_error_by_id("JSON_001")
 
     # Guillemets simples
     if "'" in content and ("expecting" in msg or "expecting property" in msg):
-        return _get_by_id("JSON_002")
+        return get_error_by_id("JSON_002")
 
     # Clé sans guillemets
     if "expecting property name" in msg:
-        return _get_by_id("JSON_003")
+        return get_error_by_id("JSON_003")
 
     # Accolade / crochet non fermé
     if _check_parentheses_balance(content):
-        return _get_by_id("JSON_004")
+        return get_error_by_id("JSON_004")
 
     return None
 
@@ -148,15 +108,15 @@ def match_xml_error(content, error):
 
     # Commentaire non fermé (vérifie en premier — bloque tout le reste)
     if _check_unclosed_comment(content):
-        return _get_by_id("XML_004")
+        return get_error_by_id("XML_004")
 
     # Caractère spécial non échappé
-    if re.search(r'&(?!(amp|lt|gt|quot|apos);)', content):
-        return _get_by_id("XML_005")
+    if _check_unescaped_ampersand(content):
+        return get_error_by_id("XML_005")
 
     # ✨ Mismatch tag (balise fermante qui ne correspond pas)
     if "mismatched tag" in msg or "opening and ending tag mismatch" in msg:
-        matched = _get_by_id("XML_006")
+        matched = get_error_by_id("XML_006")
         if matched:
             tag_name = extract_tag_name_from_error(str(error), content, error_line)
             if tag_name:
@@ -172,7 +132,7 @@ def match_xml_error(content, error):
 
     # ✨ Balise ouvrante sans fermeture
     if "no element found" in msg or "unclosed token" in msg:
-        matched = _get_by_id("XML_002")
+        matched = get_error_by_id("XML_002")
         if matched:
             tag_name = find_unclosed_tag_name(content, error_line)
             if tag_name:
@@ -193,10 +153,10 @@ def match_xml_error(content, error):
     if "not well-formed" in msg or "syntax error" in msg:
         # Vérifie si c'est vraiment un attribut
         if _check_malformed_attribute(content):
-            return _get_by_id("XML_003")
+            return get_error_by_id("XML_003")
         # Sinon c'est probablement une balise auto-fermante mal écrite
         if _check_missing_self_close(content):
-            return _get_by_id("XML_001")
+            return get_error_by_id("XML_001")
 
     return None
 
@@ -213,45 +173,27 @@ def _check_parentheses_balance(content):
 
 def _check_unclosed_comment(content):
     """Vérifie s'il y a un commentaire XML non fermé"""
-    opens = [m.start() for m in re.finditer(r'<!--', content)]
-    closes = [m.start() for m in re.finditer(r'-->', content)]
-    return len(opens) > len(closes)
+    return unclosed_comment(tokenize_xml(content)) is not None
+
+def _check_unescaped_ampersand(content):
+    """Vérifie s'il y a un & non échappé (texte ou attribut, hors commentaires)"""
+    return any(
+        token.kind == "amp" or unescaped_ampersand_in_attributes(token)
+        for token in tokenize_xml(content)
+    )
 
 def _check_malformed_attribute(content):
-    """Vérifie s'il y a un attribut mal formé dans le contenu"""
-    # Attribut sans valeur : name= sans guillemets après
-    if re.search(r'\w+=\s*[^"\s>]', content):
-        return True
-    # Attribut avec = mais rien après
-    if re.search(r'\w+=\s*[>\/]', content):
-        return True
-    return False
+    """Vérifie s'il y a un attribut mal formé (sans guillemets ou sans valeur)"""
+    return any(malformed_attributes(token) for token in tokenize_xml(content))
 
 def _check_missing_self_close(content):
     """Vérifie les balises qui devraient être auto-fermantes mais ne le sont pas"""
-    # Liste des balises connues comme auto-fermantes dans DayZ
-    self_closing_tags = [
-        "current", "limits", "timelimits", "changelimits",
-        "thresholds", "storm", "item", "type", "zone"
-    ]
-    for tag in self_closing_tags:
-        # Cherche une balise ouverte sans /> ni </tag>
-        pattern = rf'<{tag}\s[^>]*[^/]>'
-        if re.search(pattern, content):
-            return True
-    return False
-
-
-# ==============================
-# RÉCUPÉRATION PAR ID
-# ==============================
-def _get_by_id(error_id):
-    """Retourne l'entrée de errors_db correspondant à l'id"""
-    db = get_errors_db()
-    for entry in db:
-        if entry["id"] == error_id:
-            return entry
-    return None
+    # Balise DayZ auto-fermante restée ouverte, sans enfant : il manque le />
+    tags = match_tags(tokenize_xml(content))
+    return any(
+        token.name in SELF_CLOSING_TAGS and token.start in tags.childless
+        for token in unclosed_tags(tags)
+    )
 
 
 # ==============================
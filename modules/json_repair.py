@@ -0,0 +1,125 @@
+"""
+json_repair.py
+Réparation JSON en un seul parcours, qui respecte les chaînes de caractères.
+
+L'ancienne correction remplaçait TOUS les ' du fichier par des " dès qu'une
+clé 'clé': apparaissait, et ses regex de virgules finales touchaient aussi
+les virgules à l'intérieur des textes ("a, b,]"). Ici le contenu est
+découpé en tokens (chaînes, mots, ponctuation) : une virgule ou un
+guillemet à l'intérieur d'une chaîne n'est jamais modifié.
+
+Corrections (sous forme de patches, voir patches.py) :
+    - virgule finale avant } ou ]              → supprimée
+    - 'texte' entre guillemets simples         → "texte"
+    - clé sans guillemets : damage: 45         → "damage": 45
+    - { ou [ jamais fermé                      → } ou ] ajouté
+
+Linéaire : un seul finditer sur le contenu + une pile de conteneurs.
+"""
+
+import re
+
+from modules.patches import Patch
+
+
+# ==============================
+# TOKENS
+# ==============================
+_TOKEN_RE = re.compile(r'''
+      (?P<string>"(?:[^"\\\n]|\\.)*"?)
+    | (?P<squote>'(?:[^'\\\n]|\\.)*(?P<squote_end>')?)
+    | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<word>[A-Za-z_$][\w$]*)
+    | (?P<punct>[{}\[\]:,])
+    | (?P<other>[^\s{}\[\]:,"'/A-Za-z_$]+|/)
+''', re.S | re.X)
+
+_NEXT_COLON_RE = re.compile(r'\s*:')
+
+# Dans une chaîne entre guillemets simples : \' devient ', " doit être échappé
+_SQUOTE_INNER_RE = re.compile(r'\\(.)|"', re.S)
+
+_CLOSING = {'{': '}', '[': ']'}
+
+
+def _to_double_quoted(token):
+    """'texte' → "texte" (échappements conservés, " échappés)"""
+    def convert(match):
+        escaped = match.group(1)
+        if escaped is None:
+            return '\\"'
+        return "'" if escaped == "'" else match.group(0)
+    return '"' + _SQUOTE_INNER_RE.sub(convert, token[1:-1]) + '"'
+
+
+# ==============================
+# RÉPARATION
+# ==============================
+def json_repair_patches(content):
+    """
+    Calcule les patches de réparation d'un contenu JSON (un seul parcours).
+
+    Returns:
+        tuple: ([Patch, ...], [descriptions])
+    """
+    patches = []
+    counts = {"commas": 0, "quotes": 0, "keys": 0, "closings": 0}
+    stack = []              # conteneurs ouverts : '{' ou '['
+    last_comma = None       # index de la virgule si c'est le dernier token significatif
+    last_end = 0            # fin du dernier token significatif
+
+    def remove_trailing_comma():
+        if last_comma is not None:
+            patches.append(Patch(last_comma, last_comma + 1, ''))
+            counts["commas"] += 1
+
+    for match in _TOKEN_RE.finditer(content):
+        kind = match.lastgroup
+        start, end = match.span()
+        if kind == "comment":
+            continue
+
+        if kind == "squote" and match.group("squote_end"):
+            patches.append(Patch(start, end, _to_double_quoted(match.group())))
+            counts["quotes"] += 1
+
+        elif kind == "word" and stack and stack[-1] == '{' and _NEXT_COLON_RE.match(content, end):
+            patches.append(Patch(start, end, f'"{match.group()}"'))
+            counts["keys"] += 1
+
+        elif kind == "punct":
+            token = match.group()
+            if token in '}]':
+                opening = '{' if token == '}' else '['
+                if opening in stack:
+                    remove_trailing_comma()
+                    # Conteneurs ouverts plus haut et jamais fermés : on les ferme juste avant
+                    missing = []
+                    while stack[-1] != opening:
+                        missing.append(_CLOSING[stack.pop()])
+                    stack.pop()
+                    if missing:
+                        patches.append(Patch(start, start, ''.join(missing)))
+                        counts["closings"] += len(missing)
+            elif token in '{[':
+                stack.append(token)
+
+        last_comma = start if kind == "punct" and match.group() == ',' else None
+        last_end = end
+
+    # Fin du fichier : on ferme tout ce qui reste ouvert
+    if stack:
+        remove_trailing_comma()
+        patches.append(Patch(last_end, last_end, ''.join(_CLOSING[opening] for opening in reversed(stack))))
+        counts["closings"] += len(stack)
+
+    descriptions = []
+    if counts["commas"]:
+        descriptions.append(f"Suppression de {counts['commas']} virgule(s) finale(s)")
+    if counts["quotes"]:
+        descriptions.append(f"Conversion de {counts['quotes']} chaîne(s) guillemets simples → doubles")
+    if counts["keys"]:
+        descriptions.append(f"Ajout de guillemets autour de {counts['keys']} clé(s)")
+    if counts["closings"]:
+        descriptions.append(f"Ajout de {counts['closings']} fermeture(s) manquante(s) (}} ou ])")
+    return patches, descriptions
@@ -0,0 +1,103 @@
+"""
+map_images.py
+Images de fond de la carte interactive, préparées UNE fois par processus.
+
+Avant, create_map ouvrait l'image avec PIL, la ré-encodait en PNG puis en
+base64 à chaque rerun et pour chaque onglet : plusieurs Mo de data URI
+renvoyés au navigateur à chaque clic. Maintenant l'image est copiée (ou
+réduite si elle dépasse MAP_IMAGE_MAX_SIZE) dans static/maps/, servie par
+Streamlit (enableStaticServing dans .streamlit/config.toml) : le graphique
+ne contient plus qu'une URL, et le navigateur garde l'image en cache.
+"""
+
+import base64
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Dossier servi par Streamlit sous app/static/
+STATIC_DIR = Path(__file__).parent.parent / "static" / "maps"
+STATIC_URL = "app/static/maps"
+
+# Plus grand côté (pixels) d'une image de fond ; au-delà elle est réduite (si Pillow est disponible)
+MAP_IMAGE_MAX_SIZE = 2048
+
+# Signatures des formats servis (certaines cartes .webp sont en réalité des JPEG)
+#   premiers octets → (extension, type MIME, format Pillow)
+_SIGNATURES = {
+    b'\xff\xd8\xff': ("jpg", "image/jpeg", "JPEG"),
+    b'\x89PNG': ("png", "image/png", "PNG"),
+    b'RIFF': ("webp", "image/webp", "WEBP"),
+}
+
+
+def _image_format(path):
+    """(extension, type MIME, format Pillow) d'après les premiers octets du fichier"""
+    with open(path, 'rb') as f:
+        header = f.read(4)
+    for signature, image_format in _SIGNATURES.items():
+        if header.startswith(signature):
+            return image_format
+    raise ValueError(f"Format d'image non supporté : {Path(path).name}")
+
+
+# ==============================
+# PRÉPARATION
+# ==============================
+def _prepare_static_copy(source, extension, pil_format):
+    """
+    Écrit l'image dans static/maps/ (réduite si trop grande) si la copie est
+    absente ou plus ancienne que la source.
+
+    Returns:
+        str: nom du fichier servi
+    """
+    target = STATIC_DIR / f"{source.stem}.{extension}"
+    if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+        return target.name
+
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+    if Image is not None:
+        with Image.open(source) as img:
+            if max(img.size) > MAP_IMAGE_MAX_SIZE:
+                img.thumbnail((MAP_IMAGE_MAX_SIZE, MAP_IMAGE_MAX_SIZE))
+                img.save(target, format=pil_format)
+                return target.name
+
+    # Déjà à la bonne taille (ou Pillow absent) : le fichier d'origine tel quel
+    shutil.copyfile(source, target)
+    return target.name
+
+
+@lru_cache(maxsize=None)
+def _map_image_source(path, mtime_ns):
+    """Source de l'image pour une version du fichier (mtime_ns fait partie de la clé)"""
+    source = Path(path)
+    extension, mime, pil_format = _image_format(source)
+    try:
+        return f"{STATIC_URL}/{_prepare_static_copy(source, extension, pil_format)}"
+    except OSError:
+        # Dossier static non inscriptible : data URI du fichier d'origine, sans ré-encodage
+        return f"data:{mime};base64,{base64.b64encode(source.read_bytes()).decode()}"
+
+
+def map_image_source(img_path):
+    """
+    Source (URL static ou, à défaut, data URI) de l'image de fond d'une carte.
+    Calculée une fois par processus et par version du fichier.
+
+    Raises:
+        OSError: image introuvable
+        ValueError: format non supporté
+    """
+    path = Path(img_path)
+    return _map_image_source(str(path), path.stat().st_mtime_ns)
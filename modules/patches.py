@@ -0,0 +1,128 @@
+"""
+patches.py
+Corrections exprimées en opérations de remplacement par position (patches).
+
+Au lieu de réécrire tout le fichier avec un re.sub par correction (une copie
+complète du contenu à chaque fois, et plus aucune trace de ce qui a bougé),
+chaque correction produit une liste de patches. Ils sont appliqués en un
+seul passage dans un seul buffer, et le comparateur les lit directement
+pour construire le diff sans re-comparer tout le fichier.
+
+Patch :
+    start → index de début dans le contenu d'origine
+    end   → index de fin (exclu) ; start == end pour une insertion
+    text  → texte qui remplace content[start:end] ("" pour une suppression)
+"""
+
+from collections import namedtuple
+
+
+Patch = namedtuple("Patch", "start end text")
+
+
+# ==============================
+# APPLICATION
+# ==============================
+def sort_patches(patches):
+    """
+    Trie les patches par position (tri stable : plusieurs insertions au même
+    endroit gardent leur ordre) et vérifie qu'ils ne se chevauchent pas.
+
+    Raises:
+        ValueError: si deux patches modifient la même zone
+    """
+    patches = sorted(patches, key=lambda patch: patch.start)
+    for previous, patch in zip(patches, patches[1:]):
+        if patch.start < previous.end:
+            raise ValueError(f"Patches qui se chevauchent : {previous} / {patch}")
+    return patches
+
+
+def apply_patches(content, patches):
+    """
+    Applique les patches en un seul passage.
+
+    Returns:
+        str: contenu corrigé (content tel quel si aucun patch)
+    """
+    if not patches:
+        return content
+
+    parts = []
+    position = 0
+    for patch in sort_patches(patches):
+        parts.append(content[position:patch.start])
+        parts.append(patch.text)
+        position = patch.end
+    parts.append(content[position:])
+    return "".join(parts)
+
+
+# ==============================
+# COMPOSITION (corrections en plusieurs passes)
+# ==============================
+def compose_patches(base, new, current):
+    """
+    Exprime deux passes de patches par rapport au contenu d'origine.
+
+    Args:
+        base (list): patches triés, relatifs au contenu d'origine
+        new (list): patches relatifs à `current`
+        current (str): apply_patches(origine, base)
+
+    Returns:
+        list: patches triés, relatifs au contenu d'origine, tels que
+              apply_patches(origine, résultat) == apply_patches(current, new)
+    """
+    if not base:
+        return sort_patches(new)
+    if not new:
+        return list(base)
+
+    # Zones de `current` : [début, fin, patch de base ou None, patches new]
+    intervals = []
+    delta = 0
+    for patch in base:
+        start = patch.start + delta
+        intervals.append((start, start + len(patch.text), patch, None))
+        delta += len(patch.text) - (patch.end - patch.start)
+    intervals.extend((patch.start, patch.end, None, patch) for patch in new)
+    # À position égale : les patches de base d'abord (ils fixent le décalage)
+    intervals.sort(key=lambda interval: (interval[0], interval[2] is None))
+
+    # Regroupe les zones qui se touchent (bornes incluses)
+    clusters = []
+    for start, end, base_patch, new_patch in intervals:
+        if clusters and start <= clusters[-1][1]:
+            cluster = clusters[-1]
+            cluster[1] = max(cluster[1], end)
+        else:
+            cluster = [start, end, [], []]
+            clusters.append(cluster)
+        if base_patch is not None:
+            cluster[2].append(base_patch)
+        else:
+            cluster[3].append(new_patch)
+
+    result = []
+    delta = 0   # décalage current → origine avant la zone courante
+    for start, end, base_patches, new_patches in clusters:
+        shift = sum(len(patch.text) - (patch.end - patch.start) for patch in base_patches)
+        if not new_patches:
+            result.extend(base_patches)
+        elif not base_patches:
+            result.extend(Patch(patch.start - delta, patch.end - delta, patch.text) for patch in new_patches)
+        else:
+            # Zone mixte : on la remplace d'un bloc par son texte final
+            first, last = base_patches[0], base_patches[-1]
+            origin_start = min(first.start, start - delta)
+            origin_end = max(last.end, end - delta - shift)
+            # Texte de current couvrant exactement [origin_start, origin_end)
+            current_start = origin_start + delta
+            current_end = origin_end + delta + shift
+            segment = current[current_start:current_end]
+            local = [Patch(patch.start - current_start, patch.end - current_start, patch.text) for patch in new_patches]
+            result.append(Patch(origin_start, origin_end, apply_patches(segment, local)))
+        delta += shift
+
+    return result
@@ -0,0 +1,132 @@
+"""
+result_cache.py
+Cache des résultats de validation, partagé par toutes les sessions du processus.
+
+La clé est un hash du contenu (+ type de fichier + version du schéma +
+empreinte des fichiers du schéma, un schéma modifié sur disque invalide
+donc les résultats) : re-valider un fichier inchangé (re-upload, rerun Streamlit, autre joueur
+qui envoie le même types.xml vanilla) ne relance pas le parsing.
+Le cache est un LRU borné en nombre d'entrées ET en octets estimés.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from modules.schema_registry import resolve_version, schema_stamp
+from modules.validator import validate
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Taille maximale estimée du cache (octets)
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Nombre maximal de résultats gardés
+RESULT_CACHE_MAX_ENTRIES = 256
+
+# Estimation forfaitaire d'un warning / d'une erreur (dict + message)
+_ITEM_OVERHEAD = 256
+
+
+# ==============================
+# ÉTAT DU PROCESSUS
+# ==============================
+_CACHE = OrderedDict()   # {clé: (résultat, taille estimée)}, du plus ancien au plus récent
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+# ==============================
+# CLÉ + TAILLE
+# ==============================
+def content_key(content, file_type, schema_version=None):
+    """
+    Clé de cache : (hash BLAKE2 du contenu, type de fichier, version du schéma,
+    empreinte des schémas de cette version).
+    La version est résolue pour que None et la version par défaut partagent l'entrée.
+    """
+    data = content.encode('utf-8', errors='surrogatepass') if isinstance(content, str) else content
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    version = resolve_version(schema_version)
+    return (digest, file_type, version, schema_stamp(version))
+
+
+def _estimate_size(result):
+    """Taille approximative (octets) d'un résultat gardé en cache"""
+    size = _ITEM_OVERHEAD
+    for field in ("formatted", "corrected"):
+        if result.get(field):
+            size += len(result[field])
+    for field in ("semantic_warnings", "all_errors"):
+        if result.get(field):
+            size += _ITEM_OVERHEAD * len(result[field])
+    if result.get("error"):
+        size += _ITEM_OVERHEAD
+    if result.get("correction"):
+        patches = result["correction"].get("patches") or ()
+        size += sum(_ITEM_OVERHEAD + len(patch.text) for patch in patches)
+    return size
+
+
+# ==============================
+# VALIDATION MISE EN CACHE
+# ==============================
+def validate_cached(content, file_type, schema_version=None):
+    """
+    Même contrat que validator.validate, mais mémorisé par contenu.
+
+    Le dict retourné est une copie de premier niveau : ses listes et
+    sous-dicts (error, semantic_warnings) sont partagés avec le cache,
+    ne pas les modifier.
+
+    Returns:
+        dict structuré (voir validator.py)
+    """
+    key = content_key(content, file_type, schema_version)
+
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None:
+            _CACHE.move_to_end(key)
+            _STATS["hits"] += 1
+            return dict(entry[0])
+        _STATS["misses"] += 1
+
+    # Validation hors verrou : les autres sessions ne sont pas bloquées
+    result = validate(content, file_type, schema_version)
+    _store(key, result, _estimate_size(result))
+    return dict(result)
+
+
+def _store(key, result, size):
+    """Ajoute un résultat puis évince les plus anciens au-delà des limites"""
+    if size > RESULT_CACHE_MAX_BYTES:
+        return
+
+    with _LOCK:
+        previous = _CACHE.pop(key, None)
+        if previous is not None:
+            _STATS["bytes"] -= previous[1]
+
+        _CACHE[key] = (result, size)
+        _STATS["bytes"] += size
+
+        while _STATS["bytes"] > RESULT_CACHE_MAX_BYTES or len(_CACHE) > RESULT_CACHE_MAX_ENTRIES:
+            _, (_, evicted_size) = _CACHE.popitem(last=False)
+            _STATS["bytes"] -= evicted_size
+            _STATS["evictions"] += 1
+
+
+def cache_stats():
+    """Statistiques du cache : hits, misses, evictions, bytes, entries"""
+    with _LOCK:
+        return {**_STATS, "entries": len(_CACHE)}
+
+
+def clear_cache():
+    """Vide le cache (ex. après modification d'un schéma sur disque)"""
+    with _LOCK:
+        _CACHE.clear()
+        _STATS["bytes"] = 0
@@ -0,0 +1,544 @@
+"""
+rule_engine.py
+Moteur de règles métier compilé depuis les schémas JSON (schemas/dayz_<version>/*.json).
+
+Les contraintes déclarées dans le schéma sont transformées UNE fois par version
+en fonctions Python, puis évaluées en boucle serrée sur chaque élément :
+    - balises / attributs obligatoires ("required": true)
+    - plages de valeurs ("min" / "max")
+    - relations entre champs ("validation_rules": ["must_be_greater_or_equal_to_min", ...])
+    - valeurs autorisées ("values" des enums, flags et booléens 0/1)
+    - règles métier nommées de la section "validation_rules" du schéma
+
+Les messages et la sévérité viennent de la section "validation_rules" du schéma
+quand une règle porte le nom attendu (min_lte_nominal, lifetime_positive,
+flags_binary, ...). Sinon un message générique est utilisé.
+
+Ajouter une contrainte dans le schéma suffit pour qu'elle soit vérifiée.
+Seules les règles métier non déclaratives (ex: no_usage_no_spawn) demandent
+un prédicat Python dans ELEMENT_PREDICATES / ECONOMY_PREDICATES.
+"""
+
+import re
+import threading
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Balise → libellé utilisé en tête des messages
+ELEMENT_LABELS = {
+    "type": "Item",
+    "event": "Event",
+    "child": "Child",
+}
+
+# Sévérités par défaut quand le schéma n'en déclare pas
+SEVERITY_REQUIRED = "warning"
+SEVERITY_RANGE = "warning"
+SEVERITY_ENUM = "warning"
+SEVERITY_NOT_INTEGER = "error"
+SEVERITY_RELATION = "error"
+
+_RELATION_RE = re.compile(r'^must_be_(greater|less)(_or_equal)?_(?:than|to)_(\w+)$')
+_BETWEEN_RE = re.compile(r'^must_be_between_(\w+)_and_(\w+)$')
+
+
+# ==============================
+# PRÉDICATS DES RÈGLES MÉTIER NOMMÉES
+# ==============================
+def _flag(ctx, name):
+    """Valeur d'un attribut de <flags> ('0' si absent)"""
+    flags = ctx["by_tag"].get("flags")
+    return flags[0].get(name, '0') if flags else '0'
+
+
+# Règle nommée du schéma → prédicat (True = la règle est enfreinte)
+ELEMENT_PREDICATES = {
+    # types.xml
+    "disabled_item_coherence": lambda ctx: ctx["values"].get("nominal") == 0 and (ctx["values"].get("min") or 0) > 0,
+    "no_usage_no_spawn": lambda ctx: (ctx["values"].get("nominal") or 0) > 0 and not ctx["by_tag"].get("usage") and _flag(ctx, "crafted") != '1',
+    "crafted_without_usage": lambda ctx: _flag(ctx, "crafted") == '1' and bool(ctx["by_tag"].get("usage")),
+    # events.xml
+    "disabled_event_warning": lambda ctx: ctx["values"].get("active") == 0,
+    "zero_nominal_warning": lambda ctx: ctx["values"].get("nominal") == 0,
+}
+
+# Règle nommée d'economy.xml → prédicat(system, attrs, rule) ; retourne le dict de formatage ou None
+ECONOMY_PREDICATES = {
+    "building_respawn_zero": lambda system, attrs, rule: (
+        {"value": attrs.get("respawn", '0')}
+        if system == "building" and attrs.get("respawn", '0') != '0' else None
+    ),
+    "player_all_enabled": lambda system, attrs, rule: (
+        {"config": " ".join(f"{k}='{attrs.get(k, '0')}'" for k in ("init", "load", "respawn", "save"))}
+        if system == "player" and not all(attrs.get(k, '0') == '1' for k in ("init", "load", "respawn", "save")) else None
+    ),
+    "load_without_save_warning": lambda system, attrs, rule: (
+        {} if attrs.get("load", '0') == '1' and attrs.get("save", '0') == '0' else None
+    ),
+    "critical_system_disabled": lambda system, attrs, rule: (
+        {} if system in rule.get("applies_to", ()) and '0' in (attrs.get("save", '0'), attrs.get("load", '0')) else None
+    ),
+}
+
+
+# ==============================
+# CACHE DES RÈGLES COMPILÉES
+# ==============================
+_COMPILED = {}   # {(file_type, version): (schema, rules)}
+_LOCK = threading.Lock()
+
+
+def get_compiled_rules(file_type, schema):
+    """
+    Retourne les règles compilées d'un schéma (compilées une seule fois par version).
+
+    Returns:
+        dict: {
+            "element": str ou None,              → balise validée une à une ('type', 'event')
+            "check_element": callable ou None,   → f(elem, idx, line=None) -> [warning, ...]
+            "check_document": callable ou None   → f(root, lines=None) -> [warning, ...]
+        }
+    """
+    key = (file_type, schema.get("version"))
+    cached = _COMPILED.get(key)
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    with _LOCK:
+        cached = _COMPILED.get(key)
+        if cached is None or cached[0] is not schema:
+            cached = (schema, compile_rules(file_type, schema))
+            _COMPILED[key] = cached
+        return cached[1]
+
+
+def evaluate_rules(root, file_type, schema, lines=None):
+    """
+    Évalue toutes les règles compilées sur un arbre complet.
+    `lines` ({Element: ligne}, voir parse_xml_document) donne la ligne
+    source de chaque warning ; sans lui, la ligne est l'index de l'élément.
+    """
+    lines = lines or {}
+    rules = get_compiled_rules(file_type, schema)
+    warnings = []
+
+    check_element = rules["check_element"]
+    if check_element:
+        for idx, elem in enumerate(root.iterfind(rules["element"]), start=1):
+            warnings.extend(check_element(elem, idx, lines.get(elem)))
+
+    if rules["check_document"]:
+        warnings.extend(rules["check_document"](root, lines))
+
+    return warnings
+
+
+# ==============================
+# COMPILATION
+# ==============================
+def compile_rules(file_type, schema):
+    """Compile un schéma en fonctions de validation (voir get_compiled_rules)"""
+    catalog = schema.get("validation_rules", {})
+
+    if file_type == "economy":
+        return {
+            "element": None,
+            "check_element": None,
+            "check_document": _compile_economy(schema, catalog),
+        }
+
+    tag = schema.get("structure", {}).get("child_element")
+    spec = schema.get(f"{tag}_element") if tag else None
+    if not spec:
+        return {"element": None, "check_element": None, "check_document": None}
+
+    evaluate = _compile_evaluator(spec.get("attributes", {}), spec.get("children", {}), catalog, "")
+    label = ELEMENT_LABELS.get(tag, tag)
+    name_key = f"{label.lower()}_name"
+
+    def check_element(elem, idx, line=None):
+        name = elem.get('name') or f'{label} #{idx}'
+        by_tag = {}
+        for child in elem:
+            if child.tag in by_tag:
+                by_tag[child.tag].append(child)
+            else:
+                by_tag[child.tag] = [child]
+
+        found = evaluate(elem, by_tag, {name_key: name})
+        if not found:
+            return []
+        return _to_warnings(found, label, name, line if line is not None else idx)
+
+    return {"element": tag, "check_element": check_element, "check_document": None}
+
+
+def _compile_evaluator(attributes, children, catalog, prefix):
+    """
+    Transforme les contraintes d'un élément en tables, puis en fonction d'évaluation.
+    
+    Args:
+        attributes (dict): Attributs de l'élément (schéma)
+        children (dict): Champs de l'élément (balises enfants, ou attributs si prefix == 'child_')
+        catalog (dict): Section "validation_rules" du schéma
+        prefix (str): Préfixe des noms de règles ('' ou 'child_')
+    """
+    # Un seul tuple par champ entier : lecture, conversion, "> 0" et plage min/max
+    integers = []
+    for field, spec in children.items():
+        if spec.get("type") not in ("integer", "boolean_int"):
+            continue
+        lower, upper = spec.get("min"), spec.get("max")
+        positive_key = None
+        if "must_be_greater_than_zero" in spec.get("validation_rules", []):
+            positive_key = f"{prefix}{field}_positive"
+            lower = None  # La règle "> 0" couvre déjà la borne basse
+        if spec.get("type") != "integer":
+            lower = upper = None
+        integers.append((
+            field,
+            spec.get("default"),
+            positive_key,
+            lower if lower is not None else float("-inf"),
+            upper if upper is not None else float("inf"),
+            _special_values(spec),
+            f"{prefix}{field}_range",
+            f"[{spec.get('min', '-∞')}, {spec.get('max', '+∞')}]",
+        ))
+
+    enums = []
+    attribute_values = []
+    containers = []
+    for field, spec in children.items():
+        field_type = spec.get("type")
+        if field_type in ("enum", "boolean_int"):
+            is_bool = field_type == "boolean_int"
+            enums.append((
+                field,
+                spec.get("attribute"),
+                frozenset(str(v) for v in spec.get("values", [])),
+                spec.get("quantity") == "single",
+                f"{prefix}{field}_binary" if is_bool else f"{prefix}{field}_values",
+                SEVERITY_RELATION if is_bool else SEVERITY_ENUM,
+            ))
+        elif field_type == "element_with_attributes":
+            allowed = {
+                attr: frozenset(str(v) for v in attr_spec["values"])
+                for attr, attr_spec in spec.get("attributes", {}).items()
+                if attr_spec.get("values")
+            }
+            if allowed:
+                attribute_values.append((field, allowed, f"{prefix}{field}_binary"))
+        elif field_type == "container" and spec.get("child_element"):
+            child_spec = spec["child_element"]
+            child_tag = child_spec.get("name", "child")
+            containers.append((
+                field,
+                child_tag,
+                _compile_evaluator({}, child_spec.get("attributes", {}), catalog, f"{child_tag}_"),
+            ))
+
+    required_attributes = tuple(a for a, s in attributes.items() if s.get("required"))
+    required_children = tuple(f for f, s in children.items() if s.get("required")) if not prefix else ()
+    from_attributes = bool(prefix)
+    integers = tuple(integers)
+    relations = tuple(_compile_relations(children, catalog, prefix))
+    enums = tuple(enums)
+    attribute_values = tuple(attribute_values)
+    containers = tuple(containers)
+    predicates = tuple(
+        (name, ELEMENT_PREDICATES[name]) for name in catalog
+        if name in ELEMENT_PREDICATES and not prefix
+    )
+
+    # ==============================
+    # ÉVALUATION (tables liées en variables locales)
+    # ==============================
+    def evaluate(elem, by_tag, names):
+        """
+        Évalue les contraintes compilées sur un élément.
+        
+        Returns:
+            list: [(clé_règle, sévérité, message, nommé), ...] — "nommé" indique
+                  que le message contient déjà le nom de l'élément
+        """
+        found = []
+
+        # 1. Attributs et balises obligatoires
+        for attr in required_attributes:
+            if not elem.get(attr):
+                found.append((f"{attr}_required", *_format(
+                    catalog, f"{attr}_required", SEVERITY_REQUIRED,
+                    f"attribut '{attr}' obligatoire manquant ou vide.", {}, names
+                )))
+        for field in required_children:
+            if field not in by_tag:
+                found.append((f"{field}_required", *_format(
+                    catalog, f"{field}_required", SEVERITY_REQUIRED,
+                    f"balise <{field}> obligatoire manquante.", {}, names
+                )))
+
+        # 2. Entiers : une seule conversion par champ, puis "> 0" et plage min/max
+        values = {}
+        for field, default, positive_key, low, high, specials, range_key, shown_range in integers:
+            if from_attributes:
+                raw = elem.get(field)
+            else:
+                nodes = by_tag.get(field)
+                raw = nodes[0].text if nodes else None
+            if raw is None:
+                if default is not None:
+                    values[field] = default
+                continue
+            try:
+                value = int(raw)
+            except ValueError:
+                found.append((f"{field}_integer", SEVERITY_NOT_INTEGER,
+                              f"{field} ('{raw.strip()}') doit être un nombre entier.", False))
+                continue
+            values[field] = value
+
+            if positive_key and value <= 0:
+                found.append((positive_key, *_format(
+                    catalog, positive_key, SEVERITY_RELATION, f"{field} ({value}) doit être > 0.", values, names
+                )))
+            elif not (low <= value <= high) and value not in specials:
+                found.append((range_key, *_format(
+                    catalog, range_key, SEVERITY_RANGE,
+                    f"{field} ({value}) hors de la plage autorisée {shown_range}.", values, names
+                )))
+
+        # 3. Relations entre champs
+        for low, high, strict, key, specials_low, specials_high in relations:
+            a = values.get(low)
+            b = values.get(high)
+            if a is None or b is None or a in specials_low or b in specials_high:
+                continue
+            if a > b or (strict and a == b):
+                found.append((key, *_format(
+                    catalog, key, SEVERITY_RELATION,
+                    f"{low} ({a}) {'≥' if strict else '>'} {high} ({b}).", values, names
+                )))
+
+        # 4. Valeurs autorisées
+        for field, attribute, allowed, single, key, severity in enums:
+            nodes = by_tag.get(field)
+            if not nodes:
+                continue
+            if single and len(nodes) > 1:
+                found.append((f"{field}_single", SEVERITY_ENUM,
+                              f"plusieurs <{field}> alors qu'une seule est attendue.", False))
+            if not allowed:
+                continue
+            for node in nodes:
+                value = node.get(attribute) if attribute else node.text
+                if value in allowed:
+                    continue
+                value = (value or '').strip()
+                if value not in allowed:
+                    shown = f'<{field} {attribute}="{value}">' if attribute else f"{field} ({value})"
+                    found.append((f"{key}:{value}", *_format(
+                        catalog, key, severity,
+                        f"{shown} : valeur inconnue (attendu : {', '.join(sorted(allowed))}).",
+                        {field: value, "value": value}, names
+                    )))
+
+        for field, allowed, key in attribute_values:
+            nodes = by_tag.get(field)
+            if not nodes:
+                continue
+            for attr, value in nodes[0].attrib.items():
+                accepted = allowed.get(attr)
+                if accepted is not None and value not in accepted:
+                    found.append((f"{key}:{attr}", *_format(
+                        catalog, key, SEVERITY_RELATION,
+                        f"<{field}> {attr} ({value}) doit valoir {' ou '.join(sorted(accepted))}.",
+                        {"flag_name": attr, "value": value}, names
+                    )))
+
+        # 5. Éléments imbriqués (ex: <children><child .../></children>)
+        #    Dédoublonnage par (règle, rang de l'enfant) : une même règle peut viser plusieurs enfants
+        for field, child_tag, child_evaluate in containers:
+            child_index = 0
+            for container in by_tag.get(field, ()):
+                for child in container.iter(child_tag):
+                    child_type = child.get('type', 'unknown')
+                    for key, severity, message, has_name in child_evaluate(
+                        child, None, {f"{child_tag}_type": child_type}
+                    ):
+                        if not has_name:
+                            message = f"{child_tag} '{child_type}': {message}"
+                        found.append(((key, child_index), severity, message, False))
+                    child_index += 1
+
+        # 6. Règles métier nommées
+        if predicates:
+            ctx = {"elem": elem, "by_tag": by_tag, "values": values}
+            for name, predicate in predicates:
+                if predicate(ctx):
+                    found.append((name, *_format(catalog, name, "warning", name, values, names)))
+
+        return found
+
+    return evaluate
+
+
+def _special_values(spec):
+    """Valeurs spéciales entières d'un champ (ex: quantmin = -1 → non applicable)"""
+    return frozenset(int(v) for v in spec.get("valeur_speciale", {}) if v.lstrip('-').isdigit())
+
+
+def _compile_relations(fields, catalog, prefix):
+    """
+    Compile les règles 'must_be_*_to_<autre champ>' en comparaisons a ≤ b / a < b.
+    Une même relation déclarée des deux côtés (min ≤ nominal / nominal ≥ min) n'est gardée qu'une fois.
+    """
+    relations = {}
+    for field, spec in fields.items():
+        for rule in spec.get("validation_rules", []):
+            between = _BETWEEN_RE.match(rule)
+            if between:
+                low, high = between.groups()
+                relations.setdefault((low, field), False)
+                relations.setdefault((field, high), False)
+                continue
+
+            match = _RELATION_RE.match(rule)
+            if not match or match.group(3) not in fields:
+                continue
+            direction, or_equal, other = match.groups()
+            pair = (other, field) if direction == "greater" else (field, other)
+            relations[pair] = relations.get(pair, False) or not or_equal
+
+    # Règle chaînée du catalogue (ex: min_lte_nominal_lte_max) → un seul message par élément
+    chains = [
+        (name, name[len(prefix):].split("_lte_"))
+        for name in catalog
+        if name.startswith(prefix) and name.count("_lte_") >= 2
+    ]
+
+    compiled = []
+    for (low, high), strict in relations.items():
+        key = f"{prefix}{low}_lte_{high}"
+        for name, chain in chains:
+            if low in chain and high in chain and chain.index(low) < chain.index(high):
+                key = name
+                break
+        compiled.append((
+            low, high, strict, key,
+            _special_values(fields[low]), _special_values(fields[high]),
+        ))
+    return compiled
+
+
+def _to_warnings(found, label, name, line):
+    """
+    Convertit les règles enfreintes en warnings (une seule fois par règle).
+    Règle d'un élément imbriqué : (clé, rang de l'enfant) → une fois par
+    enfant, mais "rule" ne contient que la clé.
+    """
+    warnings = []
+    seen = set()
+    for dedupe_key, severity, message, has_name in found:
+        if dedupe_key in seen:
+            continue
+        seen.add(dedupe_key)
+        rule_key = dedupe_key[0] if isinstance(dedupe_key, tuple) else dedupe_key
+        warnings.append({
+            "severity": severity,
+            "message": message if has_name else f"{label} '{name}': {message}",
+            "line": line,
+            "rule": rule_key
+        })
+    return warnings
+
+
+def _format(catalog, rule_key, default_severity, default_message, fmt, names):
+    """
+    Retourne (sévérité, message, nommé) depuis le catalogue du schéma ou les valeurs par défaut.
+    "nommé" = le modèle du schéma contient déjà le nom de l'élément (ex: {event_name}).
+    """
+    rule = catalog.get(rule_key)
+    if not rule or "error_message_fr" not in rule:
+        return default_severity, default_message, False
+
+    template = rule["error_message_fr"]
+    message = template.format_map(_SafeFormat(fmt, **names))
+    if message[-1].isalnum() or message[-1] == ')':
+        message += "."
+    has_name = any("{" + key + "}" in template for key in names)
+    return rule.get("severity", default_severity), message, has_name
+
+
+class _SafeFormat(dict):
+    """Dict de formatage qui laisse les {clés} inconnues telles quelles"""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+# ==============================
+# ECONOMY.XML (règles au niveau document)
+# ==============================
+def _compile_economy(schema, catalog):
+    """Compile les règles d'economy.xml : systèmes requis, attributs 0/1, règles nommées"""
+    required_systems = schema.get("structure", {}).get("required_systems", [])
+    system_spec = schema.get("system_element", {})
+    required_attributes = system_spec.get("required_attributes", [])
+    allowed = {
+        attr: {str(v) for v in spec["values"]}
+        for attr, spec in system_spec.get("attributes", {}).items()
+        if spec.get("values")
+    }
+    named_rules = [
+        (name, rule, ECONOMY_PREDICATES[name])
+        for name, rule in catalog.items()
+        if name in ECONOMY_PREDICATES
+    ]
+
+    def message(rule_key, default_severity, default_message, fmt, line):
+        severity, text, _ = _format(catalog, rule_key, default_severity, default_message, fmt, {})
+        return {"severity": severity, "message": text, "line": line, "rule": rule_key}
+
+    def check_document(root, lines=None):
+        lines = lines or {}
+        warnings = []
+        systems = {child.tag: child for child in root if isinstance(child.tag, str)}
+        root_line = lines.get(root, 0)
+
+        for system in required_systems:
+            if system not in systems:
+                warnings.append(message(
+                    "required_systems", SEVERITY_REQUIRED,
+                    f"Système '{system}' manquant dans economy.xml.", {"system": system},
+                    root_line
+                ))
+
+        for system, elem in systems.items():
+            attrs = elem.attrib
+            line = lines.get(elem, 0)
+            for attr in required_attributes:
+                if attr not in attrs:
+                    warnings.append(message(
+                        "required_attributes", SEVERITY_REQUIRED,
+                        f"Système '{system}': attribut '{attr}' manquant.", {"system": system, "attribute": attr},
+                        line
+                    ))
+            for attr, value in attrs.items():
+                if attr in allowed and value not in allowed[attr]:
+                    warnings.append(message(
+                        "binary_values", SEVERITY_RELATION,
+                        f"Système '{system}': attribut '{attr}' doit être 0 ou 1 (actuellement : {value}).",
+                        {"system": system, "attribute": attr, "value": value},
+                        line
+                    ))
+            for name, rule, predicate in named_rules:
+                fmt = predicate(system, attrs, rule)
+                if fmt is not None:
+                    fmt.setdefault("system", system)
+                    warnings.append(message(name, "warning", name, fmt, line))
+
+        return warnings
+
+    return check_document
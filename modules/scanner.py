@@ -0,0 +1,332 @@
+"""
+scanner.py
+Relève TOUTES les erreurs de structure d'un fichier XML ou JSON en une seule passe.
+
+Le parseur Python s'arrête à la première erreur : sur un types.xml de
+20 000 lignes avec 10 erreurs, il faudrait 10 allers-retours upload →
+correction → re-upload. Ce scanner parcourt les tokens partagés
+(tokenizer.py, aussi utilisés par le locator, le matcher et le correcteur)
+et continue après chaque erreur (récupération) au lieu de s'arrêter.
+
+Chaque erreur :
+    {
+        "line": int,            → ligne (commence à 1)
+        "column": int,          → colonne (commence à 0, comme les erreurs du parseur
+                                   dans validator.py, JSON compris)
+        "message": str,         → explication courte en français
+        "error_id": str ou None → id errors_db correspondant (XML_002, JSON_001...)
+    }
+"""
+
+import re
+from bisect import bisect_left
+
+from modules.tokenizer import (
+    SELF_CLOSING_TAGS, malformed_attributes, match_tags, position_of,
+    tokenize_xml, unclosed_tags, unescaped_ampersand_in_attributes
+)
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Nombre maximal d'erreurs remontées (un fichier binaire ne doit pas en produire 1 million)
+MAX_ERRORS = 500
+
+
+# ==============================
+# POSITIONS (ligne / colonne)
+# ==============================
+def _with_positions(content, raw_errors):
+    """
+    Convertit les erreurs (index, message, error_id) en dicts avec ligne / colonne.
+    Les erreurs sont triées par index puis les lignes comptées en un seul
+    parcours : rien n'est calculé pour les tokens sans erreur.
+    """
+    errors = []
+    line, line_start, pos = 1, 0, 0
+    for index, message, error_id in sorted(raw_errors, key=lambda error: error[0]):
+        newlines = content.count('\n', pos, index)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', pos, index) + 1
+        pos = index
+        errors.append({"line": line, "column": index - line_start, "message": message, "error_id": error_id})
+    return errors
+
+
+# ==============================
+# XML
+# ==============================
+def scan_xml_errors(content):
+    """
+    Relève toutes les erreurs de structure XML en une passe sur les tokens
+    partagés (tokenizer.tokenize_xml).
+
+    Pile de balises avec récupération (tokenizer.match_tags) :
+        - </b> attendu mais </a> trouvé plus bas dans la pile → les balises
+          intermédiaires sont signalées non fermées, puis on continue
+        - </x> sans ouvrante → signalée orpheline, puis ignorée
+        - balises restantes en fin de fichier → non fermées
+
+    Returns:
+        list: erreurs triées par position (voir en-tête du module)
+    """
+    tokens = tokenize_xml(content)
+    tags = match_tags(tokens)
+    errors = []         # [(ligne, colonne, message, error_id)]
+
+    for token in tokens:
+        kind = token.kind
+        if kind == "open" or kind == "self_close":
+            if not token.complete:
+                errors.append((token.line, token.column, f"Balise <{token.name}> non terminée (il manque >).", "XML_003"))
+            elif malformed_attributes(token):
+                errors.append((token.line, token.column, f"Attribut mal formé dans <{token.name}>. Format attendu : nom=\"valeur\".", "XML_003"))
+            elif unescaped_ampersand_in_attributes(token):
+                errors.append((token.line, token.column, f"Caractère & non échappé dans un attribut de <{token.name}>.", "XML_005"))
+        elif kind == "close":
+            if not token.complete:
+                errors.append((token.line, token.column, f"Balise fermante </{token.name}> non terminée (il manque >).", "XML_003"))
+        elif kind == "lt":
+            errors.append((token.line, token.column, "Caractère < isolé. Remplace par &lt; ou complète la balise.", "XML_005"))
+        elif kind == "amp":
+            errors.append((token.line, token.column, "Caractère & non échappé. Remplace par &amp;.", "XML_005"))
+        elif kind == "comment" and not token.complete:
+            errors.append((token.line, token.column, "Commentaire ouvert mais jamais fermé avec -->.", "XML_004"))
+
+    for token, expected in tags.orphans:
+        hint = f" La dernière balise ouverte est <{expected}>." if expected else ""
+        errors.append((token.line, token.column, f"Balise </{token.name}> sans ouvrante correspondante.{hint}", "XML_006"))
+
+    for token in unclosed_tags(tags):
+        error_id = "XML_001" if token.name in SELF_CLOSING_TAGS and token.start in tags.childless else "XML_002"
+        errors.append((token.line, token.column, f"La balise <{token.name}> ouverte ici n'est jamais fermée avec </{token.name}>.", error_id))
+
+    for token in tags.after_root:
+        errors.append((token.line, token.column, f"Balise <{token.name}> après la fin de l'élément racine.", None))
+
+    errors.extend(_text_outside_root(content, tokens, tags.root_span))
+
+    if tags.root_span[0] is None and not errors:
+        errors.append((1, 0, "Aucun élément racine trouvé (fichier vide ?).", None))
+
+    errors.sort(key=lambda error: (error[0], error[1]))
+    return [
+        {"line": line, "column": column, "message": message, "error_id": error_id}
+        for line, column, message, error_id in errors[:MAX_ERRORS]
+    ]
+
+
+def _text_outside_root(content, tokens, root_span):
+    """Texte (hors blancs) avant l'élément racine ou après sa fermeture"""
+    root_start, root_end = root_span
+    if root_start is None:
+        regions = [(0, len(content))]
+    else:
+        regions = [(0, root_start)]
+        if root_end is not None:
+            regions.append((root_end, len(content)))
+
+    errors = []
+    for region_start, region_end in regions:
+        first = bisect_left(tokens, region_start, key=lambda token: token.start)
+        previous_end = region_start
+        for token in tokens[first:]:
+            if token.start >= region_end:
+                break
+            _report_text(content, previous_end, token.start, errors)
+            previous_end = token.end
+        _report_text(content, previous_end, region_end, errors)
+    return errors
+
+
+def _report_text(content, start, end, errors):
+    """Signale le texte non blanc entre deux tokens hors de la racine"""
+    text = content[start:end].lstrip()
+    if text:
+        line, column = position_of(content, end - len(text))
+        errors.append((line, column, "Texte en dehors de l'élément racine.", None))
+
+
+# ==============================
+# JSON
+# ==============================
+_JSON_TOKEN_RE = re.compile(r'''
+      (?P<string>"(?:[^"\\\n]|\\.)*(?P<string_end>")?)
+    | (?P<squote>'(?:[^'\\\n]|\\.)*'?)
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<word>[A-Za-z_$][\w$]*)
+    | (?P<punct>[{}\[\]:,])
+    | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<other>\S)
+''', re.S | re.X)
+
+_JSON_NEXT_COLON_RE = re.compile(r'\s*:')
+
+# États attendus dans un conteneur
+#   objet   : key_or_close → colon → value → comma_or_close → key → ...
+#   tableau : value_or_close → comma_or_close → value → ...
+#   racine  : value → end
+_VALUE_STATES = {"value", "value_or_close"}
+_KEY_STATES = {"key", "key_or_close"}
+
+
+def scan_json_errors(content):
+    """
+    Relève toutes les erreurs de syntaxe JSON en une passe (automate à pile).
+
+    Après une erreur, l'automate suppose la correction la plus probable
+    (virgule manquante, clé sans guillemets...) et continue.
+
+    Returns:
+        list: erreurs triées par position (voir en-tête du module)
+    """
+    errors = []         # [(index, message, error_id)]
+    # Pile de conteneurs : [type ('{', '[' ou None pour la racine), état, index d'ouverture]
+    stack = [[None, "value", 0]]
+    last_comma = None   # index de la dernière virgule (pour signaler les virgules finales)
+
+    def report(where, message, error_id=None):
+        errors.append((where, message, error_id))
+
+    def accept_value(where):
+        """Une valeur arrive : vérifie que l'état courant l'autorise puis avance"""
+        frame = stack[-1]
+        state = frame[1]
+        if state == "comma_or_close":
+            report(where, "Virgule manquante entre deux éléments.")
+        elif state == "colon":
+            report(where, "':' manquant après la clé.")
+        elif state in _KEY_STATES:
+            report(where, "Clé (entre guillemets doubles) attendue.", "JSON_003")
+        elif state == "end":
+            report(where, "Contenu après la fin du document JSON.")
+        frame[1] = "end" if frame[0] is None else "comma_or_close"
+
+    def accept_key(where):
+        """Une clé arrive dans un objet"""
+        frame = stack[-1]
+        if frame[1] == "comma_or_close":
+            report(where, "Virgule manquante entre deux éléments.")
+        frame[1] = "colon"
+
+    for match in _JSON_TOKEN_RE.finditer(content):
+        if len(errors) >= MAX_ERRORS:
+            break
+        where = match.start()
+        kind = match.lastgroup
+        token = match.group()
+        frame = stack[-1]
+        in_object = frame[0] == '{'
+
+        if kind in ("string", "squote"):
+            if kind == "squote":
+                report(where, "Guillemets simples : JSON n'accepte que les guillemets doubles.", "JSON_002")
+            elif match.group("string_end") is None:
+                report(where, "Chaîne de caractères jamais fermée (guillemet manquant).")
+            # Dans un objet, une chaîne attendue comme clé (ou après une virgule oubliée) est une clé
+            if in_object and frame[1] in _KEY_STATES | {"comma_or_close"}:
+                accept_key(where)
+            else:
+                accept_value(where)
+
+        elif kind == "number":
+            accept_value(where)
+
+        elif kind == "word":
+            if token in ("true", "false", "null"):
+                accept_value(where)
+            elif _JSON_NEXT_COLON_RE.match(content, match.end()):
+                report(where, f"Clé '{token}' sans guillemets. Écris \"{token}\".", "JSON_003")
+                if in_object:
+                    accept_key(where)
+                else:
+                    accept_value(where)
+            else:
+                report(where, f"Valeur '{token}' invalide (texte sans guillemets ?).")
+                accept_value(where)
+
+        elif kind == "punct":
+            if token in '{[':
+                accept_value(where)
+                stack.append([token, "key_or_close" if token == '{' else "value_or_close", where])
+
+            elif token in '}]':
+                _close_json_container(stack, token, where, last_comma, report)
+
+            elif token == ':':
+                if frame[1] == "colon":
+                    frame[1] = "value"
+                else:
+                    report(where, "':' inattendu.")
+
+            else:  # ','
+                if frame[1] == "comma_or_close":
+                    frame[1] = "key" if in_object else "value"
+                    last_comma = where
+                else:
+                    report(where, "Virgule inattendue (valeur manquante ?).")
+
+        elif kind == "comment":
+            report(where, "Les commentaires ne sont pas autorisés en JSON.")
+
+        else:
+            report(where, f"Caractère '{token}' inattendu.")
+
+    # Conteneurs jamais fermés (du plus ancien au plus récent)
+    for container, _, opened_at in stack[1:max(MAX_ERRORS - len(errors), 0) + 1]:
+        closing = '}' if container == '{' else ']'
+        report(opened_at, f"'{container}' ouvert ici n'est jamais fermé par '{closing}'.", "JSON_004")
+
+    if stack[0][1] == "value" and not errors:
+        report(0, "Document JSON vide.")
+
+    return _with_positions(content, errors)
+
+
+def _close_json_container(stack, token, where, last_comma, report):
+    """Ferme un objet / tableau, en signalant virgule finale et conteneurs sautés"""
+    opening = '{' if token == '}' else '['
+
+    for depth in range(len(stack) - 1, 0, -1):
+        if stack[depth][0] == opening:
+            break
+    else:
+        report(where, f"'{token}' en trop : aucun '{opening}' ouvert.", "JSON_004")
+        return
+
+    # Conteneurs ouverts après celui-ci et jamais fermés
+    for container, _, opened_at in stack[depth + 1:]:
+        closing = '}' if container == '{' else ']'
+        report(opened_at, f"'{container}' ouvert ici n'est jamais fermé par '{closing}'.", "JSON_004")
+
+    state = stack[depth][1]
+    if depth == len(stack) - 1:
+        # Signalée sur la fermeture, là où le parseur s'arrête (même position → dédoublonnée)
+        if state in ("key", "value") and last_comma is not None:
+            report(where, f"Virgule finale avant '{token}'.", "JSON_001")
+        elif state in ("colon", "value"):
+            report(where, "Valeur manquante avant la fermeture.")
+    del stack[depth:]
+
+
+# ==============================
+# FONCTION PRINCIPALE
+# ==============================
+def scan_errors(content, file_type):
+    """
+    Relève toutes les erreurs de structure d'un contenu.
+
+    Paramètres :
+        content   → contenu brut du fichier
+        file_type → "json" ou "xml"
+
+    Retourne :
+        list: erreurs triées par ligne (vide si type inconnu)
+    """
+    if file_type == "xml":
+        return scan_xml_errors(content)
+    if file_type == "json":
+        return scan_json_errors(content)
+    return []
@@ -0,0 +1,184 @@
+"""
+schema_registry.py
+Registre des schémas de validation DayZ (schemas/dayz_<version>/<type>.json).
+
+Les dossiers de versions sont découverts UNE seule fois par processus.
+Chaque schéma est chargé à la demande puis gardé en cache : la validation
+sémantique ne touche plus le disque à chaque upload / rerun Streamlit.
+Le mtime du fichier est revérifié au plus toutes les SCHEMA_CHECK_INTERVAL
+secondes pour prendre en compte une modification du schéma sans redémarrer.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+SCHEMAS_DIR = Path(__file__).parent.parent / "schemas"
+
+# Délai minimum (secondes) entre deux vérifications du mtime d'un schéma
+SCHEMA_CHECK_INTERVAL = 5.0
+
+# Version utilisée si aucune n'est demandée et qu'aucune n'est trouvée sur disque
+FALLBACK_VERSION = "1.28"
+
+
+# ==============================
+# ÉTAT DU PROCESSUS
+# ==============================
+_VERSIONS = None   # {version: Path du dossier}
+_CACHE = {}        # {(version, file_type): {"schema", "mtime", "checked_at"}}
+_STAMPS = {}       # {version: {"stamp", "checked_at"}}
+_LOCK = threading.RLock()
+
+
+# ==============================
+# DÉCOUVERTE DES VERSIONS
+# ==============================
+def _version_key(version):
+    """Clé de tri : '1.28' → (1, 28). Les parties non numériques passent après."""
+    return tuple(int(part) if part.isdigit() else float("inf") for part in re.split(r"[._-]", version))
+
+
+def discover_versions(refresh=False):
+    """
+    Découvre les dossiers schemas/dayz_* (une seule fois, sauf refresh=True).
+
+    Returns:
+        dict: {version: Path} ex. {"1.28": Path(".../schemas/dayz_1.28")}
+    """
+    global _VERSIONS
+    with _LOCK:
+        if _VERSIONS is None or refresh:
+            versions = {}
+            if SCHEMAS_DIR.is_dir():
+                for entry in SCHEMAS_DIR.iterdir():
+                    if entry.is_dir() and entry.name.startswith("dayz_"):
+                        versions[entry.name[len("dayz_"):]] = entry
+            _VERSIONS = versions
+            if refresh:
+                _CACHE.clear()
+                _STAMPS.clear()
+        return _VERSIONS
+
+
+def available_versions():
+    """Liste des versions disponibles, de la plus ancienne à la plus récente"""
+    return sorted(discover_versions(), key=_version_key)
+
+
+def default_version():
+    """Version la plus récente disponible (FALLBACK_VERSION si aucune)"""
+    versions = available_versions()
+    return versions[-1] if versions else FALLBACK_VERSION
+
+
+def resolve_version(version=None):
+    """Retourne la version demandée, ou la version par défaut si None"""
+    return version or default_version()
+
+
+# ==============================
+# CHARGEMENT + CACHE
+# ==============================
+def _schema_path(file_type, version):
+    """Chemin du fichier schéma (même si la version n'a pas été découverte)"""
+    folder = discover_versions().get(version, SCHEMAS_DIR / f"dayz_{version}")
+    return folder / f"{file_type}.json"
+
+
+def _read_schema(path):
+    """Lit un schéma sur disque. Retourne (schema ou None, mtime ou None)"""
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        print(f"⚠️ Schéma non trouvé : {path}")
+        return None, None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), mtime
+    except json.JSONDecodeError as e:
+        print(f"❌ Erreur de lecture du schéma : {e}")
+        return None, mtime
+
+
+def get_schema(file_type, version=None):
+    """
+    Retourne le schéma d'un type de fichier DayZ depuis le cache du processus.
+
+    Args:
+        file_type (str): Type de fichier ('types', 'events', 'economy', ...)
+        version (str): Version DayZ (par défaut la plus récente disponible)
+
+    Returns:
+        dict: Schéma de validation JSON ou None si absent / invalide.
+              Le dict est partagé entre tous les appels : ne pas le modifier.
+    """
+    version = resolve_version(version)
+    key = (version, file_type)
+    now = time.monotonic()
+
+    entry = _CACHE.get(key)
+    if entry is not None and now - entry["checked_at"] < SCHEMA_CHECK_INTERVAL:
+        return entry["schema"]
+
+    with _LOCK:
+        entry = _CACHE.get(key)
+        path = _schema_path(file_type, version)
+
+        if entry is not None:
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime == entry["mtime"]:
+                entry["checked_at"] = now
+                return entry["schema"]
+
+        schema, mtime = _read_schema(path)
+        _CACHE[key] = {"schema": schema, "mtime": mtime, "checked_at": now}
+        return schema
+
+
+def schema_stamp(version=None):
+    """
+    Empreinte des schémas d'une version : ((fichier, mtime), ...) des .json
+    de son dossier. Change dès qu'un schéma est modifié, ajouté ou supprimé
+    (revérifiée au plus toutes les SCHEMA_CHECK_INTERVAL secondes).
+    Sert à invalider les résultats mis en cache (voir result_cache.py).
+    """
+    version = resolve_version(version)
+    now = time.monotonic()
+
+    entry = _STAMPS.get(version)
+    if entry is not None and now - entry["checked_at"] < SCHEMA_CHECK_INTERVAL:
+        return entry["stamp"]
+
+    with _LOCK:
+        folder = discover_versions().get(version, SCHEMAS_DIR / f"dayz_{version}")
+        try:
+            stamp = tuple(sorted(
+                (entry.name, entry.stat().st_mtime)
+                for entry in os.scandir(folder)
+                if entry.name.endswith(".json")
+            ))
+        except FileNotFoundError:
+            stamp = ()
+        _STAMPS[version] = {"stamp": stamp, "checked_at": now}
+        return stamp
+
+
+def clear_cache():
+    """Vide le cache des schémas et force une nouvelle découverte des versions"""
+    global _VERSIONS
+    with _LOCK:
+        _CACHE.clear()
+        _STAMPS.clear()
+        _VERSIONS = None
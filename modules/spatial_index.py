@@ -0,0 +1,183 @@
+"""
+spatial_index.py
+Index spatial (grille uniforme) des zones zombies.
+
+Sans index, retrouver une zone à partir d'une position ou chercher les
+zones qui se chevauchent demande de comparer chaque zone à toutes les
+autres. Ici les centres sont rangés dans des cellules carrées de
+cell_size mètres : une requête ne regarde que les cellules proches.
+
+    - zones_at        → zones exactement à une position (x, z)
+    - nearest_zone    → zone la plus proche d'un point
+    - zones_in_radius → zones dont le centre est à moins de `radius`
+    - find_overlaps   → paires de zones dont les cercles (rayon r) se chevauchent
+
+Pas de NumPy : pour quelques milliers de zones, la grille en dict suffit.
+"""
+
+from collections import namedtuple
+from math import floor, hypot
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Côté d'une cellule (mètres), de l'ordre du rayon des zones vanilla
+SPATIAL_CELL_SIZE = 200.0
+
+# En dessous de cette distance (mètres), deux zones sont considérées empilées
+STACKED_DISTANCE = 1.0
+
+
+# Index construit par build_zone_index
+#   cell_size  → côté d'une cellule
+#   cells      → {(cx, cz): [index de zone, ...]}
+#   points     → ((x, z, r), ...) dans l'ordre de la liste de zones
+#   max_radius → plus grand rayon (borne la recherche de chevauchements)
+#   bounds     → (cx min, cz min, cx max, cz max) des cellules occupées
+ZoneIndex = namedtuple("ZoneIndex", "cell_size cells points max_radius bounds")
+
+
+# ==============================
+# CONSTRUCTION
+# ==============================
+def build_zone_index(zones, cell_size=SPATIAL_CELL_SIZE):
+    """
+    Range les zones dans une grille (un seul parcours).
+
+    Returns:
+        ZoneIndex (voir plus haut) ; les index renvoyés par les requêtes
+        sont des positions dans `zones`
+    """
+    cells = {}
+    points = []
+    for i, zone in enumerate(zones):
+        x, z = zone['x'], zone['z']
+        points.append((x, z, zone['r']))
+        cells.setdefault((floor(x / cell_size), floor(z / cell_size)), []).append(i)
+
+    return ZoneIndex(
+        cell_size=cell_size,
+        cells=cells,
+        points=tuple(points),
+        max_radius=max((r for _, _, r in points), default=0.0),
+        bounds=(
+            min((cx for cx, _ in cells), default=0),
+            min((cz for _, cz in cells), default=0),
+            max((cx for cx, _ in cells), default=0),
+            max((cz for _, cz in cells), default=0),
+        ),
+    )
+
+
+def _cells_around(index, x, z, distance):
+    """Index des zones rangées dans les cellules qui touchent le carré [x ± distance, z ± distance]"""
+    size = index.cell_size
+    cells = index.cells
+    for cx in range(floor((x - distance) / size), floor((x + distance) / size) + 1):
+        for cz in range(floor((z - distance) / size), floor((z + distance) / size) + 1):
+            yield from cells.get((cx, cz), ())
+
+
+# ==============================
+# REQUÊTES
+# ==============================
+def zones_at(index, x, z):
+    """Zones dont le centre est exactement (x, z) : plusieurs si elles sont empilées"""
+    cell = (floor(x / index.cell_size), floor(z / index.cell_size))
+    points = index.points
+    return [i for i in index.cells.get(cell, ()) if points[i][0] == x and points[i][1] == z]
+
+
+def zones_in_radius(index, x, z, radius):
+    """
+    Zones dont le centre est à moins de `radius` mètres de (x, z).
+
+    Returns:
+        list: [(index de zone, distance), ...] triés par distance
+    """
+    points = index.points
+    found = []
+    for i in _cells_around(index, x, z, radius):
+        distance = hypot(points[i][0] - x, points[i][1] - z)
+        if distance <= radius:
+            found.append((i, distance))
+    found.sort(key=lambda item: item[1])
+    return found
+
+
+def nearest_zone(index, x, z, max_distance=None):
+    """
+    Zone la plus proche de (x, z) : parcourt les anneaux de cellules autour
+    du point jusqu'à ce qu'aucune cellule plus lointaine ne puisse faire mieux.
+
+    Returns:
+        tuple: (index de zone, distance), ou None si aucune zone (à moins de max_distance)
+    """
+    if not index.points:
+        return None
+
+    size = index.cell_size
+    cells = index.cells
+    points = index.points
+    cx, cz = floor(x / size), floor(z / size)
+    # Au-delà de ce rayon (en cellules), toutes les cellules occupées ont été vues
+    min_cx, min_cz, max_cx, max_cz = index.bounds
+    max_ring = max(cx - min_cx, max_cx - cx, cz - min_cz, max_cz - cz)
+    if max_distance is not None:
+        max_ring = min(max_ring, int(max_distance // size) + 1)
+
+    best = None
+    for ring in range(max_ring + 1):
+        # Une zone d'un anneau plus lointain est à au moins (ring - 1) × size
+        if best is not None and (ring - 1) * size > best[1]:
+            break
+        for ox in range(cx - ring, cx + ring + 1):
+            # Colonnes du bord : toutes les cellules ; colonnes intérieures : haut et bas de l'anneau
+            step = 1 if abs(ox - cx) == ring else 2 * ring
+            for oz in range(cz - ring, cz + ring + 1, step):
+                for i in cells.get((ox, oz), ()):
+                    distance = hypot(points[i][0] - x, points[i][1] - z)
+                    if best is None or distance < best[1]:
+                        best = (i, distance)
+
+    if best is None or (max_distance is not None and best[1] > max_distance):
+        return None
+    return best
+
+
+def find_overlaps(index):
+    """
+    Toutes les paires de zones dont les cercles se chevauchent
+    (distance entre centres < r1 + r2). Chaque zone ne compare que les
+    cellules à moins de r + max_radius, et chaque paire n'est vue qu'une fois.
+
+    Returns:
+        list: [
+            {
+                "a": int, "b": int,     → index des deux zones (a < b)
+                "distance": float,      → distance entre les centres
+                "overlap": float,       → r1 + r2 - distance (mètres de recouvrement)
+                "stacked": bool         → centres quasi identiques (< STACKED_DISTANCE)
+            },
+            ...
+        ] du recouvrement le plus fort au plus faible
+    """
+    points = index.points
+    overlaps = []
+    for a, (x, z, r) in enumerate(points):
+        for b in _cells_around(index, x, z, r + index.max_radius):
+            if b <= a:
+                continue
+            bx, bz, br = points[b]
+            distance = hypot(bx - x, bz - z)
+            if distance < r + br:
+                overlaps.append({
+                    "a": a,
+                    "b": b,
+                    "distance": distance,
+                    "overlap": r + br - distance,
+                    "stacked": distance < STACKED_DISTANCE
+                })
+    overlaps.sort(key=lambda overlap: overlap["overlap"], reverse=True)
+    return overlaps
@@ -0,0 +1,192 @@
+"""
+territories.py
+Zones de spawn zombies (zombie_territories_*.xml), parsées UNE fois par processus.
+
+Avant, chaque nouvelle session de la carte interactive relisait et
+re-parsait les trois fichiers et gardait sa propre copie des ~1 500 zones.
+Maintenant le parsing est mis en cache pour tout le processus (clé :
+chemin + date de modification, un fichier remplacé sur disque est relu) et
+les sessions partagent les mêmes dicts en copy-on-write : une session ne
+copie que les zones qu'elle modifie (update_zone).
+
+Zone :
+    {
+        "id": int,          → identifiant stable (ordre dans le fichier), voir zone_positions
+        "name": str,        → type de zombie (InfectedCity...)
+        "x": float, "z": float, "r": float,
+        "smin": int, "smax": int, "dmin": int, "dmax": int,
+        "color": str,       → couleur du <territory> parent
+        "active": bool
+    }
+"""
+
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from pathlib import Path
+
+from modules.spatial_index import build_zone_index, find_overlaps
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Fichier vanilla de chaque carte
+TERRITORY_FILES = {
+    "chernarus": "zombie_territories_chernarus.xml",
+    "livonia": "zombie_territories_livonia.xml",
+    "sakhal": "zombie_territories_sakhal.xml",
+}
+
+# Versions de fichiers gardées en cache (3 cartes + marge pour un fichier remplacé)
+TERRITORIES_CACHE_SIZE = 8
+
+
+# ==============================
+# PARSING
+# ==============================
+def parse_zombie_territories(xml_content):
+    """Parse le fichier zombie_territories.xml et retourne une liste de zones"""
+    root = ET.fromstring(xml_content)
+    zones = []
+    zone_id = 0
+
+    for territory in root.findall('territory'):
+        color = territory.get('color', '')
+
+        for zone in territory.findall('zone'):
+            zones.append({
+                'id': zone_id,
+                'name': zone.get('name'),
+                'x': float(zone.get('x')),
+                'z': float(zone.get('z')),
+                'r': float(zone.get('r')),
+                'smin': int(zone.get('smin')),
+                'smax': int(zone.get('smax')),
+                'dmin': int(zone.get('dmin')),
+                'dmax': int(zone.get('dmax')),
+                'color': color,
+                'active': True
+            })
+            zone_id += 1
+
+    return zones
+
+
+# ==============================
+# CACHE DU PROCESSUS
+# ==============================
+@lru_cache(maxsize=TERRITORIES_CACHE_SIZE)
+def _parsed_territories(path, mtime_ns):
+    """Zones d'un fichier pour une date de modification donnée (mtime_ns fait partie de la clé)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return tuple(parse_zombie_territories(f.read()))
+
+
+def load_territories(map_key):
+    """
+    Zones vanilla d'une carte, partagées par toutes les sessions.
+
+    Returns:
+        tuple: zones (voir en-tête du module). Partagé : ne pas modifier,
+               passer par session_zones / update_zone.
+
+    Raises:
+        OSError, ET.ParseError, ValueError: fichier absent ou invalide
+    """
+    path = DATA_DIR / TERRITORY_FILES[map_key]
+    return _parsed_territories(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=TERRITORIES_CACHE_SIZE)
+def _territories_index(path, mtime_ns):
+    return build_zone_index(_parsed_territories(path, mtime_ns))
+
+
+def load_territories_index(map_key, zones=None):
+    """
+    Index spatial (voir spatial_index.py) des zones vanilla d'une carte,
+    partagé par toutes les sessions. Valable aussi pour session_zones :
+    mêmes positions dans la liste, et x / z / r ne sont jamais modifiés.
+
+    Si `zones` (liste de session) ne correspond plus au fichier (remplacé
+    sur disque depuis son chargement), un index propre à cette liste est construit.
+    """
+    path = DATA_DIR / TERRITORY_FILES[map_key]
+    index = _territories_index(str(path), path.stat().st_mtime_ns)
+    if zones is not None and len(zones) != len(index.points):
+        return build_zone_index(zones)
+    return index
+
+
+@lru_cache(maxsize=TERRITORIES_CACHE_SIZE)
+def _territories_overlaps(path, mtime_ns):
+    return tuple(find_overlaps(_territories_index(path, mtime_ns)))
+
+
+def load_territories_overlaps(map_key, zones=None):
+    """
+    Chevauchements (voir spatial_index.find_overlaps) des zones vanilla d'une
+    carte, calculés une fois par version du fichier et partagés par toutes
+    les sessions (x / z / r ne sont jamais modifiés par session_zones).
+
+    Comme load_territories_index, recalculé pour `zones` si la liste de
+    session ne correspond plus au fichier.
+
+    Returns:
+        tuple: chevauchements, partagé : ne pas modifier
+    """
+    path = DATA_DIR / TERRITORY_FILES[map_key]
+    mtime_ns = path.stat().st_mtime_ns
+    if zones is not None and len(zones) != len(_territories_index(str(path), mtime_ns).points):
+        return tuple(find_overlaps(build_zone_index(zones)))
+    return _territories_overlaps(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=TERRITORIES_CACHE_SIZE)
+def _zone_positions(path, mtime_ns):
+    return zone_positions(_parsed_territories(path, mtime_ns))
+
+
+def zone_positions(zones):
+    """Index id → position de la zone dans la liste (une zone se retrouve en O(1))"""
+    return {zone['id']: position for position, zone in enumerate(zones)}
+
+
+def load_zone_positions(map_key, zones=None):
+    """
+    Index id → position des zones vanilla d'une carte, partagé par toutes
+    les sessions (valable pour session_zones : les positions ne bougent pas).
+
+    Comme load_territories_index, reconstruit pour `zones` si la liste de
+    session ne correspond plus au fichier.
+    """
+    path = DATA_DIR / TERRITORY_FILES[map_key]
+    positions = _zone_positions(str(path), path.stat().st_mtime_ns)
+    if zones is not None and len(zones) != len(positions):
+        return zone_positions(zones)
+    return positions
+
+
+# ==============================
+# COPY-ON-WRITE (sessions)
+# ==============================
+def session_zones(map_key):
+    """
+    Liste de zones propre à une session : seule la liste est copiée, les
+    dicts restent ceux du cache jusqu'à leur première modification.
+    """
+    return list(load_territories(map_key))
+
+
+def update_zone(zones, index, **changes):
+    """
+    Modifie une zone d'une liste de session sans toucher au cache partagé :
+    la zone est remplacée par une copie modifiée.
+
+    Returns:
+        dict: la nouvelle zone
+    """
+    zones[index] = {**zones[index], **changes}
+    return zones[index]
@@ -0,0 +1,264 @@
+"""
+tokenizer.py
+Découpe un document XML en tokens UNE SEULE FOIS, partagé par le scanner,
+le locator, le matcher et le correcteur.
+
+Avant, chaque module re-découpait le contenu en lignes et relançait ses
+propres regex (commentaires, ouvrantes, fermantes...) : ~7 parcours complets
+du fichier sur le chemin d'erreur. Maintenant le document est lexé une fois
+par validation (voir token_cache) et chaque module interroge la liste de tokens.
+
+Token :
+    kind     → "open", "close", "self_close", "comment", "cdata", "pi",
+               "doctype", "lt" (< isolé), "amp" (& non échappé)
+    name     → nom de la balise (open / close / self_close), sinon ""
+    line     → ligne (commence à 1)
+    column   → colonne (commence à 0, comme le parseur)
+    start    → index de début dans le contenu
+    end      → index de fin dans le contenu
+    attrs    → texte brut des attributs (open / self_close), sinon ""
+    complete → False si le token n'est pas terminé (> ou --> manquant)
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Balises DayZ presque toujours auto-fermantes
+SELF_CLOSING_TAGS = frozenset({
+    "current", "limits", "timelimits", "changelimits",
+    "thresholds", "storm", "item", "type", "zone"
+})
+
+
+Token = namedtuple("Token", "kind name line column start end attrs complete")
+
+# Résultat de match_tags
+#   open      → balises encore ouvertes en fin de parcours (de la plus externe à la plus interne)
+#   skipped   → balises fermées implicitement par une fermante plus externe (</a> alors que <b> ouvert)
+#   skipped_by → {start d'une balise skipped: token fermant qui l'a fermée implicitement}
+#   orphans   → [(token fermant, nom attendu ou None)] fermantes sans ouvrante
+#   childless → positions (start) des balises non fermées qui n'ont aucune balise enfant
+#   root_span → (début, fin) de l'élément racine, fin = None s'il n'est jamais fermé
+#   after_root → balises ouvertes après la fin de l'élément racine
+TagMatch = namedtuple("TagMatch", "open skipped skipped_by orphans childless root_span after_root")
+
+
+# ==============================
+# LEXER
+# ==============================
+# Tous les tokens commencent par < ou & : le moteur de regex saute le texte d'un coup
+_TOKEN_RE = re.compile(r'''
+    <(?:
+          (?P<comment>!--.*?(?:-->|\Z))                    # commentaire (fermé ou non)
+        | (?P<cdata>!\[CDATA\[.*?(?:\]\]>|\Z))             # CDATA
+        | (?P<pi>\?.*?(?:\?>|\Z))                          # déclaration / instruction
+        | (?P<doctype>![^>]*>)                             # DOCTYPE
+        | /(?P<close>[^\s<>]*)\s*(?P<close_end>>)?         # balise fermante
+        | (?P<open>[A-Za-z_][\w:.-]*)(?P<attrs>[^<>]*)(?P<open_end>>)?   # ouvrante / auto-fermante
+        | (?P<lt>)                                         # < isolé
+    )
+    | (?P<amp>&(?!(?:amp|lt|gt|quot|apos|\#\d+|\#x[0-9a-fA-F]+);))    # & non échappé
+''', re.S | re.X)
+
+_ATTRS_RE = re.compile(r'''(?:\s+[A-Za-z_][\w:.-]*\s*=\s*(?:"[^"]*"|'[^']*'))*\s*''')
+
+# & qui ne commence pas une entité acceptée par le parseur (même règle que le token "amp")
+UNESCAPED_AMPERSAND_RE = re.compile(r'&(?!(?:amp|lt|gt|quot|apos|#\d+|#x[0-9a-fA-F]+);)')
+
+# Tokens déjà calculés pendant le bloc token_cache en cours ({contenu: tokens}), None hors bloc
+_SCOPE = ContextVar("token_cache", default=None)
+
+
+@contextmanager
+def token_cache():
+    """
+    Mémorise les tokens pendant un bloc (une validation) : le chemin d'erreur
+    interroge le même contenu plusieurs fois (matcher, scanner, correcteur).
+    Tout est libéré à la sortie du bloc, aucun document ne reste en mémoire
+    entre deux validations. Un bloc imbriqué réutilise le cache du bloc englobant.
+    """
+    if _SCOPE.get() is not None:
+        yield
+        return
+    scope = _SCOPE.set({})
+    try:
+        yield
+    finally:
+        _SCOPE.reset(scope)
+
+
+def tokenize_xml(content):
+    """
+    Découpe le contenu XML en tokens (un seul parcours ; mis en cache
+    seulement à l'intérieur d'un bloc token_cache).
+
+    Returns:
+        tuple: (Token, ...) dans l'ordre du document. Partagé : ne pas modifier.
+    """
+    cache = _SCOPE.get()
+    if cache is None:
+        return _tokenize_xml(content)
+    tokens = cache.get(content)
+    if tokens is None:
+        tokens = cache[content] = _tokenize_xml(content)
+    return tokens
+
+
+def _tokenize_xml(content):
+    """Lexer (voir tokenize_xml)"""
+    tokens = []
+    append = tokens.append
+    line, line_start, previous = 1, 0, 0
+
+    for match in _TOKEN_RE.finditer(content):
+        start = match.start()
+        newlines = content.count('\n', previous, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', previous, start) + 1
+        previous = start
+        column = start - line_start
+        kind = match.lastgroup
+
+        if kind == "close_end" or kind == "close":
+            append(Token("close", match.group("close"), line, column, start, match.end(), "", kind == "close_end"))
+        elif kind == "open_end" or kind == "attrs":
+            attrs = match.group("attrs")
+            if attrs.endswith('/'):
+                append(Token("self_close", match.group("open"), line, column, start, match.end(), attrs[:-1], kind == "open_end"))
+            else:
+                append(Token("open", match.group("open"), line, column, start, match.end(), attrs, kind == "open_end"))
+        elif kind == "comment":
+            text = match.group()
+            append(Token("comment", "", line, column, start, match.end(), "", len(text) >= 7 and text.endswith('-->')))
+        elif kind == "cdata" or kind == "pi":
+            text = match.group()
+            append(Token(kind, "", line, column, start, match.end(), "", text.endswith(']]>' if kind == "cdata" else '?>')))
+        else:
+            append(Token(kind, "", line, column, start, match.end(), "", True))
+
+    return tuple(tokens)
+
+
+# ==============================
+# REQUÊTES SUR LES TOKENS
+# ==============================
+def malformed_attributes(token):
+    """True si les attributs d'une balise ne respectent pas nom="valeur" """
+    return bool(token.attrs) and not _ATTRS_RE.fullmatch(token.attrs)
+
+
+def unescaped_ampersand_in_attributes(token):
+    """True si un attribut contient un & non échappé"""
+    return '&' in token.attrs and bool(UNESCAPED_AMPERSAND_RE.search(token.attrs))
+
+
+def unclosed_comment(tokens):
+    """
+    Commentaire jamais fermé (ou None). Il avale tout jusqu'à la fin du
+    fichier : c'est forcément le dernier token, inutile de tout parcourir.
+    """
+    if tokens and tokens[-1].kind == "comment" and not tokens[-1].complete:
+        return tokens[-1]
+    return None
+
+
+def tokens_on_line(tokens, line):
+    """Tokens qui commencent sur une ligne donnée (recherche dichotomique)"""
+    lo = bisect_left(tokens, line, key=lambda token: token.line)
+    hi = bisect_right(tokens, line, lo=lo, key=lambda token: token.line)
+    return tokens[lo:hi]
+
+
+def tokens_until_line(tokens, line):
+    """Tokens qui commencent avant ou sur une ligne donnée"""
+    return tokens[:bisect_right(tokens, line, key=lambda token: token.line)]
+
+
+def position_of(content, index):
+    """(ligne, colonne) d'un index quelconque (chemin rare : compte depuis le début)"""
+    return content.count('\n', 0, index) + 1, index - content.rfind('\n', 0, index) - 1
+
+
+def match_tags(tokens):
+    """
+    Associe ouvrantes et fermantes avec une pile, en récupérant après chaque erreur :
+        - </a> alors que <b> est ouvert au-dessus de <a> → <b> est "skipped"
+        - </x> sans <x> ouvert → orpheline, ignorée
+        - balises restantes en fin de parcours → "open"
+
+    Returns:
+        TagMatch (voir en-tête du module)
+    """
+    stack = []          # [[token, a_des_enfants]]
+    skipped = []
+    skipped_by = {}
+    orphans = []
+    after_root = []
+    childless = set()
+    root_start = root_end = None
+
+    for token in tokens:
+        kind = token.kind
+        if kind == "close":
+            name = token.name
+            # Cas courant : ferme la dernière balise ouverte
+            if stack and stack[-1][0].name == name:
+                opened, has_children = stack.pop()
+                if not stack and root_end is None:
+                    root_end = token.end
+                continue
+
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0].name == name:
+                    break
+            else:
+                orphans.append((token, stack[-1][0].name if stack else None))
+                continue
+
+            for opened, has_children in stack[depth + 1:]:
+                skipped.append(opened)
+                skipped_by[opened.start] = token
+                if not has_children:
+                    childless.add(opened.start)
+            del stack[depth:]
+            if not stack and root_end is None:
+                root_end = token.end
+
+        elif kind == "open" or kind == "self_close":
+            if stack:
+                stack[-1][1] = True
+            elif root_start is None:
+                root_start = token.start
+                if kind == "self_close":
+                    root_end = token.end
+            elif root_end is not None:
+                after_root.append(token)
+            if kind == "open":
+                stack.append([token, False])
+
+    for opened, has_children in stack:
+        if not has_children:
+            childless.add(opened.start)
+
+    return TagMatch(
+        open=[opened for opened, _ in stack],
+        skipped=skipped,
+        skipped_by=skipped_by,
+        orphans=orphans,
+        childless=frozenset(childless),
+        root_span=(root_start, root_end),
+        after_root=after_root,
+    )
+
+
+def unclosed_tags(tags):
+    """Toutes les balises jamais fermées (skipped + open), dans l'ordre du document"""
+    return sorted(tags.skipped + tags.open, key=lambda token: token.start)
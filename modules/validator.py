@@ -6,110 +6,174 @@ Retourne un objet structuré : valide ou pas, erreur matchée, ligne/colonne, ET
 
 import json
 import xml.etree.ElementTree as ET
-import re
-import os
+from xml.parsers import expat
+from modules.errors_db import get_error_by_id
 from modules.errors_matcher import match_error
-from modules.corrector import auto_correct, can_auto_correct
+from modules.corrector import can_auto_correct, correct_until_valid
+from modules.schema_registry import get_schema
+from modules.rule_engine import evaluate_rules, get_compiled_rules
+from modules.scanner import scan_errors
+from modules.tokenizer import token_cache
 
 
 # ==============================
 # ✨ NOUVEAU : CHARGEMENT SCHÉMAS
 # ==============================
-def load_schema(file_type, version="1.28"):
+def load_schema(file_type, version=None):
     """
     Charge un schéma de validation JSON pour un type de fichier DayZ.
+    Passe par le registre des schémas : aucune lecture disque en régime établi.
     
     Args:
         file_type (str): Type de fichier ('types', 'events', 'economy')
-        version (str): Version DayZ (par défaut '1.28')
+        version (str): Version DayZ (par défaut la plus récente disponible)
     
     Returns:
         dict: Schéma de validation JSON ou None si erreur
     """
-    # Chemin relatif depuis la racine du projet
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    schema_path = os.path.join(base_path, f"schemas/dayz_{version}/{file_type}.json")
-    
-    try:
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"⚠️ Schéma non trouvé : {schema_path}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"❌ Erreur de lecture du schéma : {e}")
-        return None
+    return get_schema(file_type, version)
 
 
 # ==============================
 # ✨ NOUVEAU : DÉTECTION TYPE FICHIER
 # ==============================
+# Balise racine → type DayZ
+_ROOT_TAG_TO_DAYZ_TYPE = {
+    "types": "types",
+    "events": "events",
+    "economy": "economy",
+    "variables": "globals",
+    "messages": "messages",
+}
+
+
 def detect_dayz_file_type(content):
     """
     Détecte automatiquement le type de fichier DayZ (types, events, economy, globals, messages).
     
     Args:
-        content (str): Contenu XML du fichier
+        content (str | Element): Contenu XML du fichier, ou racine déjà parsée
     
     Returns:
         str: Type détecté ('types', 'events', 'economy', 'globals', 'messages') ou None
     """
     try:
-        root = ET.fromstring(content)
-        root_tag = root.tag
+        # Racine déjà parsée → pas de re-parsing
+        root = content if ET.iselement(content) else ET.fromstring(content)
         
         # Détection par balise racine
-        if root_tag == "types":
-            return "types"
-        elif root_tag == "events":
-            return "events"
-        elif root_tag == "economy":
-            return "economy"
-        elif root_tag == "variables":
-            return "globals"
-        elif root_tag == "messages":
-            return "messages"
-        
-        return None
+        return _ROOT_TAG_TO_DAYZ_TYPE.get(root.tag)
     except:
         return None
 
 
+# ==============================
+# ✨ PARSEUR AVEC NUMÉROS DE LIGNE
+# ==============================
+# Taille des blocs lus en mode streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _create_line_parser(builder, lines):
+    """
+    Crée un parseur expat branché sur un TreeBuilder, qui note la ligne
+    de début de chaque élément dans `lines` ({Element: ligne}).
+    
+    Seule l'ouverture de balise passe par Python (pour lire
+    CurrentLineNumber) : texte, fermetures et commentaires vont
+    directement au TreeBuilder C.
+    """
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    start = builder.start
+    
+    def on_start(tag, attrib):
+        lines[start(tag, attrib)] = parser.CurrentLineNumber
+    
+    parser.StartElementHandler = on_start
+    parser.EndElementHandler = builder.end
+    parser.CharacterDataHandler = builder.data
+    parser.CommentHandler = builder.comment
+    return parser
+
+
+def _to_parse_error(error):
+    """Convertit une ExpatError en ET.ParseError (même message, code et position)"""
+    parse_error = ET.ParseError(str(error))
+    parse_error.code = error.code
+    parse_error.position = (error.lineno, error.offset)
+    return parse_error
+
+
+# ==============================
+# ✨ PARSING UNIQUE (document partagé)
+# ==============================
+def parse_xml_document(content):
+    """
+    Parse le XML UNE SEULE FOIS et retourne le document partagé
+    par la détection, la validation sémantique et le formatage.
+    
+    Les commentaires sont conservés dans l'arbre pour que le fichier
+    formaté ne les perde pas, et la ligne source de chaque élément est
+    notée pendant ce même parsing (pas de re-scan du texte).
+    
+    Args:
+        content (str): Contenu XML brut
+    
+    Returns:
+        dict: {"content": str, "root": Element, "dayz_type": str ou None,
+               "lines": {Element: ligne de la balise ouvrante}}
+    
+    Raises:
+        ET.ParseError: si le XML est mal formé
+    """
+    builder = ET.TreeBuilder(insert_comments=True)
+    lines = {}
+    try:
+        _create_line_parser(builder, lines).Parse(content, True)
+    except expat.ExpatError as e:
+        raise _to_parse_error(e) from None
+    root = builder.close()
+    
+    return {
+        "content": content,
+        "root": root,
+        "dayz_type": detect_dayz_file_type(root),
+        "lines": lines
+    }
+
+
 # ==============================
 # ✨ NOUVEAU : VALIDATION SÉMANTIQUE
 # ==============================
-def validate_semantic_rules(content, file_type):
+def validate_semantic_rules(content, file_type, root=None, version=None, lines=None):
     """
     Valide un fichier XML selon les règles métier DayZ (validation sémantique).
     
     Args:
         content (str): Contenu XML du fichier
         file_type (str): Type de fichier ('types', 'events', 'economy', 'globals')
+        root (Element): Racine déjà parsée (évite de re-parser le contenu)
+        version (str): Version DayZ du schéma (par défaut la plus récente)
+        lines (dict): {Element: ligne} fourni avec root par parse_xml_document
     
     Returns:
         list: Liste de warnings/erreurs sémantiques
-            [{"severity": "error"|"warning", "message": "...", "line": int}]
+            [{"severity": "error"|"warning", "message": "...", "line": int, "rule": str}]
     """
-    schema = load_schema(file_type)
+    schema = load_schema(file_type, version)
     if not schema:
         return []
     
     warnings = []
     
     try:
-        tree = ET.fromstring(content)
+        if root is None:
+            document = parse_xml_document(content)
+            root, lines = document["root"], document["lines"]
         
-        # VALIDATION TYPES.XML
-        if file_type == "types":
-            warnings.extend(_validate_types_semantic(tree, schema))
-        
-        # VALIDATION EVENTS.XML
-        elif file_type == "events":
-            warnings.extend(_validate_events_semantic(tree, schema))
-        
-        # VALIDATION ECONOMY.XML
-        elif file_type == "economy":
-            warnings.extend(_validate_economy_semantic(tree, schema))
+        # Règles compilées depuis le schéma (types / events / economy)
+        warnings.extend(evaluate_rules(root, file_type, schema, lines))
         
     except ET.ParseError:
         # Si parsing échoue, pas de validation sémantique (déjà géré par validate_xml)
@@ -119,191 +183,154 @@ def validate_semantic_rules(content, file_type):
 
 
 # ==============================
-# ✨ VALIDATION SÉMANTIQUE : TYPES.XML
+# ✨ MODE STREAMING (gros fichiers)
 # ==============================
-def _validate_types_semantic(root, schema):
-    """Valide les règles métier de types.xml"""
-    warnings = []
+def iter_semantic_warnings(source, file_type=None, context=None, version=None):
+    """
+    Valide les règles métier en streaming, sans garder l'arbre en mémoire.
     
-    for idx, type_elem in enumerate(root.findall('type'), start=1):
-        item_name = type_elem.get('name', f'Item #{idx}')
-        
-        # Récupérer les valeurs
-        nominal = int(type_elem.findtext('nominal', '0'))
-        min_val = int(type_elem.findtext('min', '0'))
-        quantmin = int(type_elem.findtext('quantmin', '-1'))
-        quantmax = int(type_elem.findtext('quantmax', '-1'))
-        lifetime = int(type_elem.findtext('lifetime', '0'))
-        
-        # RÈGLE 1: min ≤ nominal
-        if min_val > nominal:
-            warnings.append({
-                "severity": "error",
-                "message": f"Item '{item_name}': min ({min_val}) > nominal ({nominal}). Le minimum ne peut pas être supérieur au nominal.",
-                "line": idx
-            })
-        
-        # RÈGLE 2: quantmin ≤ quantmax
-        if quantmin != -1 and quantmax != -1 and quantmin > quantmax:
-            warnings.append({
-                "severity": "error",
-                "message": f"Item '{item_name}': quantmin ({quantmin}) > quantmax ({quantmax}). La quantité minimum ne peut pas être supérieure au maximum.",
-                "line": idx
-            })
-        
-        # RÈGLE 3: lifetime > 0
-        if lifetime <= 0:
-            warnings.append({
-                "severity": "error",
-                "message": f"Item '{item_name}': lifetime ({lifetime}) doit être > 0.",
-                "line": idx
-            })
+    Chaque <type> / <event> est validé dès sa balise fermante puis libéré :
+    la mémoire reste stable quelle que soit la taille du fichier, et les
+    premiers warnings sont disponibles avant la fin de la lecture.
+    Le parseur expat note la ligne de chaque <type> / <event> au passage.
+    
+    Args:
+        source: Chemin du fichier ou objet fichier (ouvert en lecture)
+        file_type (str): Type DayZ forcé (sinon détecté via la balise racine)
+        context (dict): Optionnel, reçoit "dayz_type" dès que la racine est lue
+        version (str): Version DayZ du schéma (par défaut la plus récente)
+    
+    Yields:
+        dict: {"severity": "error"|"warning", "message": "...", "line": int, "rule": str}
+    
+    Raises:
+        ET.ParseError: si le XML est mal formé (les warnings déjà produits restent valables)
+    """
+    builder = ET.TreeBuilder()
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    
+    root = None
+    rules = None
+    depth = 0
+    idx = 0
+    lines = {}       # {Element: ligne} pour la racine et ses enfants directs
+    finished = []    # enfants directs de la racine terminés depuis le dernier bloc
+    
+    def on_start(tag, attrib):
+        nonlocal root, depth
+        elem = builder.start(tag, attrib)
+        if depth <= 1:
+            lines[elem] = parser.CurrentLineNumber
+            if root is None:
+                root = elem
+        depth += 1
+    
+    def on_end(tag):
+        nonlocal depth
+        elem = builder.end(tag)
+        depth -= 1
+        if depth == 1:
+            finished.append(elem)
+    
+    parser.StartElementHandler = on_start
+    parser.EndElementHandler = on_end
+    parser.CharacterDataHandler = builder.data
+    
+    for chunk in _iter_chunks(source):
+        try:
+            parser.Parse(chunk, False)
+        except expat.ExpatError as e:
+            raise _to_parse_error(e) from None
         
-        # RÈGLE 4: Item désactivé mais min > 0
-        if nominal == 0 and min_val > 0:
-            warnings.append({
-                "severity": "warning",
-                "message": f"Item '{item_name}': nominal=0 (désactivé) mais min={min_val}. Recommandation : mettre min=0.",
-                "line": idx
-            })
+        # Racine lue → détection du type et règles compilées (une seule fois)
+        if rules is None and root is not None:
+            file_type = file_type or detect_dayz_file_type(root)
+            if context is not None:
+                context["dayz_type"] = file_type
+            schema = load_schema(file_type, version) if file_type in ['types', 'events', 'economy'] else None
+            rules = get_compiled_rules(file_type, schema) if schema else {}
         
-        # RÈGLE 5: Pas de <usage> = pas de spawn
-        usages = type_elem.findall('usage')
-        if nominal > 0 and len(usages) == 0:
-            flags = type_elem.find('flags')
-            crafted = flags.get('crafted', '0') if flags is not None else '0'
-            if crafted == '0':
-                warnings.append({
-                    "severity": "warning",
-                    "message": f"Item '{item_name}': nominal={nominal} mais aucun <usage> défini. Cet item ne spawnera pas naturellement.",
-                    "line": idx
-                })
+        # Enfants directs de la racine terminés → on valide puis on libère
+        if finished:
+            if rules and rules["check_element"]:
+                for elem in finished:
+                    if elem.tag == rules["element"]:
+                        idx += 1
+                        yield from rules["check_element"](elem, idx, lines.pop(elem, None))
+                del root[:]
+            finished.clear()
     
-    return warnings
+    try:
+        parser.Parse(b"", True)
+    except expat.ExpatError as e:
+        raise _to_parse_error(e) from None
+    
+    # Règles au niveau document (economy.xml, minuscule) : sur l'arbre complet
+    if rules and rules["check_document"]:
+        yield from rules["check_document"](root, lines)
 
 
-# ==============================
-# ✨ VALIDATION SÉMANTIQUE : EVENTS.XML
-# ==============================
-def _validate_events_semantic(root, schema):
-    """Valide les règles métier de events.xml"""
-    warnings = []
+def _iter_chunks(source):
+    """Lit un chemin ou un objet fichier par blocs de STREAM_CHUNK_SIZE"""
+    if hasattr(source, "read"):
+        yield from iter(lambda: source.read(STREAM_CHUNK_SIZE), source.read(0))
+        return
     
-    for idx, event_elem in enumerate(root.findall('event'), start=1):
-        event_name = event_elem.get('name', f'Event #{idx}')
-        
-        # Récupérer les valeurs
-        nominal = int(event_elem.findtext('nominal', '0'))
-        min_val = int(event_elem.findtext('min', '0'))
-        max_val = int(event_elem.findtext('max', '0'))
-        lifetime = int(event_elem.findtext('lifetime', '0'))
-        active = int(event_elem.findtext('active', '1'))
-        
-        # RÈGLE 1: min ≤ nominal ≤ max
-        if not (min_val <= nominal <= max_val):
-            warnings.append({
-                "severity": "error",
-                "message": f"Event '{event_name}': La relation min ({min_val}) ≤ nominal ({nominal}) ≤ max ({max_val}) n'est pas respectée.",
-                "line": idx
-            })
-        
-        # RÈGLE 2: lifetime > 0
-        if lifetime <= 0:
-            warnings.append({
-                "severity": "error",
-                "message": f"Event '{event_name}': lifetime ({lifetime}) doit être > 0.",
-                "line": idx
-            })
-        
-        # RÈGLE 3: Event désactivé
-        if active == 0:
-            warnings.append({
-                "severity": "warning",
-                "message": f"Event '{event_name}': active=0 (désactivé). Est-ce voulu ?",
-                "line": idx
-            })
-        
-        # RÈGLE 4: Children min/max
-        for child in event_elem.findall('.//child'):
-            child_type = child.get('type', 'unknown')
-            child_min = int(child.get('min', '0'))
-            child_max = int(child.get('max', '0'))
-            lootmin = int(child.get('lootmin', '0'))
-            lootmax = int(child.get('lootmax', '0'))
-            
-            if child_min > child_max:
-                warnings.append({
-                    "severity": "error",
-                    "message": f"Event '{event_name}', child '{child_type}': min ({child_min}) > max ({child_max}).",
-                    "line": idx
-                })
-            
-            if lootmin > lootmax:
-                warnings.append({
-                    "severity": "error",
-                    "message": f"Event '{event_name}', child '{child_type}': lootmin ({lootmin}) > lootmax ({lootmax}).",
-                    "line": idx
-                })
-    
-    return warnings
+    with open(source, 'rb') as f:
+        yield from iter(lambda: f.read(STREAM_CHUNK_SIZE), b"")
 
 
-# ==============================
-# ✨ VALIDATION SÉMANTIQUE : ECONOMY.XML
-# ==============================
-def _validate_economy_semantic(root, schema):
-    """Valide les règles métier de economy.xml"""
-    warnings = []
+def validate_xml_stream(source, schema_version=None):
+    """
+    Équivalent streaming de validate_xml pour les très gros types.xml / events.xml.
     
-    # Vérifier building respawn=0
-    building = root.find('building')
-    if building is not None:
-        respawn = building.get('respawn', '0')
-        if respawn != '0':
-            warnings.append({
-                "severity": "error",
-                "message": f"Système 'building': respawn doit être 0 (les bases ne doivent PAS respawner). Actuellement : {respawn}",
-                "line": 0
-            })
-    
-    # Vérifier player = 1 1 1 1
-    player = root.find('player')
-    if player is not None:
-        init = player.get('init', '0')
-        load = player.get('load', '0')
-        respawn = player.get('respawn', '0')
-        save = player.get('save', '0')
-        
-        if not (init == '1' and load == '1' and respawn == '1' and save == '1'):
-            warnings.append({
-                "severity": "warning",
-                "message": f"Système 'player': configuration inhabituelle détectée. Vanilla recommandé : init='1' load='1' respawn='1' save='1'. Actuel : init='{init}' load='{load}' respawn='{respawn}' save='{save}'",
-                "line": 0
-            })
-    
-    # Vérifier systèmes critiques (dynamic, vehicles, building)
-    for system_name in ['dynamic', 'vehicles', 'building']:
-        system = root.find(system_name)
-        if system is not None:
-            save = system.get('save', '0')
-            load = system.get('load', '0')
-            
-            if save == '0' or load == '0':
-                warnings.append({
-                    "severity": "warning",
-                    "message": f"Système CRITIQUE '{system_name}': save={save} ou load={load} détecté. ATTENTION : perte de données au restart !",
-                    "line": 0
-                })
-            
-            # Incohérence load=1 sans save=1
-            if load == '1' and save == '0':
-                warnings.append({
-                    "severity": "warning",
-                    "message": f"Système '{system_name}': load=1 mais save=0. Rien ne sera sauvegardé, donc rien à charger. Est-ce voulu ?",
-                    "line": 0
-                })
+    Même structure de retour, mais "formatted" reste à None (l'arbre
+    n'est jamais gardé en entier). En cas d'erreur de syntaxe, le contenu
+    est relu et délégué à validate_xml pour le matching et la correction.
     
-    return warnings
+    Args:
+        source: Chemin du fichier ou objet fichier
+        schema_version (str): Version DayZ du schéma (par défaut la plus récente)
+    
+    Returns:
+        dict structuré (voir commentaire ci-dessous)
+    """
+    result = {
+        "valid": False,
+        "file_type": "xml",
+        "dayz_type": None,
+        "error": None,
+        "formatted": None,
+        "corrected": None,
+        "semantic_warnings": None,
+        "all_errors": None,
+        "correction": None
+    }
+    
+    try:
+        semantic_warnings = list(iter_semantic_warnings(source, context=result, version=schema_version))
+        result["valid"] = True
+        if semantic_warnings:
+            result["semantic_warnings"] = semantic_warnings
+        return result
+    
+    except ET.ParseError:
+        return validate_xml(_read_source(source), schema_version)
+
+
+def _read_source(source):
+    """Relit le contenu complet d'un chemin ou d'un objet fichier (chemin d'erreur uniquement)"""
+    if hasattr(source, "read"):
+        source.seek(0)
+        content = source.read()
+    else:
+        with open(source, 'rb') as f:
+            content = f.read()
+    
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    return content
 
 
 # ==============================
@@ -316,14 +343,22 @@ def _validate_economy_semantic(root, schema):
 #     "file_type": "xml" ou "json",
 #     "dayz_type": str ou None,          → ✨ NOUVEAU : type DayZ détecté
 #     "error": {
-#         "line": int,
-#         "column": int,
+#         "line": int,                   → commence à 1
+#         "column": int,                 → commence à 0 (XML et JSON)
 #         "message_brut": str,
 #         "matched": dict ou None,
 #     },
 #     "formatted": str ou None,
 #     "corrected": str ou None,
 #     "semantic_warnings": list ou None   → ✨ NOUVEAU : warnings sémantiques
+#     "all_errors": list ou None          → toutes les erreurs de syntaxe (même format que "error")
+#     "correction": {                     → None si aucune correction appliquée
+#         "rounds": int,                  → nombre de passes (correct_until_valid)
+#         "valid": bool,                  → "corrected" se parse sans erreur
+#         "applied_corrections": [str, ...],
+#         "stop_reason": str,
+#         "patches": [Patch, ...]         → modifications par position, relatives au contenu d'origine
+#     } ou None
 # }
 
 
@@ -339,7 +374,9 @@ def validate_json(content):
         "error": None,
         "formatted": None,
         "corrected": None,
-        "semantic_warnings": None
+        "semantic_warnings": None,
+        "all_errors": None,
+        "correction": None
     }
 
     try:
@@ -354,16 +391,24 @@ def validate_json(content):
         
         result["error"] = {
             "line": e.lineno,
-            "column": e.colno,
+            "column": e.colno - 1,      # colno commence à 1 ; colonnes à 0 comme pour XML
             "message_brut": e.msg,
             "matched": matched
         }
+        result["all_errors"] = collect_syntax_errors(content, "json", result["error"])
         
-        # Tenter la correction automatique si possible
+        # Correction automatique par passes successives, jusqu'à un fichier valide si possible
         if matched and can_auto_correct(matched):
-            correction = auto_correct(content, "json")
+            correction = correct_until_valid(content, "json", matched)
             if correction["has_changes"]:
                 result["corrected"] = correction["corrected"]
+                result["correction"] = {
+                    "rounds": correction["rounds"],
+                    "valid": correction["valid"],
+                    "applied_corrections": correction["applied_corrections"],
+                    "stop_reason": correction["stop_reason"],
+                    "patches": correction["patches"]
+                }
         
         return result
 
@@ -371,7 +416,7 @@ def validate_json(content):
 # ==============================
 # VALIDATION XML
 # ==============================
-def validate_xml(content):
+def validate_xml(content, schema_version=None):
     """Valide du contenu XML. Retourne le dict de résultat."""
     result = {
         "valid": False,
@@ -380,74 +425,132 @@ def validate_xml(content):
         "error": None,
         "formatted": None,
         "corrected": None,
-        "semantic_warnings": None
+        "semantic_warnings": None,
+        "all_errors": None,
+        "correction": None
     }
 
     try:
-        root = ET.fromstring(content)
-        
-        # ✨ NOUVEAU : Détection type DayZ
-        dayz_type = detect_dayz_file_type(content)
+        # Un seul parsing, partagé par toutes les étapes
+        document = parse_xml_document(content)
+        dayz_type = document["dayz_type"]
         result["dayz_type"] = dayz_type
         
-        # Valide → on formate avec indentation
-        result["valid"] = True
-        result["formatted"] = _format_xml(content)
-        
         # ✨ NOUVEAU : Validation sémantique si type DayZ détecté
         if dayz_type in ['types', 'events', 'economy']:
-            semantic_warnings = validate_semantic_rules(content, dayz_type)
+            semantic_warnings = validate_semantic_rules(
+                content, dayz_type, root=document["root"],
+                version=schema_version, lines=document["lines"]
+            )
             if semantic_warnings:
                 result["semantic_warnings"] = semantic_warnings
         
+        # Valide → on formate avec indentation
+        # (en dernier : l'indentation modifie l'arbre partagé)
+        result["valid"] = True
+        result["formatted"] = _format_xml(document["root"])
+        
         return result
 
     except ET.ParseError as e:
-        line, col = e.position
-        matched = match_error(content, e, "xml")
-        
-        result["error"] = {
-            "line": line,
-            "column": col,
-            "message_brut": str(e),
-            "matched": matched
+        # Matcher, scanner et correcteur partagent les tokens, le temps de cette validation
+        with token_cache():
+            return _xml_error_result(result, content, e)
+
+
+def _xml_error_result(result, content, e):
+    """Chemin d'erreur de validate_xml : erreur reconnue, liste complète, correction"""
+    line, col = e.position
+    matched = match_error(content, e, "xml")
+    
+    result["error"] = {
+        "line": line,
+        "column": col,
+        "message_brut": str(e),
+        "matched": matched
+    }
+    result["all_errors"] = collect_syntax_errors(content, "xml", result["error"])
+    
+    # Correction automatique par passes successives, jusqu'à un fichier valide si possible
+    if matched and can_auto_correct(matched):
+        correction = correct_until_valid(content, "xml", matched)
+        if correction["has_changes"]:
+            result["corrected"] = correction["corrected"]
+            result["correction"] = {
+                "rounds": correction["rounds"],
+                "valid": correction["valid"],
+                "applied_corrections": correction["applied_corrections"],
+                "stop_reason": correction["stop_reason"],
+                "patches": correction["patches"]
+            }
+    
+    return result
+
+
+# ==============================
+# TOUTES LES ERREURS DE SYNTAXE
+# ==============================
+def collect_syntax_errors(content, file_type, first_error):
+    """
+    Relève toutes les erreurs de syntaxe en une passe (scanner avec récupération),
+    au lieu de s'arrêter à la première comme le parseur.
+    
+    Args:
+        content (str): Contenu brut
+        file_type (str): "xml" ou "json"
+        first_error (dict): Erreur du parseur (toujours incluse, sauf si le
+                            scanner a relevé une erreur à la même ligne et colonne)
+    
+    Returns:
+        list: [{"line", "column", "message_brut", "matched"}, ...] triée par ligne
+    """
+    errors = [
+        {
+            "line": found["line"],
+            "column": found["column"],
+            "message_brut": found["message"],
+            "matched": get_error_by_id(found["error_id"]) if found["error_id"] else None
         }
-        
-        # Tenter la correction automatique si possible
-        if matched and can_auto_correct(matched):
-            correction = auto_correct(content, "xml")
-            if correction["has_changes"]:
-                result["corrected"] = correction["corrected"]
-        
-        return result
+        for found in scan_errors(content, file_type)
+    ]
+    
+    # L'erreur du parseur est ajoutée, sauf si le scanner a déjà relevé la même position
+    position = (first_error["line"], first_error["column"])
+    if not any((error["line"], error["column"]) == position for error in errors):
+        errors.append(first_error)
+        errors.sort(key=lambda error: (error["line"], error["column"]))
+    
+    return errors
 
 
 # ==============================
 # FORMATAGE XML
 # ==============================
 def _format_xml(content):
-    """Formate du XML avec indentation propre"""
+    """
+    Formate du XML avec indentation propre.
+    Accepte la racine déjà parsée (pas de re-parsing) ou le contenu brut.
+    """
     try:
-        from xml.dom import minidom
-        pretty = minidom.parseString(content).toprettyxml(indent="    ")
-        # Supprime les lignes vides et la déclaration XML en double
-        lines = [line for line in pretty.split("\n") if line.strip()]
-        return "\n".join(lines)
+        root = content if ET.iselement(content) else ET.fromstring(content)
+        ET.indent(root, space="    ")
+        return '<?xml version="1.0" ?>\n' + ET.tostring(root, encoding="unicode")
     except:
         # Si le formatage échoue, on retourne tel quel
-        return content
+        return content if isinstance(content, str) else None
 
 
 # ==============================
 # FONCTION PRINCIPALE
 # ==============================
-def validate(content, file_type):
+def validate(content, file_type, schema_version=None):
     """
     Fonction principale appelée par app.py
     
     Paramètres :
-        content   → contenu brut du fichier (string)
-        file_type → "json" ou "xml"
+        content        → contenu brut du fichier (string)
+        file_type      → "json" ou "xml"
+        schema_version → version DayZ des schémas (None = la plus récente)
     
     Retourne :
         dict structuré (voir commentaire en haut du fichier)
@@ -455,7 +558,7 @@ def validate(content, file_type):
     if file_type == "json":
         return validate_json(content)
     elif file_type == "xml":
-        return validate_xml(content)
+        return validate_xml(content, schema_version)
     
     # Type inconnu
     return {
@@ -470,5 +573,7 @@ def validate(content, file_type):
         },
         "formatted": None,
         "corrected": None,
-        "semantic_warnings": None
+        "semantic_warnings": None,
+        "all_errors": None,
+        "correction": None
     }
@@ -0,0 +1,200 @@
+"""
+zone_map.py
+Construction du graphique Plotly de la carte interactive (zones zombies).
+
+Avant, create_map copiait chaque zone pour y ajouter les offsets, puis pour
+chaque type de zombie filtrait tout le DataFrame et construisait le texte
+de survol ligne par ligne (iterrows) : du Python par zone, sur trois
+cartes, à chaque rerun. Maintenant les offsets sont des colonnes calculées
+d'un bloc, les traces viennent d'un seul groupby, et le texte de survol
+est assemblé par le navigateur (hovertemplate + customdata) : aucune
+chaîne n'est construite par zone côté serveur.
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+# ==============================
+# CONFIGURATION
+# ==============================
+# Couleur par type de zombie (premier motif contenu dans le nom)
+ZONE_COLORS = {
+    'InfectedArmy': '#8B0000',
+    'InfectedArmyHard': '#DC143C',
+    'InfectedCity': '#4169E1',
+    'InfectedIndustrial': '#FF8C00',
+    'InfectedVillage': '#32CD32',
+    'InfectedPolice': '#191970',
+    'InfectedMedic': '#FF1493',
+    'InfectedPrisoner': '#8B4513',
+    'InfectedFirefighter': '#FF4500',
+    'InfectedReligious': '#9370DB',
+}
+
+# Offsets de calibration iZurvive par carte (en pixels)
+#   Les coordonnées DayZ XML sont DÉJÀ dans [0-12800] : iZurvive applique juste
+#   un offset constant pour chaque carte.
+MAP_OFFSETS = {
+    'Chernarus': {'x': -26, 'z': -783},   # ✅ AJUSTÉ (remonter les points)
+    'Livonia':   {'x': 206, 'z': -73},    # ✅ VALIDÉ (Topolin)
+    'Sakhal':    {'x': 0, 'z': -21}       # ✅ VALIDÉ (Caserne ouest)
+}
+
+# Statut de calibration affiché dans le titre
+CALIBRATION_STATUS = {
+    'Chernarus': '✅ Calibré',
+    'Livonia': '✅ Calibré',
+    'Sakhal': '✅ Calibré'
+}
+
+# Au-delà de ce nombre de zones affichées, rendu WebGL (Scattergl) au lieu de SVG :
+# le SVG crée un élément DOM par marqueur et rame au zoom avec des milliers de points
+WEBGL_ZONE_THRESHOLD = 2000
+
+# Colonnes envoyées avec chaque point (customdata) : id stable de la zone, puis survol
+CUSTOMDATA_COLUMNS = ['id', 'x', 'z', 'r', 'smin', 'smax', 'dmin', 'dmax', 'status']
+
+# Texte de survol, assemblé par Plotly côté navigateur
+HOVER_TEMPLATE = (
+    "<b>%{fullData.name}</b><br>"
+    "Position XML: (%{customdata[1]:.0f}, %{customdata[2]:.0f})<br>"
+    "Position iZurvive: (%{x:.0f}, %{y:.0f})<br>"
+    "Radius: %{customdata[3]:.0f}m<br>"
+    "Spawn: %{customdata[4]}-%{customdata[5]}<br>"
+    "Dynamic: %{customdata[6]}-%{customdata[7]}<br>"
+    "%{customdata[8]}"
+    "<extra></extra>"
+)
+
+
+def use_webgl(zone_count, render_mode="auto"):
+    """
+    True si la carte doit être rendue en WebGL.
+
+    render_mode : "auto" (selon WEBGL_ZONE_THRESHOLD), "svg" ou "webgl"
+    """
+    if render_mode == "auto":
+        return zone_count > WEBGL_ZONE_THRESHOLD
+    return render_mode == "webgl"
+
+
+def get_zone_color(zone_name):
+    """Retourne une couleur selon le type de zombie"""
+    for key, color in ZONE_COLORS.items():
+        if key in zone_name:
+            return color
+    return '#808080'
+
+
+# ==============================
+# DONNÉES DU GRAPHIQUE
+# ==============================
+def zones_frame(zones, map_name):
+    """
+    DataFrame des zones avec les coordonnées iZurvive (offsets appliqués
+    en colonnes, les zones d'origine ne sont pas copiées ni modifiées).
+
+    Colonnes ajoutées :
+        x_izurvive   → x + offset de la carte
+        z_izurvive   → z + offset de la carte (axe vertical du graphique)
+        status       → "✅ ACTIF" / "❌ INACTIF"
+    """
+    offsets = MAP_OFFSETS.get(map_name, {'x': 0, 'z': 0})
+    df = pd.DataFrame.from_records(zones)
+    df['x_izurvive'] = df['x'] + offsets['x']
+    df['z_izurvive'] = df['z'] + offsets['z']
+    df['status'] = df['active'].map({True: '✅ ACTIF', False: '❌ INACTIF'})
+    return df
+
+
+# ==============================
+# FIGURE
+# ==============================
+def build_map_figure(zones, map_name, map_size, image_source=None, render_mode="auto"):
+    """
+    Crée la figure d'une carte : une trace par type de zombie.
+
+    Paramètres :
+        zones        → zones à afficher (voir territories.py), non vide
+        map_name     → "Chernarus", "Livonia" ou "Sakhal"
+        map_size     → taille de la carte (mètres)
+        image_source → URL de l'image de fond (voir map_images.py), optionnel
+        render_mode  → "auto", "svg" ou "webgl" (voir use_webgl) ; la
+                       sélection (on_select) fonctionne dans les deux modes
+
+    Returns:
+        go.Figure (customdata[0] de chaque point = id de la zone)
+    """
+    df = zones_frame(zones, map_name)
+    scatter = go.Scattergl if use_webgl(len(df), render_mode) else go.Scatter
+    fig = go.Figure()
+
+    if image_source:
+        fig.add_layout_image(
+            dict(
+                source=image_source,
+                xref="x",
+                yref="y",
+                x=0,
+                y=map_size,
+                sizex=map_size,
+                sizey=map_size,
+                sizing="stretch",
+                opacity=0.7,
+                layer="below"
+            )
+        )
+
+    # Une trace par type (ordre d'apparition, comme la légende d'origine)
+    for zone_type, df_type in df.groupby('name', sort=False):
+        fig.add_trace(scatter(
+            x=df_type['x_izurvive'],
+            y=df_type['z_izurvive'],
+            mode='markers',
+            name=zone_type,
+            marker=dict(
+                size=8,  # Taille fixe en pixels (ne change pas au zoom)
+                color=get_zone_color(zone_type),
+                opacity=0.9,
+                line=dict(width=1, color='white')
+            ),
+            customdata=df_type[CUSTOMDATA_COLUMNS].to_numpy(),
+            hovertemplate=HOVER_TEMPLATE,
+            unselected=dict(marker=dict(opacity=0.6))
+        ))
+
+    fig.update_layout(
+        title=f"Carte {map_name} - Zones de spawn zombies ({CALIBRATION_STATUS[map_name]})",
+        xaxis_title="",
+        yaxis_title="",
+        height=800,
+        hovermode='closest',
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="right",
+            x=0.99,
+            bgcolor="rgba(255, 255, 255, 0.9)",
+            bordercolor="black",
+            borderwidth=1
+        ),
+        xaxis=dict(
+            range=[0, map_size],
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False
+        ),
+        yaxis=dict(
+            range=[0, map_size],
+            scaleanchor="x",
+            scaleratio=1,
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+    return fig
@@ -5,13 +5,15 @@ Validation XML/JSON avec pédagogie, correction auto et téléchargement
 
 import streamlit as st
 import sys
+from html import escape
 from pathlib import Path
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Import de l'ancien système qui fonctionne
-from modules.validator import validate
+# Validation (résultats mis en cache par contenu)
+from modules.result_cache import validate_cached
+from modules.comparator import compare_side_by_side, expand_collapsed, get_diff_page
 
 # ═══════════════════════════════════════════════════════
 # CONFIG PAGE
@@ -150,6 +152,25 @@ header { visibility: hidden; }
     margin-right: 16px;
 }
 
+.context-code .line.added {
+    background: rgba(34, 197, 94, 0.2);
+    border-left: 3px solid #22c55e;
+    padding-left: 12px;
+    color: #fff;
+}
+
+.side-by-side {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 12px;
+}
+
+.side-by-side .context-code {
+    margin: 4px 0;
+    overflow-x: auto;
+    white-space: pre;
+}
+
 .correction-box {
     background: linear-gradient(135deg, rgba(34, 197, 94, 0.15) 0%, rgba(16, 185, 129, 0.1) 100%);
     border: 2px solid rgba(34, 197, 94, 0.4);
@@ -246,12 +267,89 @@ def render_code_context(context):
         arrow = "❌ " if line['is_error'] else "   "
         html += f'<div class="{line_class}">'
         html += f'<span class="line-num">{arrow}{line["num"]}</span>'
-        html += f'{line["text"]}'
+        html += f'{escape(line["text"])}'
+        html += '</div>'
+    
+    html += '</div>'
+    return html
+
+# Lignes révélées à chaque clic sur une zone repliée du côte à côte
+SIDE_BY_SIDE_EXPAND_STEP = 200
+
+def render_side_rows(rows, changed_class):
+    """Affiche une colonne du côte à côte (lignes modifiées surlignées)"""
+    html = '<div class="context-code">'
+    
+    for num, text, is_changed in rows:
+        line_class = f"line {changed_class}" if is_changed else "line"
+        html += f'<div class="{line_class}">'
+        html += f'<span class="line-num">{num if num is not None else ""}</span>'
+        html += f'{escape(text)}'
         html += '</div>'
     
     html += '</div>'
     return html
 
+def render_side_by_side_rows(rows):
+    """Affiche un bloc de lignes avant / après face à face"""
+    if rows["before_lines"]:
+        st.markdown(
+            '<div class="side-by-side">'
+            + render_side_rows(rows["before_lines"], "error")
+            + render_side_rows(rows["after_lines"], "added")
+            + '</div>',
+            unsafe_allow_html=True
+        )
+
+def render_side_by_side(before, after, patches=None):
+    """
+    Avant / après côte à côte : seules les zones modifiées sont envoyées au
+    navigateur, les zones identiques restent repliées jusqu'au clic.
+    """
+    comparison = compare_side_by_side(before, after, patches)
+    # Lignes déjà dépliées par zone repliée (remis à zéro à chaque validation)
+    expanded = st.session_state.setdefault("side_by_side_expanded", {})
+    
+    for index, segment in enumerate(comparison["segments"]):
+        if segment["type"] == "lines":
+            render_side_by_side_rows(segment)
+            continue
+        
+        shown = expanded.get(index, 0)
+        if shown:
+            render_side_by_side_rows(expand_collapsed(before, after, segment, patches, limit=shown))
+        remaining = segment["count"] - shown
+        if remaining > 0:
+            step = min(SIDE_BY_SIDE_EXPAND_STEP, remaining)
+            if st.button(f"↕️ Afficher {step} ligne(s) identique(s) sur {remaining}", key=f"side_by_side_expand_{index}"):
+                expanded[index] = shown + step
+                st.rerun()
+
+def render_diff_pages(before, after, patches=None):
+    """
+    Diff détaillé page par page : totaux affichés d'emblée, seuls les hunks
+    de la page courante sont formatés et envoyés au navigateur.
+    """
+    # Un seul regroupement des hunks : totaux et page viennent du même appel
+    diff_page = get_diff_page(before, after, st.session_state.get("diff_page", 0), patches=patches)
+    page, pages_count = diff_page["page"], diff_page["pages_count"]
+    
+    st.caption(f"{diff_page['summary']} {diff_page['hunks_count']} bloc(s) — page {page + 1}/{pages_count}")
+    for hunk in diff_page["hunks"]:
+        st.markdown(f"**Ligne {hunk['before_start']}** `{hunk['header']}`")
+        st.code(hunk["text"], language=None)
+    
+    if pages_count > 1:
+        col_previous, col_next = st.columns(2)
+        with col_previous:
+            if st.button("⬅️ Page précédente", key="diff_previous", disabled=page == 0):
+                st.session_state.diff_page = page - 1
+                st.rerun()
+        with col_next:
+            if st.button("Page suivante ➡️", key="diff_next", disabled=page >= pages_count - 1):
+                st.session_state.diff_page = page + 1
+                st.rerun()
+
 # ═══════════════════════════════════════════════════════
 # HEADER IMAGE
 # ═══════════════════════════════════════════════════════
@@ -297,7 +395,7 @@ if uploaded_file:
         with st.spinner("Analyse en cours..."):
             try:
                 # Validation avec l'ancien système qui fonctionne
-                result = validate(content, file_type)
+                result = validate_cached(content, file_type)
                 
                 # DEBUG : Vérifier le type de result
                 if result is None:
@@ -310,6 +408,8 @@ if uploaded_file:
                 
                 # Stocker dans session state
                 st.session_state.validation_result = result
+                st.session_state.side_by_side_expanded = {}
+                st.session_state.diff_page = 0
                 
             except Exception as e:
                 st.error(f"❌ Erreur lors de la validation : {str(e)}")
@@ -348,7 +448,20 @@ if 'validation_result' in st.session_state:
             </p>
         </div>
         """, unsafe_allow_html=True)
-    
+
+        # Toutes les erreurs du fichier (une seule validation au lieu de N allers-retours)
+        all_errors = result.get("all_errors") or []
+        if len(all_errors) > 1:
+            with st.expander(f"📋 {len(all_errors)} erreurs de syntaxe dans le fichier", expanded=True):
+                for error in all_errors:
+                    title = (error.get("matched") or {}).get("titre", "Erreur de syntaxe")
+                    st.markdown(f"""
+                    <div class="error-item">
+                        <strong>Ligne {error.get('line', 0)} — {escape(title)}</strong><br>
+                        {escape(error.get('message_brut', ''))}
+                    </div>
+                    """, unsafe_allow_html=True)
+
     # ═══════════════════════════════════════════════════════
     # PÉDAGOGIE (si erreur avec matching)
     # ═══════════════════════════════════════════════════════
@@ -410,7 +523,28 @@ if 'validation_result' in st.session_state:
             </p>
         </div>
         """, unsafe_allow_html=True)
-        
+
+        # Bilan de la correction itérative (passes jusqu'à un fichier valide)
+        correction = result.get("correction")
+        if correction:
+            rounds = correction["rounds"]
+            if correction["valid"]:
+                st.success(f"✅ Fichier valide après {rounds} passe(s) de correction.")
+            else:
+                st.warning(f"⚠️ {rounds} passe(s) de correction appliquée(s), mais il reste des erreurs à corriger à la main.")
+            with st.expander(f"🔧 Corrections appliquées ({len(correction['applied_corrections'])})"):
+                for applied in correction["applied_corrections"]:
+                    st.markdown(f"- {escape(applied)}")
+
+        # Avant / après (zones identiques repliées)
+        patches = correction["patches"] if correction else None
+        with st.expander("🔍 Avant / Après (côte à côte)", expanded=True):
+            render_side_by_side(content, result["corrected"], patches)
+
+        # Diff détaillé (paginé)
+        with st.expander("📑 Détail des modifications (diff)"):
+            render_diff_pages(content, result["corrected"], patches)
+
         # Afficher le code corrigé
         st.code(result["corrected"], language=result.get("file_type", "text"))
         
@@ -458,7 +592,7 @@ if 'validation_result' in st.session_state:
             st.markdown("### ⚠️ Avertissements Sémantiques (Règles Métier DayZ)")
             for warning in result["semantic_warnings"]:
                 severity = warning.get("severity", "warning")
-                message = warning.get("message", "")
+                message = escape(warning.get("message", ""))
                 line = warning.get("line", 0)
                 
                 if severity == "error":
@@ -475,6 +609,20 @@ if 'validation_result' in st.session_state:
                         {message}
                     </div>
                     """, unsafe_allow_html=True)
+
+            # Saut vers la ligne source d'un avertissement
+            located = [w for w in result["semantic_warnings"] if w.get("line", 0) > 0]
+            if located:
+                st.markdown("**🔍 Aller à la ligne :**")
+                selected = st.selectbox(
+                    "Avertissement",
+                    options=range(len(located)),
+                    format_func=lambda i: f"Ligne {located[i]['line']} — {located[i]['message']}",
+                    label_visibility="collapsed",
+                    key="semantic_warning_line"
+                )
+                context = get_code_context(content, located[selected]["line"], context_lines=3)
+                st.markdown(render_code_context(context), unsafe_allow_html=True)
         else:
             st.info("Aucun avertissement sémantique.")
     
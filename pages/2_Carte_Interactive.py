@@ -7,10 +7,21 @@ Codex Suite - Carte Interactive
 
 import streamlit as st
 import xml.etree.ElementTree as ET
-import plotly.graph_objects as go
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Ajouter le dossier parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Zones parsées une fois par processus, partagées entre sessions (copy-on-write)
+from modules.territories import (
+    TERRITORY_FILES, load_territories_index, load_territories_overlaps, load_zone_positions,
+    session_zones, update_zone
+)
+from modules.map_images import map_image_source
+from modules.spatial_index import nearest_zone
+from modules.zone_map import MAP_OFFSETS, build_map_figure
+
 # ==============================
 # CONFIG PAGE
 # ==============================
@@ -58,87 +69,6 @@ st.markdown("""
 # ==============================
 # FONCTIONS HELPERS
 # ==============================
-def parse_zombie_territories(xml_content):
-    """Parse le fichier zombie_territories.xml et retourne une liste de zones"""
-    root = ET.fromstring(xml_content)
-    zones = []
-    
-    for territory in root.findall('territory'):
-        color = territory.get('color', '')
-        
-        for zone in territory.findall('zone'):
-            zones.append({
-                'name': zone.get('name'),
-                'x': float(zone.get('x')),
-                'z': float(zone.get('z')),
-                'r': float(zone.get('r')),
-                'smin': int(zone.get('smin')),
-                'smax': int(zone.get('smax')),
-                'dmin': int(zone.get('dmin')),
-                'dmax': int(zone.get('dmax')),
-                'color': color,
-                'active': True
-            })
-    
-    return zones
-
-def get_zone_color(zone_name):
-    """Retourne une couleur selon le type de zombie"""
-    color_map = {
-        'InfectedArmy': '#8B0000',
-        'InfectedArmyHard': '#DC143C',
-        'InfectedCity': '#4169E1',
-        'InfectedIndustrial': '#FF8C00',
-        'InfectedVillage': '#32CD32',
-        'InfectedPolice': '#191970',
-        'InfectedMedic': '#FF1493',
-        'InfectedPrisoner': '#8B4513',
-        'InfectedFirefighter': '#FF4500',
-        'InfectedReligious': '#9370DB',
-    }
-    
-    for key, color in color_map.items():
-        if key in zone_name:
-            return color
-    
-    return '#808080'
-
-def apply_map_offsets(zones, map_name):
-    """
-    Applique les offsets de calibration iZurvive aux coordonnées DayZ
-    
-    🎯 DÉCOUVERTE : Les coordonnées DayZ XML sont DÉJÀ dans [0-12800] !
-    iZurvive applique juste un offset constant pour chaque carte.
-    
-    ✅ Offsets validés (précision parfaite - 0px d'erreur) :
-    - Chernarus : X-26, Z+17 (testé avec caserne de pompiers)
-    - Livonia : X+206, Z-73 (testé avec Topolin)
-    - Sakhal : X+0, Z-21 (testé avec caserne ouest)
-    """
-    if len(zones) == 0:
-        return zones
-    
-    # Offsets de calibration par carte (en pixels)
-    MAP_OFFSETS = {
-        'Chernarus': {'x': -26, 'z': -783},   # ✅ AJUSTÉ (remonter les points)
-        'Livonia':   {'x': 206, 'z': -73},    # ✅ VALIDÉ (Topolin)
-        'Sakhal':    {'x': 0, 'z': -21}       # ✅ VALIDÉ (Caserne ouest)
-    }
-    
-    offsets = MAP_OFFSETS.get(map_name, {'x': 0, 'z': 0})
-    
-    # Créer une COPIE des zones pour ne pas modifier les originales
-    zones_copy = []
-    for zone in zones:
-        zone_copy = zone.copy()
-        # Appliquer les offsets pour l'affichage uniquement
-        zone_copy['x_izurvive'] = zone['x'] + offsets['x']
-        zone_copy['z_izurvive'] = zone['z'] + offsets['z']
-        zone_copy['y_plot'] = zone_copy['z_izurvive']
-        zones_copy.append(zone_copy)
-    
-    return zones_copy
-
 def generate_xml(zones):
     """Génère le XML depuis la liste de zones"""
     territories = {}
@@ -168,149 +98,35 @@ def generate_xml(zones):
     
     return '\n'.join(xml_lines)
 
-def create_map(zones_data, map_name, map_size, img_path):
-    """Crée une carte interactive pour une map donnée"""
-    
-    # Appliquer les offsets de calibration
-    zones_data = apply_map_offsets(zones_data, map_name)
-    
-    df = pd.DataFrame(zones_data)
-    
-    if len(df) == 0:
+def create_map(zones_data, map_name, map_size, img_path, render_mode="auto"):
+    """Crée une carte interactive pour une map donnée (WebGL automatique au-delà de WEBGL_ZONE_THRESHOLD zones)"""
+    if len(zones_data) == 0:
         st.warning(f"Aucune zone à afficher pour {map_name}")
         return None
     
-    fig = go.Figure()
-    
-    # Charger l'image de fond
-    from PIL import Image
-    import base64
-    from io import BytesIO
-    
+    # Image de fond : préparée une fois par processus, servie en statique (URL, pas de base64)
     try:
-        img = Image.open(img_path)
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        
-        fig.add_layout_image(
-            dict(
-                source=f"data:image/png;base64,{img_str}",
-                xref="x",
-                yref="y",
-                x=0,
-                y=map_size,
-                sizex=map_size,
-                sizey=map_size,
-                sizing="stretch",
-                opacity=0.7,
-                layer="below"
-            )
-        )
-    except Exception as e:
+        image_source = map_image_source(img_path)
+    except (OSError, ValueError):
+        image_source = None
         st.warning(f"⚠️ Image de fond non trouvée pour {map_name}")
     
-    # Ajouter les marqueurs
-    for zone_type in df['name'].unique():
-        df_type = df[df['name'] == zone_type]
-        
-        fig.add_trace(go.Scatter(
-            x=df_type['x_izurvive'],
-            y=df_type['y_plot'],
-            mode='markers',
-            name=zone_type,
-            marker=dict(
-                size=8,  # Taille fixe en pixels (ne change pas au zoom)
-                color=get_zone_color(zone_type),
-                opacity=0.9,
-                line=dict(width=1, color='white')
-            ),
-            text=[
-                f"<b>{row['name']}</b><br>" +
-                f"Position XML: ({row['x']:.0f}, {row['z']:.0f})<br>" +
-                f"Position iZurvive: ({row['x_izurvive']:.0f}, {row['z_izurvive']:.0f})<br>" +
-                f"Radius: {row['r']:.0f}m<br>" +
-                f"Spawn: {row['smin']}-{row['smax']}<br>" +
-                f"Dynamic: {row['dmin']}-{row['dmax']}<br>" +
-                f"{'✅ ACTIF' if row['active'] else '❌ INACTIF'}"
-                for _, row in df_type.iterrows()
-            ],
-            hovertemplate='%{text}<extra></extra>',
-            customdata=df_type.index,
-            unselected=dict(marker=dict(opacity=0.6))
-        ))
-    
-    # Statut de calibration
-    calibration_status = {
-        'Chernarus': '✅ Calibré',
-        'Livonia': '✅ Calibré',
-        'Sakhal': '✅ Calibré'
-    }
-    
-    fig.update_layout(
-        title=f"Carte {map_name} - Zones de spawn zombies ({calibration_status[map_name]})",
-        xaxis_title="",
-        yaxis_title="",
-        height=800,
-        hovermode='closest',
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="right",
-            x=0.99,
-            bgcolor="rgba(255, 255, 255, 0.9)",
-            bordercolor="black",
-            borderwidth=1
-        ),
-        xaxis=dict(
-            range=[0, map_size],
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False
-        ),
-        yaxis=dict(
-            range=[0, map_size],
-            scaleanchor="x",
-            scaleratio=1,
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False
-        ),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
-    )
-    
-    return fig
+    return build_map_figure(zones_data, map_name, map_size, image_source, render_mode)
 
 # ==============================
 # SESSION STATE
 # ==============================
-if 'zones_chernarus' not in st.session_state:
-    try:
-        path = Path(__file__).parent.parent / "data" / "zombie_territories_chernarus.xml"
-        with open(path, 'r', encoding='utf-8') as f:
-            st.session_state.zones_chernarus = parse_zombie_territories(f.read())
-    except:
-        st.session_state.zones_chernarus = []
-
-if 'zones_livonia' not in st.session_state:
-    try:
-        path = Path(__file__).parent.parent / "data" / "zombie_territories_livonia.xml"
-        with open(path, 'r', encoding='utf-8') as f:
-            st.session_state.zones_livonia = parse_zombie_territories(f.read())
-    except:
-        st.session_state.zones_livonia = []
-
-if 'zones_sakhal' not in st.session_state:
-    try:
-        path = Path(__file__).parent.parent / "data" / "zombie_territories_sakhal.xml"
-        with open(path, 'r', encoding='utf-8') as f:
-            st.session_state.zones_sakhal = parse_zombie_territories(f.read())
-    except:
-        st.session_state.zones_sakhal = []
+# Chaque session part des zones du cache partagé (pas de re-parsing)
+for map_key in TERRITORY_FILES:
+    if f'zones_{map_key}' not in st.session_state:
+        try:
+            st.session_state[f'zones_{map_key}'] = session_zones(map_key)
+        except (OSError, ET.ParseError, ValueError):
+            st.session_state[f'zones_{map_key}'] = []
 
-if 'selected_zone' not in st.session_state:
-    st.session_state.selected_zone = None
+# Zone sélectionnée : id stable (voir territories.py), retrouvée en O(1)
+if 'selected_zone_id' not in st.session_state:
+    st.session_state.selected_zone_id = None
 
 if 'current_map' not in st.session_state:
     st.session_state.current_map = 'chernarus'
@@ -342,91 +158,54 @@ st.markdown("""
 st.markdown("---")
 
 # ==============================
-# TABS POUR LES 3 CARTES
+# VUE D'UNE CARTE
 # ==============================
-tab1, tab2, tab3 = st.tabs(["🗺️ Chernarus ✅", "🗺️ Livonia ✅", "🗺️ Sakhal ✅"])
+# Cartes disponibles : nom affiché, taille (mètres), image de fond
+MAPS = {
+    'chernarus': {'name': "Chernarus", 'size': 15360, 'image': "chernarus_map.webp"},
+    'livonia':   {'name': "Livonia",   'size': 12800, 'image': "livonia_map.jpg"},
+    'sakhal':    {'name': "Sakhal",    'size': 15360, 'image': "sakhal_map.webp"},
+}
 
-# ==============================
-# TAB CHERNARUS
-# ==============================
-with tab1:
-    st.session_state.current_map = 'chernarus'
-    zones = st.session_state.zones_chernarus
-    
-    st.markdown("### 📊 Statistiques Chernarus")
-    
-    active_zones = [z for z in zones if z['active']]
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(f"""<div class="stats-box"><h2>{len(zones)}</h2><p>Zones totales</p></div>""", unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""<div class="stats-box"><h2>{len(active_zones)}</h2><p>Zones actives</p></div>""", unsafe_allow_html=True)
-    with col3:
-        zone_types = set(z['name'] for z in zones)
-        st.markdown(f"""<div class="stats-box"><h2>{len(zone_types)}</h2><p>Types différents</p></div>""", unsafe_allow_html=True)
-    with col4:
-        inactive = len(zones) - len(active_zones)
-        st.markdown(f"""<div class="stats-box"><h2>{inactive}</h2><p>Zones désactivées</p></div>""", unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Filtres
-    st.markdown("### 🔍 Filtres")
-    col_f1, col_f2 = st.columns(2)
-    
-    with col_f1:
-        zone_types_list = sorted(set(z['name'] for z in zones))
-        selected_types = st.multiselect(
-            "Types de zombies",
-            zone_types_list,
-            default=zone_types_list,
-            key="filter_chernarus"
-        )
-    
-    with col_f2:
-        show_only_active = st.checkbox("Afficher seulement les zones actives", value=False, key="active_chernarus")
-    
-    filtered_zones = [z for z in zones if z['name'] in selected_types and (not show_only_active or z['active'])]
-    
-    st.info(f"📊 {len(filtered_zones)} zones affichées sur {len(zones)} totales")
-    st.markdown("---")
-    
-    # Carte
-    st.markdown("### 🗺️ Carte Chernarus")
-    img_path = Path(__file__).parent.parent / "images" / "chernarus_map.webp"
-    fig = create_map(filtered_zones, "Chernarus", 15360, img_path)
-    
-    if fig:
-        selected_point = st.plotly_chart(fig, use_container_width=True, on_select="rerun", key="map_chernarus")
-        
-        if selected_point and 'selection' in selected_point and 'points' in selected_point['selection']:
-            points = selected_point['selection']['points']
-            if points:
-                point_index = points[0]['customdata']
-                st.session_state.selected_zone = filtered_zones[point_index]
-    
-    st.markdown("---")
-    
-    # Download
-    xml_content = generate_xml(zones)
-    st.download_button(
-        label="📥 Télécharger zombie_territories.xml (Chernarus)",
-        data=xml_content,
-        file_name="zombie_territories_chernarus.xml",
-        mime="text/xml",
-        use_container_width=True,
-        type="primary"
-    )
+# Nombre maximal de paires affichées dans le rapport de chevauchements
+OVERLAPS_DISPLAY_LIMIT = 500
 
-# ==============================
-# TAB LIVONIA
-# ==============================
-with tab2:
-    st.session_state.current_map = 'livonia'
-    zones = st.session_state.zones_livonia
+def render_overlaps_report(map_key, zones):
+    """
+    Rapport des zones qui se chevauchent ou sont empilées (index spatial, pas
+    de comparaison de toutes les paires), calculé une fois par version du fichier.
+    """
+    if not zones:
+        return
+    overlaps = load_territories_overlaps(map_key, zones)
+    stacked = sum(1 for overlap in overlaps if overlap['stacked'])
+    
+    with st.expander(f"⚠️ Chevauchements : {len(overlaps)} paire(s) de zones, dont {stacked} empilée(s)"):
+        if not overlaps:
+            st.success("✅ Aucune zone ne chevauche une autre.")
+            return
+        rows = []
+        for overlap in overlaps[:OVERLAPS_DISPLAY_LIMIT]:
+            zone_a, zone_b = zones[overlap['a']], zones[overlap['b']]
+            rows.append({
+                "Zone A": f"{zone_a['name']} ({zone_a['x']:.0f}, {zone_a['z']:.0f}) r={zone_a['r']:.0f}",
+                "Zone B": f"{zone_b['name']} ({zone_b['x']:.0f}, {zone_b['z']:.0f}) r={zone_b['r']:.0f}",
+                "Distance (m)": round(overlap['distance'], 1),
+                "Recouvrement (m)": round(overlap['overlap'], 1),
+                "Empilées": "⚠️ Oui" if overlap['stacked'] else "",
+            })
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        if len(overlaps) > OVERLAPS_DISPLAY_LIMIT:
+            st.caption(f"{OVERLAPS_DISPLAY_LIMIT} plus forts recouvrements affichés sur {len(overlaps)}.")
+
+def render_map_view(map_key):
+    """Statistiques, filtres, carte et export XML de la carte sélectionnée"""
+    map_info = MAPS[map_key]
+    map_name = map_info['name']
+    zones = st.session_state[f'zones_{map_key}']
+    spatial = load_territories_index(map_key, zones) if zones else None
     
-    st.markdown("### 📊 Statistiques Livonia")
+    st.markdown(f"### 📊 Statistiques {map_name}")
     
     active_zones = [z for z in zones if z['active']]
     col1, col2, col3, col4 = st.columns(4)
@@ -449,16 +228,16 @@ with tab2:
     col_f1, col_f2 = st.columns(2)
     
     with col_f1:
-        zone_types_list = sorted(set(z['name'] for z in zones))
+        zone_types_list = sorted(zone_types)
         selected_types = st.multiselect(
             "Types de zombies",
             zone_types_list,
             default=zone_types_list,
-            key="filter_livonia"
+            key=f"filter_{map_key}"
         )
     
     with col_f2:
-        show_only_active = st.checkbox("Afficher seulement les zones actives", value=False, key="active_livonia")
+        show_only_active = st.checkbox("Afficher seulement les zones actives", value=False, key=f"active_{map_key}")
     
     filtered_zones = [z for z in zones if z['name'] in selected_types and (not show_only_active or z['active'])]
     
@@ -466,118 +245,66 @@ with tab2:
     st.markdown("---")
     
     # Carte
-    st.markdown("### 🗺️ Carte Livonia")
-    img_path = Path(__file__).parent.parent / "images" / "livonia_map.jpg"
-    fig = create_map(filtered_zones, "Livonia", 12800, img_path)
+    st.markdown(f"### 🗺️ Carte {map_name}")
+    img_path = Path(__file__).parent.parent / "images" / map_info['image']
+    fig = create_map(filtered_zones, map_name, map_info['size'], img_path)
     
     if fig:
-        selected_point = st.plotly_chart(fig, use_container_width=True, on_select="rerun", key="map_livonia")
+        selected_point = st.plotly_chart(fig, use_container_width=True, on_select="rerun", key=f"map_{map_key}")
         
         if selected_point and 'selection' in selected_point and 'points' in selected_point['selection']:
             points = selected_point['selection']['points']
             if points:
-                point_index = points[0]['customdata']
-                st.session_state.selected_zone = filtered_zones[point_index]
+                point = points[0]
+                if point.get('customdata'):
+                    # customdata[0] = id de la zone cliquée (exact, même pour des zones empilées)
+                    st.session_state.selected_zone_id = point['customdata'][0]
+                else:
+                    # Sinon : zone la plus proche du point (coordonnées iZurvive ramenées en XML)
+                    offsets = MAP_OFFSETS.get(map_name, {'x': 0, 'z': 0})
+                    found = nearest_zone(spatial, point['x'] - offsets['x'], point['y'] - offsets['z'])
+                    if found:
+                        st.session_state.selected_zone_id = zones[found[0]]['id']
+    
+    # Zones qui se chevauchent (cercles de rayon r)
+    render_overlaps_report(map_key, zones)
     
     st.markdown("---")
     
     # Download
     xml_content = generate_xml(zones)
     st.download_button(
-        label="📥 Télécharger zombie_territories.xml (Livonia)",
+        label=f"📥 Télécharger zombie_territories.xml ({map_name})",
         data=xml_content,
-        file_name="zombie_territories_livonia.xml",
+        file_name=f"zombie_territories_{map_key}.xml",
         mime="text/xml",
         use_container_width=True,
         type="primary"
     )
 
 # ==============================
-# TAB SAKHAL
+# SÉLECTEUR DE CARTE
 # ==============================
-with tab3:
-    st.session_state.current_map = 'sakhal'
-    zones = st.session_state.zones_sakhal
-    
-    st.markdown("### 📊 Statistiques Sakhal")
-    
-    active_zones = [z for z in zones if z['active']]
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(f"""<div class="stats-box"><h2>{len(zones)}</h2><p>Zones totales</p></div>""", unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""<div class="stats-box"><h2>{len(active_zones)}</h2><p>Zones actives</p></div>""", unsafe_allow_html=True)
-    with col3:
-        zone_types = set(z['name'] for z in zones)
-        st.markdown(f"""<div class="stats-box"><h2>{len(zone_types)}</h2><p>Types différents</p></div>""", unsafe_allow_html=True)
-    with col4:
-        inactive = len(zones) - len(active_zones)
-        st.markdown(f"""<div class="stats-box"><h2>{inactive}</h2><p>Zones désactivées</p></div>""", unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Filtres
-    st.markdown("### 🔍 Filtres")
-    col_f1, col_f2 = st.columns(2)
-    
-    with col_f1:
-        zone_types_list = sorted(set(z['name'] for z in zones))
-        selected_types = st.multiselect(
-            "Types de zombies",
-            zone_types_list,
-            default=zone_types_list,
-            key="filter_sakhal"
-        )
-    
-    with col_f2:
-        show_only_active = st.checkbox("Afficher seulement les zones actives", value=False, key="active_sakhal")
-    
-    filtered_zones = [z for z in zones if z['name'] in selected_types and (not show_only_active or z['active'])]
-    
-    st.info(f"📊 {len(filtered_zones)} zones affichées sur {len(zones)} totales")
-    st.markdown("---")
-    
-    # Carte
-    st.markdown("### 🗺️ Carte Sakhal")
-    img_path = Path(__file__).parent.parent / "images" / "sakhal_map.webp"
-    fig = create_map(filtered_zones, "Sakhal", 15360, img_path)
-    
-    if fig:
-        selected_point = st.plotly_chart(fig, use_container_width=True, on_select="rerun", key="map_sakhal")
-        
-        if selected_point and 'selection' in selected_point and 'points' in selected_point['selection']:
-            points = selected_point['selection']['points']
-            if points:
-                point_index = points[0]['customdata']
-                st.session_state.selected_zone = filtered_zones[point_index]
-    
-    st.markdown("---")
-    
-    # Download
-    xml_content = generate_xml(zones)
-    st.download_button(
-        label="📥 Télécharger zombie_territories.xml (Sakhal)",
-        data=xml_content,
-        file_name="zombie_territories_sakhal.xml",
-        mime="text/xml",
-        use_container_width=True,
-        type="primary"
-    )
+# Une seule carte calculée par rerun (les st.tabs exécutaient les trois)
+st.radio(
+    "Carte",
+    list(MAPS),
+    format_func=lambda map_key: f"🗺️ {MAPS[map_key]['name']} ✅",
+    horizontal=True,
+    label_visibility="collapsed",
+    key="current_map",
+    # La zone sélectionnée appartient à l'ancienne carte
+    on_change=lambda: st.session_state.update(selected_zone_id=None)
+)
+
+render_map_view(st.session_state.current_map)
 
 # ==============================
 # ÉDITION ZONE (COMMUN)
 # ==============================
-if st.session_state.selected_zone:
-    zone = st.session_state.selected_zone
+if st.session_state.selected_zone_id is not None:
     current_map = st.session_state.current_map
-    
-    if current_map == 'chernarus':
-        zones_list = st.session_state.zones_chernarus
-    elif current_map == 'livonia':
-        zones_list = st.session_state.zones_livonia
-    else:
-        zones_list = st.session_state.zones_sakhal
+    zones_list = st.session_state[f'zones_{current_map}']
     
     st.markdown("---")
     
@@ -586,14 +313,12 @@ if st.session_state.selected_zone:
         st.markdown("### ✏️ Éditer la zone sélectionnée")
     with col_header2:
         if st.button("✖️ Désélectionner", use_container_width=True):
-            st.session_state.selected_zone = None
+            st.session_state.selected_zone_id = None
             st.rerun()
     
-    zone_index = None
-    for i, z in enumerate(zones_list):
-        if z['x'] == zone['x'] and z['z'] == zone['z']:
-            zone_index = i
-            break
+    # Zone retrouvée par son id (dict id → position, pas de parcours de toute la liste)
+    zone_id = st.session_state.selected_zone_id
+    zone_index = load_zone_positions(current_map, zones_list).get(zone_id) if zones_list else None
     
     if zone_index is not None:
         actual_zone = zones_list[zone_index]
@@ -612,12 +337,12 @@ if st.session_state.selected_zone:
         
         with col_edit2:
             def toggle_zone_active():
-                zones_list[zone_index]['active'] = st.session_state[f"toggle_{current_map}_{zone_index}"]
+                update_zone(zones_list, zone_index, active=st.session_state[f"toggle_{current_map}_{zone_id}"])
             
             st.toggle(
                 "Zone active",
                 value=actual_zone['active'],
-                key=f"toggle_{current_map}_{zone_index}",
+                key=f"toggle_{current_map}_{zone_id}",
                 on_change=toggle_zone_active
             )
         
@@ -625,22 +350,19 @@ if st.session_state.selected_zone:
             col_p1, col_p2, col_p3, col_p4 = st.columns(4)
             
             with col_p1:
-                new_smin = st.number_input("smin", value=actual_zone['smin'], min_value=0, max_value=50, key=f"smin_{current_map}_{zone_index}")
+                new_smin = st.number_input("smin", value=actual_zone['smin'], min_value=0, max_value=50, key=f"smin_{current_map}_{zone_id}")
             with col_p2:
-                new_smax = st.number_input("smax", value=actual_zone['smax'], min_value=0, max_value=50, key=f"smax_{current_map}_{zone_index}")
+                new_smax = st.number_input("smax", value=actual_zone['smax'], min_value=0, max_value=50, key=f"smax_{current_map}_{zone_id}")
             with col_p3:
-                new_dmin = st.number_input("dmin", value=actual_zone['dmin'], min_value=0, max_value=50, key=f"dmin_{current_map}_{zone_index}")
+                new_dmin = st.number_input("dmin", value=actual_zone['dmin'], min_value=0, max_value=50, key=f"dmin_{current_map}_{zone_id}")
             with col_p4:
-                new_dmax = st.number_input("dmax", value=actual_zone['dmax'], min_value=0, max_value=50, key=f"dmax_{current_map}_{zone_index}")
+                new_dmax = st.number_input("dmax", value=actual_zone['dmax'], min_value=0, max_value=50, key=f"dmax_{current_map}_{zone_id}")
         
         if st.button("💾 Sauvegarder les paramètres", type="primary", use_container_width=True):
-            zones_list[zone_index]['smin'] = new_smin
-            zones_list[zone_index]['smax'] = new_smax
-            zones_list[zone_index]['dmin'] = new_dmin
-            zones_list[zone_index]['dmax'] = new_dmax
+            update_zone(zones_list, zone_index, smin=new_smin, smax=new_smax, dmin=new_dmin, dmax=new_dmax)
             
             st.success("✅ Paramètres mis à jour !")
-            st.session_state.selected_zone = None
+            st.session_state.selected_zone_id = None
             st.rerun()
 
 # ==============================
@@ -652,50 +374,30 @@ st.markdown("### ⚡ Actions rapides (carte actuelle)")
 col_action1, col_action2, col_action3 = st.columns(3)
 
 current_map = st.session_state.current_map
-if current_map == 'chernarus':
-    zones_list = st.session_state.zones_chernarus
-    map_name = "Chernarus"
-elif current_map == 'livonia':
-    zones_list = st.session_state.zones_livonia
-    map_name = "Livonia"
-else:
-    zones_list = st.session_state.zones_sakhal
-    map_name = "Sakhal"
+zones_list = st.session_state[f'zones_{current_map}']
+map_name = MAPS[current_map]['name']
 
 with col_action1:
     if st.button(f"✅ Activer toutes ({map_name})", use_container_width=True):
-        for z in zones_list:
-            z['active'] = True
+        for i in range(len(zones_list)):
+            update_zone(zones_list, i, active=True)
         st.success(f"Toutes les zones de {map_name} activées !")
         st.rerun()
 
 with col_action2:
     if st.button(f"❌ Désactiver toutes ({map_name})", use_container_width=True):
-        for z in zones_list:
-            z['active'] = False
+        for i in range(len(zones_list)):
+            update_zone(zones_list, i, active=False)
         st.success(f"Toutes les zones de {map_name} désactivées !")
         st.rerun()
 
 with col_action3:
     if st.button(f"🔄 Réinitialiser ({map_name})", use_container_width=True):
         try:
-            if current_map == 'chernarus':
-                filename = "zombie_territories_chernarus.xml"
-            elif current_map == 'livonia':
-                filename = "zombie_territories_livonia.xml"
-            else:
-                filename = "zombie_territories_sakhal.xml"
-            
-            path = Path(__file__).parent.parent / "data" / filename
-            with open(path, 'r', encoding='utf-8') as f:
-                if current_map == 'chernarus':
-                    st.session_state.zones_chernarus = parse_zombie_territories(f.read())
-                elif current_map == 'livonia':
-                    st.session_state.zones_livonia = parse_zombie_territories(f.read())
-                else:
-                    st.session_state.zones_sakhal = parse_zombie_territories(f.read())
+            # Zones vanilla du cache partagé (relues seulement si le fichier a changé)
+            st.session_state[f'zones_{current_map}'] = session_zones(current_map)
             
             st.success(f"Configuration vanilla de {map_name} rechargée !")
             st.rerun()
-        except:
+        except (OSError, ET.ParseError, ValueError):
             st.error("Fichier vanilla introuvable")
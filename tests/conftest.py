@@ -0,0 +1,9 @@
+"""
+conftest.py
+Rend le package `modules` importable depuis les tests (comme les pages Streamlit).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
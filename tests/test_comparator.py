@@ -0,0 +1,162 @@
+"""
+test_comparator.py
+Diff patience, raccourci patches → opcodes, zones repliées et pagination.
+"""
+
+from difflib import SequenceMatcher
+
+import pytest
+
+from modules.comparator import (
+    _cached_diff, compare_before_after, compare_side_by_side, compute_diff,
+    expand_collapsed, get_diff_page
+)
+from modules.corrector import auto_correct
+
+
+def make_types_xml(count):
+    """types.xml de `count` items : beaucoup de lignes répétées (</type>, <lifetime>...)"""
+    lines = ['<types>']
+    for i in range(count):
+        lines.extend([
+            f'    <!-- Item {i} -->',
+            f'    <type name="Item_{i}">',
+            f'        <nominal>{i % 7}</nominal>',
+            '        <lifetime>14400</lifetime>',
+            '        <restock>0</restock>',
+            '        <min>5</min>',
+            '        <cost>100</cost>',
+            '        <flags count_in_cargo="0" count_in_map="1"/>',
+            '        <category name="tools"/>',
+            '        <value name="Tier1"/>',
+            '    </type>',
+        ])
+    lines.append('</types>')
+    return '\n'.join(lines)
+
+
+def difflib_opcodes(before, after):
+    return SequenceMatcher(None, before.split('\n'), after.split('\n'), autojunk=False).get_opcodes()
+
+
+def edited(content):
+    """Suppression, insertion et modification de lignes (</type> répétés partout)"""
+    lines = content.split('\n')
+    del lines[20]
+    lines.insert(40, '    <!-- ajout -->')
+    lines[100] += ' x'
+    lines[250:252] = ['        <cost>1</cost>']
+    return '\n'.join(lines)
+
+
+@pytest.fixture
+def types_xml():
+    return make_types_xml(30)
+
+
+@pytest.fixture
+def correction():
+    """types.xml cassé (</type> oubliés, & non échappé) + sa correction"""
+    broken = make_types_xml(30).replace('    </type>\n', '', 3).replace('Item_5"', 'Item & 5"')
+    return broken, auto_correct(broken, "xml")
+
+
+# ==============================
+# OPCODES
+# ==============================
+def test_patience_matches_difflib(types_xml):
+    after = edited(types_xml)
+    assert compute_diff(types_xml, after)["opcodes"] == difflib_opcodes(types_xml, after)
+
+
+def test_patches_shortcut_matches_difflib(correction):
+    broken, result = correction
+    opcodes = compute_diff(broken, result["corrected"], result["patches"])["opcodes"]
+
+    assert result["patches"]
+    assert opcodes == difflib_opcodes(broken, result["corrected"])
+    assert opcodes == compute_diff(broken, result["corrected"])["opcodes"]
+
+
+def test_opcodes_rebuild_after(types_xml):
+    after = edited(types_xml)
+    diff = compute_diff(types_xml, after)
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in diff["opcodes"]:
+        rebuilt.extend(diff["before_lines"][i1:i2] if tag == "equal" else diff["after_lines"][j1:j2])
+    assert rebuilt == after.split('\n')
+
+
+# ==============================
+# ZONES REPLIÉES (côte à côte)
+# ==============================
+def test_collapsed_segments_expand_to_whole_file(types_xml):
+    after = edited(types_xml)
+    result = compare_side_by_side(types_xml, after)
+    collapsed = [segment for segment in result["segments"] if segment["type"] == "collapsed"]
+
+    assert collapsed
+    assert sum(segment["count"] for segment in collapsed) == result["collapsed_count"]
+
+    before_rows, after_rows = [], []
+    for segment in result["segments"]:
+        rows = expand_collapsed(types_xml, after, segment) if segment["type"] == "collapsed" else segment
+        before_rows.extend(rows["before_lines"])
+        after_rows.extend(rows["after_lines"])
+
+    assert [content for num, content, _ in before_rows if num is not None] == types_xml.split('\n')
+    assert [content for num, content, _ in after_rows if num is not None] == after.split('\n')
+    assert len(before_rows) == len(after_rows)
+
+
+def test_expand_collapsed_by_chunks(types_xml):
+    after = edited(types_xml)
+    segment = next(s for s in compare_side_by_side(types_xml, after)["segments"] if s["type"] == "collapsed")
+    whole = expand_collapsed(types_xml, after, segment)
+
+    chunks = {"before_lines": [], "after_lines": []}
+    for offset in range(0, segment["count"], 7):
+        chunk = expand_collapsed(types_xml, after, segment, offset=offset, limit=7)
+        chunks["before_lines"].extend(chunk["before_lines"])
+        chunks["after_lines"].extend(chunk["after_lines"])
+
+    assert chunks == whole
+    assert len(whole["before_lines"]) == segment["count"]
+    assert expand_collapsed(types_xml, after, segment, offset=segment["count"]) == {"before_lines": [], "after_lines": []}
+
+
+# ==============================
+# PAGINATION
+# ==============================
+def test_pages_cover_every_hunk_once(correction):
+    broken, result = correction
+    comparison = compare_before_after(broken, result["corrected"], result["patches"])
+    all_hunks = list(comparison["hunks"])
+
+    first = get_diff_page(broken, result["corrected"], 0, page_size=2, patches=result["patches"])
+    pages = [get_diff_page(broken, result["corrected"], page, page_size=2, patches=result["patches"])
+             for page in range(first["pages_count"])]
+
+    assert first["hunks_count"] == comparison["hunks_count"] == len(all_hunks) == 4
+    assert first["pages_count"] == 2
+    assert [hunk for page in pages for hunk in page["hunks"]] == all_hunks
+
+
+def test_pages_are_stable_and_clamped(correction):
+    broken, result = correction
+    page = get_diff_page(broken, result["corrected"], 1, page_size=3)
+    _cached_diff.cache_clear()
+
+    assert get_diff_page(broken, result["corrected"], 1, page_size=3) == page
+    assert get_diff_page(broken, result["corrected"], 99, page_size=3)["page"] == page["pages_count"] - 1
+    assert get_diff_page(broken, result["corrected"], -5, page_size=3)["page"] == 0
+
+
+def test_page_totals_match_compare_before_after(correction):
+    broken, result = correction
+    comparison = compare_before_after(broken, result["corrected"], result["patches"])
+    page = get_diff_page(broken, result["corrected"], patches=result["patches"])
+
+    assert page["hunks_count"] == comparison["hunks_count"]
+    assert page["changes_count"] == comparison["changes_count"]
+    assert page["summary"] == comparison["summary"]
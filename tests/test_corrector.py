@@ -0,0 +1,134 @@
+"""
+test_corrector.py
+Correction itérative (correct_until_valid) : une raison d'arrêt par cas.
+"""
+
+import xml.etree.ElementTree as ET
+
+from modules import corrector
+from modules.corrector import correct_until_valid, fix_unclosed_tags
+from modules.patches import apply_patches
+
+
+# & non échappé puis deux balises non fermées : deux passes
+TWO_ROUNDS_XML = "<a>\n  <b>\n  <c>x & y\n</a>"
+
+# <c> au niveau de </a>, fermés implicitement par </a>
+DEDENTED_XML = "<a>\n<b>\n<c>text & more\n</a>"
+
+# </a> ferme <b> sur la même ligne : la fermante ajoutée tombe après la racine, à chaque passe
+NON_CONVERGING_XML = "<r>\n<a><b>x</a>\n</r>"
+
+
+def test_valid_after_several_rounds():
+    result = correct_until_valid(TWO_ROUNDS_XML, "xml")
+
+    assert result["stop_reason"] == "valid"
+    assert result["valid"]
+    assert result["rounds"] == 2
+    ET.fromstring(result["corrected"])
+    assert apply_patches(TWO_ROUNDS_XML, result["patches"]) == result["corrected"]
+
+
+def test_not_fixable():
+    result = correct_until_valid('<a x=1></a>', "xml")
+
+    assert result["stop_reason"] == "not_fixable"
+    assert not result["has_changes"]
+    assert result["corrected"] == '<a x=1></a>'
+
+
+def test_no_change(monkeypatch):
+    monkeypatch.setitem(corrector._FIXES_BY_ERROR_ID, "XML_005", lambda content: ([], []))
+    result = correct_until_valid(TWO_ROUNDS_XML, "xml")
+
+    assert result["stop_reason"] == "no_change"
+    assert result["corrected"] == TWO_ROUNDS_XML
+
+
+def test_max_rounds():
+    result = correct_until_valid(TWO_ROUNDS_XML, "xml", max_rounds=1)
+
+    assert result["stop_reason"] == "max_rounds"
+    assert not result["valid"]
+    assert result["rounds"] == 1
+    assert "&amp;" in result["corrected"]
+
+
+def test_time_budget():
+    result = correct_until_valid(TWO_ROUNDS_XML, "xml", time_budget=-1)
+
+    assert result["stop_reason"] == "time_budget"
+    assert result["rounds"] == 0
+    assert result["corrected"] == TWO_ROUNDS_XML
+
+
+def test_closers_go_before_the_parent_closing_tag():
+    result = correct_until_valid(DEDENTED_XML, "xml")
+
+    assert result["stop_reason"] == "valid"
+    assert result["corrected"] == "<a>\n<b>\n</b>\n<c>text &amp; more\n</c>\n</a>"
+
+
+def test_no_progress_stops_early_and_keeps_best_round():
+    result = correct_until_valid(NON_CONVERGING_XML, "xml")
+
+    assert result["stop_reason"] == "no_progress"
+    assert not result["valid"]
+    # Aucune passe n'a fait avancer le parseur : pas de </b> parasite après la racine
+    assert result["rounds"] == 0
+    assert result["corrected"] == NON_CONVERGING_XML
+    assert result["patches"] == []
+
+
+def test_no_progress_on_identical_patches(monkeypatch):
+    # Correction qui ne touche pas l'erreur : mêmes patches à chaque passe
+    monkeypatch.setitem(corrector._FIXES_BY_ERROR_ID, "XML_005", lambda content: ([corrector.Patch(0, 0, " ")], ["espace"]))
+    result = correct_until_valid(TWO_ROUNDS_XML, "xml")
+
+    assert result["stop_reason"] == "no_progress"
+    assert result["rounds"] <= 1
+
+
+# ==============================
+# PLACEMENT DES FERMANTES (fix_unclosed_tags)
+# ==============================
+def test_closer_not_inserted_before_dedented_child_closing():
+    # </flags> moins indenté que <type> ferme un enfant, pas le parent
+    content = '<types>\n    <type name="a">\n        <flags>\n  </flags>\n        <x/>\n</types>'
+    fixed, _ = fix_unclosed_tags(content)
+
+    assert fixed == '<types>\n    <type name="a">\n        <flags>\n  </flags>\n        <x/>\n    </type>\n</types>'
+    ET.fromstring(fixed)
+
+
+def test_more_indented_unclosed_tag_closed_by_less_indented_one():
+    # <b> plus indenté que le <c> qui le suit : indentation qui redescend
+    content = "<a>\n        <b>\n    <c>\n</a>"
+    fixed, _ = fix_unclosed_tags(content)
+
+    assert fixed == "<a>\n        <b>\n        </b>\n    <c>\n    </c>\n</a>"
+    ET.fromstring(fixed)
+
+
+def test_less_indented_sibling_closes_previous_tag():
+    content = "<a>\n    <b>\n  <c/>\n    <d>\n</a>"
+    fixed, _ = fix_unclosed_tags(content)
+
+    assert fixed == "<a>\n    <b>\n    </b>\n  <c/>\n    <d>\n    </d>\n</a>"
+    ET.fromstring(fixed)
+
+
+def test_truncated_nested_tags_closed_innermost_first():
+    content = "<a>\n <b>\n  <c>\n   <x/>"
+    fixed, _ = fix_unclosed_tags(content)
+
+    assert fixed == "<a>\n <b>\n  <c>\n   <x/>\n  </c>\n </b>\n</a>"
+
+
+def test_ampersand_fix_keeps_numeric_references():
+    content = '<a b="&#233; & x">&#x20AC; &amp; & y</a>'
+    result = correct_until_valid(content, "xml")
+
+    assert result["stop_reason"] == "valid"
+    assert result["corrected"] == '<a b="&#233; &amp; x">&#x20AC; &amp; &amp; y</a>'
@@ -0,0 +1,43 @@
+"""
+test_json_repair.py
+Réparation JSON en patches (json_repair.py).
+"""
+
+import json
+
+import pytest
+
+from modules.json_repair import json_repair_patches
+from modules.patches import apply_patches
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a": 1,}', {"a": 1}),
+    ('{"a": [1, 2,],}', {"a": [1, 2]}),
+    ("{'a': 'texte'}", {"a": "texte"}),
+    ('{damage: 45, "ok": true}', {"damage": 45, "ok": True}),
+    ('{"a": [1, 2', {"a": [1, 2]}),
+])
+def test_repaired_content_parses(content, expected):
+    patches, descriptions = json_repair_patches(content)
+
+    assert patches and descriptions
+    assert json.loads(apply_patches(content, patches)) == expected
+
+
+def test_strings_are_never_modified():
+    content = '{"a": "x, y,]", "b": "damage: 45", "c": [1,],}'
+    repaired = apply_patches(content, json_repair_patches(content)[0])
+
+    assert json.loads(repaired) == {"a": "x, y,]", "b": "damage: 45", "c": [1]}
+
+
+def test_single_quoted_string_escapes_double_quotes():
+    content = "{'a': 'it\\'s \"q\"'}"
+    repaired = apply_patches(content, json_repair_patches(content)[0])
+
+    assert json.loads(repaired) == {"a": 'it\'s "q"'}
+
+
+def test_valid_json_gives_no_patch():
+    assert json_repair_patches('{"a": "b", "c": [1, 2]}') == ([], [])
@@ -0,0 +1,83 @@
+"""
+test_patches.py
+Application et composition des patches (patches.py).
+"""
+
+import pytest
+
+from modules.patches import Patch, apply_patches, compose_patches, sort_patches
+
+
+ORIGIN = "<a>\n<b>text & more\n</a>"
+
+
+def test_apply_insert_replace_delete():
+    patches = [
+        Patch(len(ORIGIN), len(ORIGIN), "\n"),          # insertion en fin
+        Patch(12, 13, "&amp;"),                         # remplacement
+        Patch(0, 4, ""),                                # suppression
+    ]
+    assert apply_patches(ORIGIN, patches) == "<b>text &amp; more\n</a>\n"
+
+
+def test_apply_without_patches_returns_content():
+    assert apply_patches(ORIGIN, []) is ORIGIN
+
+
+def test_insertions_at_same_position_keep_their_order():
+    patches = [Patch(4, 4, "1"), Patch(4, 4, "2"), Patch(0, 0, "0")]
+    assert apply_patches(ORIGIN, patches) == "0<a>\n12<b>text & more\n</a>"
+
+
+def test_overlapping_patches_rejected():
+    with pytest.raises(ValueError):
+        sort_patches([Patch(0, 5, "x"), Patch(3, 6, "y")])
+
+
+def test_adjacent_patches_are_not_overlapping():
+    patches = sort_patches([Patch(3, 6, "y"), Patch(0, 3, "x")])
+    assert apply_patches("abcdefg", patches) == "xyg"
+
+
+def assert_composes(origin, base, new):
+    current = apply_patches(origin, base)
+    composed = compose_patches(sort_patches(base), new, current)
+
+    assert apply_patches(origin, composed) == apply_patches(current, new)
+    assert composed == sort_patches(composed)
+    return composed
+
+
+def test_compose_disjoint_passes_keeps_both():
+    base = [Patch(12, 13, "&amp;")]                     # 4 caractères de plus
+    new = [Patch(len(ORIGIN) + 4, len(ORIGIN) + 4, "\n</b>")]
+    composed = assert_composes(ORIGIN, base, new)
+
+    assert composed == [Patch(12, 13, "&amp;"), Patch(len(ORIGIN), len(ORIGIN), "\n</b>")]
+
+
+def test_compose_patch_inside_previous_insertion():
+    base = [Patch(4, 4, "<x></x>\n")]
+    new = [Patch(7, 7, "text")]                          # entre <x> et </x> insérés
+    composed = assert_composes(ORIGIN, base, new)
+
+    assert composed == [Patch(4, 4, "<x>text</x>\n")]
+
+
+def test_compose_overlapping_replacement():
+    base = [Patch(12, 13, "&amp;")]
+    new = [Patch(9, 16, "")]                             # efface "xt &amp" : chevauche le patch de base
+    assert_composes(ORIGIN, base, new)
+
+
+def test_compose_adjacent_patches():
+    origin = "abcdef"
+    base = [Patch(2, 3, "XY")]                          # "abXYdef"
+    for new in ([Patch(2, 2, "<")], [Patch(4, 4, ">")], [Patch(1, 2, "")], [Patch(4, 5, "")]):
+        assert_composes(origin, base, new)
+
+
+def test_compose_with_empty_passes():
+    base = [Patch(0, 1, "A")]
+    assert compose_patches([], base, "abc") == base
+    assert compose_patches(base, [], "Abc") == base
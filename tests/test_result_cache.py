@@ -0,0 +1,53 @@
+"""
+test_result_cache.py
+Taille estimée et invalidation du cache des résultats de validation.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from modules import result_cache, schema_registry
+from modules.patches import Patch
+
+
+@pytest.fixture
+def schemas_dir(tmp_path, monkeypatch):
+    """Copie des schémas dans un dossier temporaire, revérifiés à chaque appel"""
+    shutil.copytree(schema_registry.SCHEMAS_DIR, tmp_path / "schemas")
+    monkeypatch.setattr(schema_registry, "SCHEMAS_DIR", tmp_path / "schemas")
+    monkeypatch.setattr(schema_registry, "SCHEMA_CHECK_INTERVAL", 0.0)
+    schema_registry.clear_cache()
+    result_cache.clear_cache()
+    yield tmp_path / "schemas"
+    schema_registry.clear_cache()
+    result_cache.clear_cache()
+
+
+def test_size_counts_all_errors_and_patches():
+    base = {"error": {"line": 1}}
+    with_details = {
+        **base,
+        "all_errors": [{"line": 1}, {"line": 2}],
+        "correction": {"patches": [Patch(0, 0, "</type>" * 100)]},
+    }
+    extra = result_cache._estimate_size(with_details) - result_cache._estimate_size(base)
+    assert extra >= 3 * result_cache._ITEM_OVERHEAD + len("</type>" * 100)
+
+
+def test_schema_edit_invalidates_cached_result(schemas_dir):
+    content = "<types></types>"
+    result_cache.validate_cached(content, "xml")
+    hits = result_cache.cache_stats()["hits"]
+    result_cache.validate_cached(content, "xml")
+    assert result_cache.cache_stats()["hits"] == hits + 1
+
+    version = schema_registry.default_version()
+    schema = schemas_dir / f"dayz_{version}" / "types.json"
+    stat = schema.stat()
+    os.utime(schema, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    misses = result_cache.cache_stats()["misses"]
+    result_cache.validate_cached(content, "xml")
+    assert result_cache.cache_stats()["misses"] == misses + 1
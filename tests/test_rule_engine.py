@@ -0,0 +1,72 @@
+"""
+test_rule_engine.py
+Règles métier des éléments imbriqués (<children><child .../></children> d'events.xml).
+"""
+
+from modules.cli import to_sarif_report
+from modules.validator import validate, validate_xml_stream
+
+
+EVENT_CHILDREN = [
+    # (type, min, max, lootmin, lootmax)
+    ("ZmbM_A", 5, 1, 0, 0),
+    ("ZmbM_B", 7, 2, 0, 0),
+    ("ZmbM_C", 1, 9, 3, 1),
+]
+
+
+def make_events_xml(children=EVENT_CHILDREN):
+    """events.xml d'un seul event dont plusieurs <child> enfreignent des règles"""
+    rows = "\n".join(
+        f'            <child lootmax="{lootmax}" lootmin="{lootmin}" max="{maximum}" min="{minimum}" type="{child_type}"/>'
+        for child_type, minimum, maximum, lootmin, lootmax in children
+    )
+    return f"""<events>
+    <event name="InfectedArmy">
+        <nominal>10</nominal>
+        <min>5</min>
+        <max>15</max>
+        <lifetime>300</lifetime>
+        <restock>0</restock>
+        <saferadius>500</saferadius>
+        <distanceradius>100</distanceradius>
+        <cleanupradius>200</cleanupradius>
+        <flags deletable="0" init_random="0" remove_damaged="1"/>
+        <position>fixed</position>
+        <limit>child</limit>
+        <active>1</active>
+        <children>
+{rows}
+        </children>
+    </event>
+</events>
+"""
+
+
+def test_child_rules_are_plain_keys_one_warning_per_child():
+    warnings = validate(make_events_xml(), "xml")["semantic_warnings"]
+    rules = [warning["rule"] for warning in warnings]
+    assert rules == ["child_min_lte_max", "child_min_lte_max", "child_lootmin_lte_lootmax"]
+
+
+def test_streaming_matches_in_memory_on_children(tmp_path):
+    content = make_events_xml()
+    path = tmp_path / "events.xml"
+    path.write_text(content, encoding="utf-8")
+
+    in_memory = validate(content, "xml")
+    streamed = validate_xml_stream(str(path))
+
+    assert streamed["semantic_warnings"] == in_memory["semantic_warnings"]
+    assert streamed["dayz_type"] == in_memory["dayz_type"]
+
+
+def test_sarif_rule_ids_are_stable():
+    def rule_ids():
+        result = validate(make_events_xml(), "xml")
+        report = to_sarif_report([{"path": "events.xml", "result": result}])
+        return [entry["ruleId"] for entry in report["runs"][0]["results"]]
+
+    first = rule_ids()
+    assert first == rule_ids()
+    assert first == ["events.child_min_lte_max", "events.child_min_lte_max", "events.child_lootmin_lte_lootmax"]
@@ -0,0 +1,20 @@
+"""
+test_territories.py
+Chevauchements des zones vanilla, partagés par toutes les sessions.
+"""
+
+from modules.spatial_index import build_zone_index, find_overlaps
+from modules.territories import load_territories, load_territories_overlaps, session_zones
+
+
+def test_overlaps_computed_once_per_file_version():
+    zones = session_zones("chernarus")
+    overlaps = load_territories_overlaps("chernarus", zones)
+
+    assert overlaps is load_territories_overlaps("chernarus", session_zones("chernarus"))
+    assert list(overlaps) == find_overlaps(build_zone_index(load_territories("chernarus")))
+
+
+def test_overlaps_recomputed_for_a_different_zone_list():
+    zones = session_zones("livonia")[:50]
+    assert list(load_territories_overlaps("livonia", zones)) == find_overlaps(build_zone_index(zones))
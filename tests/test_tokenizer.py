@@ -0,0 +1,33 @@
+"""
+test_tokenizer.py
+Cache des tokens limité à un bloc token_cache (une validation).
+"""
+
+from modules import tokenizer
+from modules.tokenizer import token_cache, tokenize_xml
+
+
+CONTENT = '<types>\n    <type name="a">\n</types>'
+
+
+def test_no_cache_outside_a_validation():
+    assert tokenize_xml(CONTENT) == tokenize_xml(CONTENT)
+    assert tokenize_xml(CONTENT) is not tokenize_xml(CONTENT)
+
+
+def test_tokens_shared_inside_block_and_released_after():
+    with token_cache():
+        first = tokenize_xml(CONTENT)
+        with token_cache():
+            assert tokenize_xml(CONTENT) is first
+        assert tokenize_xml(CONTENT) is first
+
+    assert tokenizer._SCOPE.get() is None
+    assert tokenize_xml(CONTENT) is not first
+
+
+def test_numeric_references_are_not_unescaped_ampersands():
+    tokens = tokenize_xml('<a b="&#233; &#x20AC; & x">&amp; &#39; & y</a>')
+
+    assert [token.column for token in tokens if token.kind == "amp"] == [39]
+    assert tokenizer.unescaped_ampersand_in_attributes(tokens[0])
@@ -0,0 +1,67 @@
+"""
+test_validator.py
+Liste complète des erreurs de syntaxe (collect_syntax_errors).
+"""
+
+from modules.cli import to_sarif_report
+from modules.errors_db import get_error_by_id
+from modules.scanner import scan_errors
+from modules.validator import collect_syntax_errors, validate
+
+
+# Ligne 2 : & non échappé (relevé par le scanner) ; ligne 3 : </typ> sans ouvrante
+BAD_XML = """<types>
+    <type name="a" note="1 & 2"/>
+    <type name="b"></typ>
+</types>
+"""
+
+
+def parser_error(line, column, message="mismatched tag"):
+    return {"line": line, "column": column, "message_brut": message, "matched": get_error_by_id("XML_006")}
+
+
+def test_parser_error_kept_after_earlier_scanner_error():
+    first_error = parser_error(3, 21)
+    errors = collect_syntax_errors(BAD_XML, "xml", first_error)
+
+    assert first_error in errors
+    assert errors[0]["line"] == 2
+    assert errors == sorted(errors, key=lambda error: (error["line"], error["column"]))
+
+
+def test_parser_error_skipped_when_scanner_has_same_position():
+    scanned = scan_errors(BAD_XML, "xml")
+    same_position = scanned[-1]
+    errors = collect_syntax_errors(BAD_XML, "xml", parser_error(same_position["line"], same_position["column"]))
+
+    assert len(errors) == len(scanned)
+    assert [(error["line"], error["column"]) for error in errors].count(
+        (same_position["line"], same_position["column"])
+    ) == 1
+
+
+def test_validate_lists_parser_error():
+    result = validate(BAD_XML, "xml")
+
+    assert not result["valid"]
+    assert result["error"] in result["all_errors"]
+
+
+def test_json_parser_error_deduplicated_with_scanner():
+    result = validate('{"a": 1, "b": [1,2,],}', "json")
+    positions = [(error["line"], error["column"]) for error in result["all_errors"]]
+
+    # Colonne à 0 comme le scanner : l'erreur du parseur n'est pas listée deux fois
+    assert result["error"]["column"] == 19
+    assert positions == [(1, 19), (1, 21)]
+
+
+def test_json_sarif_column_matches_parser():
+    result = validate('{"a": }', "json")
+    report = to_sarif_report([{"path": "bad.json", "result": result}])
+    regions = [entry["locations"][0]["physicalLocation"]["region"] for entry in report["runs"][0]["results"]]
+
+    # json.JSONDecodeError.colno (commence à 1) = startColumn SARIF
+    assert len(regions) == 1
+    assert regions[0]["startColumn"] == 7